@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+
+from autoedit.backends.lightning.transcriber import LightningTranscriber
+from autoedit.backends.local.chunking import iter_chunk_segments, plan_chunks
+from autoedit.core.tools import run_tool
+from autoedit.schemas.transcript import Transcript, TranscriptSegment
+
+# Remote chunks are longer than local ones: each costs an upload and a request round trip.
+REMOTE_CHUNK_S = 600.0
+
+# Uploads a local chunk file and returns a URL the STT service can fetch.
+Uploader = Callable[[Path], str]
+
+
+def plan_audio_chunks(
+    audio_path: Path, chunk_length: float = REMOTE_CHUNK_S
+) -> Optional[List[Tuple[float, float]]]:
+    """Silence-aligned ``(start, end)`` chunks of ``audio_path``; None if decoding fails.
+
+    Uses the voice-activity PCM cache, so audio already analysed by ``vad`` is not
+    decoded again. Requires numpy.
+    """
+    from autoedit.core.vad import FRAME_S, VAD_SAMPLE_RATE, decode_pcm, energy_envelope, load_pcm
+
+    pcm = decode_pcm(audio_path)
+    if pcm is None:
+        return None
+    energy = energy_envelope(load_pcm(pcm), VAD_SAMPLE_RATE)
+    return plan_chunks(energy, FRAME_S, chunk_length)
+
+
+def cut_chunk(audio_path: Path, start: float, end: float, dest: Path) -> Path:
+    """Encode ``[start, end)`` of ``audio_path`` to a mono 16 kHz FLAC at ``dest``."""
+    cmd = [
+        "ffmpeg",
+        "-y",
+        "-v",
+        "error",
+        "-nostdin",
+        "-ss",
+        f"{start:.3f}",
+        "-t",
+        f"{end - start:.3f}",
+        "-i",
+        str(audio_path),
+        "-ac",
+        "1",
+        "-ar",
+        "16000",
+        "-c:a",
+        "flac",
+        str(dest),
+    ]
+    if run_tool(cmd) != 0 or not dest.exists():
+        raise RuntimeError(f"ffmpeg failed to cut {audio_path.name} at {start:.3f}s")
+    return dest
+
+
+def iter_fanout_segments(
+    transcriber: LightningTranscriber,
+    audio_path: Path,
+    chunks: Sequence[Tuple[float, float]],
+    upload: Uploader,
+    lang: Optional[str] = None,
+    model: str = "medium",
+    concurrency: Optional[int] = None,
+) -> Iterator[TranscriptSegment]:
+    """Cut, upload and transcribe ``chunks`` concurrently; yield segments in timeline order.
+
+    Each chunk runs cut -> upload -> request on its own worker, so uploads overlap with
+    transcription of earlier chunks. Requests cycle through the transcriber's API keys;
+    ``concurrency`` defaults to ``requests_per_key`` times the number of keys. Chunk files
+    live in a temporary directory removed once every chunk is done.
+    """
+    workers = max(1, min(concurrency or transcriber.default_concurrency(), len(chunks) or 1))
+    transcriber.session(workers)
+    with tempfile.TemporaryDirectory(prefix="autoedit-chunks-") as tmp:
+
+        def run(item: Tuple[int, Tuple[float, float]]) -> List[TranscriptSegment]:
+            i, (start, end) = item
+            dest = Path(tmp) / f"{audio_path.stem}.{i:04d}.flac"
+            url = upload(cut_chunk(audio_path, start, end, dest))
+            transcript = transcriber.transcribe_url(url, lang=lang, model=model)
+            dest.unlink(missing_ok=True)
+            return transcript.segments
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="autoedit-fanout") as pool:
+            # map() yields chunk results in order as soon as each one is ready.
+            results = pool.map(run, enumerate(chunks))
+            yield from iter_chunk_segments(zip((start for start, _ in chunks), results))
+
+
+def transcribe_fanout(
+    transcriber: LightningTranscriber,
+    audio_path: Path,
+    chunks: Sequence[Tuple[float, float]],
+    upload: Uploader,
+    lang: Optional[str] = None,
+    model: str = "medium",
+    concurrency: Optional[int] = None,
+) -> Transcript:
+    """:func:`iter_fanout_segments` stitched into one time-aligned transcript."""
+    segments = list(
+        iter_fanout_segments(transcriber, audio_path, chunks, upload, lang, model, concurrency)
+    )
+    return Transcript(text=" ".join(s.text for s in segments).strip(), segments=segments)
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from threading import Lock
+from typing import Callable, Dict, List, Optional, Sequence
+
+# Weight of the newest observation in the latency and error-rate moving averages.
+EWMA_ALPHA = 0.3
+# Consecutive failures that open a key's circuit, and the first cooldown (doubles per trip).
+FAILURE_THRESHOLD = 3
+COOLDOWN_S = 30.0
+MAX_COOLDOWN_S = 600.0
+# Seconds added to a key's score at a 100% error rate, so failing keys rank last.
+ERROR_PENALTY_S = 10.0
+
+
+@dataclass
+class KeyHealth:
+    """Observed health of one API key (``key=None`` means unauthenticated)."""
+
+    key: Optional[str]
+    latency_ewma: Optional[float] = None
+    error_rate: float = 0.0
+    in_flight: int = 0
+    consecutive_failures: int = 0
+    trips: int = 0
+    cooldown_until: float = 0.0
+    last_used: int = 0
+
+    def score(self) -> float:
+        """Expected cost of a new request: lower is better; unmeasured keys score 0."""
+        latency = self.latency_ewma or 0.0
+        return latency * (1 + self.in_flight) + self.error_rate * ERROR_PENALTY_S
+
+
+class KeyPool:
+    """Picks the fastest healthy API key and tracks per-key latency and errors.
+
+    Every request is bracketed by :meth:`acquire` and :meth:`release`. Latency and error
+    rate are exponentially weighted moving averages; ``failure_threshold`` consecutive
+    failures open a key's circuit for ``cooldown_s`` (doubling on each trip, up to
+    ``max_cooldown_s``), and a throttling response can impose its own ``Retry-After``
+    cooldown. Once a cooldown expires the key gets traffic again, and one success closes
+    the circuit. When every key is cooling down, the one that recovers first is used.
+    """
+
+    def __init__(
+        self,
+        keys: Sequence[Optional[str]],
+        alpha: float = EWMA_ALPHA,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        cooldown_s: float = COOLDOWN_S,
+        max_cooldown_s: float = MAX_COOLDOWN_S,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._health = [KeyHealth(key=k) for k in (keys or [None])]
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.cooldown_s = cooldown_s
+        self.max_cooldown_s = max_cooldown_s
+        self._clock = clock
+        self._lock = Lock()
+        self._uses = 0
+
+    def __len__(self) -> int:
+        return len(self._health)
+
+    def acquire(self) -> KeyHealth:
+        with self._lock:
+            now = self._clock()
+            ready = [h for h in self._health if h.cooldown_until <= now]
+            if ready:
+                # Ties (e.g. unmeasured keys) go to the least recently used key.
+                chosen = min(ready, key=lambda h: (h.score(), h.in_flight, h.last_used))
+            else:
+                chosen = min(self._health, key=lambda h: h.cooldown_until)
+            self._uses += 1
+            chosen.last_used = self._uses
+            chosen.in_flight += 1
+            return chosen
+
+    def release(
+        self,
+        health: KeyHealth,
+        latency: Optional[float],
+        ok: bool,
+        retry_after: Optional[float] = None,
+    ) -> None:
+        """Record one request's outcome; ``latency`` is None when no response arrived."""
+        a = self.alpha
+        with self._lock:
+            health.in_flight = max(0, health.in_flight - 1)
+            if latency is not None:
+                prev = health.latency_ewma
+                health.latency_ewma = latency if prev is None else a * latency + (1 - a) * prev
+            health.error_rate = a * (0.0 if ok else 1.0) + (1 - a) * health.error_rate
+            if ok:
+                health.consecutive_failures = 0
+                health.trips = 0
+                health.cooldown_until = 0.0
+                return
+            health.consecutive_failures += 1
+            cooldown = retry_after or 0.0
+            if health.consecutive_failures >= self.failure_threshold:
+                health.trips += 1
+                health.consecutive_failures = 0
+                backoff = self.cooldown_s * 2 ** (health.trips - 1)
+                cooldown = max(cooldown, min(self.max_cooldown_s, backoff))
+            if cooldown:
+                health.cooldown_until = max(health.cooldown_until, self._clock() + cooldown)
+
+    def forget(self, health: KeyHealth) -> None:
+        """End a request without judging the key (its outcome is unknown)."""
+        with self._lock:
+            health.in_flight = max(0, health.in_flight - 1)
+
+    def wait_time(self) -> float:
+        """Seconds until some key leaves its cooldown (0 if one is ready now)."""
+        with self._lock:
+            now = self._clock()
+            return max(0.0, min(h.cooldown_until for h in self._health) - now)
+
+    def snapshot(self) -> List[Dict[str, object]]:
+        """Per-key health for logging; keys are masked to their last four characters."""
+        with self._lock:
+            now = self._clock()
+            return [
+                {
+                    "key": f"...{h.key[-4:]}" if h.key else None,
+                    "latency_ewma": h.latency_ewma,
+                    "error_rate": round(h.error_rate, 3),
+                    "in_flight": h.in_flight,
+                    "cooling_s": max(0.0, round(h.cooldown_until - now, 1)),
+                }
+                for h in self._health
+            ]
@@ -1,15 +1,51 @@
 from __future__ import annotations
 
+import json
 import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import suppress
 from dataclasses import dataclass
-from itertools import cycle
 from threading import Lock
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
 
+from autoedit.backends.lightning.health import COOLDOWN_S, FAILURE_THRESHOLD, KeyPool
 from autoedit.schemas.transcript import Transcript, TranscriptSegment
 
+# Responses worth retrying (on the next-best key): throttling and transient server errors.
+RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+# Responses that condemn the key itself; retried only when another key exists.
+KEY_STATUSES = frozenset({401, 403})
+
+# Safe to resend after any transport error; other methods only when nothing was sent.
+IDEMPOTENT_METHODS = frozenset({"GET", "DELETE"})
+JOB_FINAL_STATES = frozenset({"done", "failed", "cancelled"})
+
+_sleep = time.sleep
+
+
+def _never_sent(exc: requests.RequestException) -> bool:
+    """True when the request provably never reached the server (connect failed)."""
+    if isinstance(exc, requests.ConnectTimeout):
+        return True
+    if isinstance(exc, requests.Timeout):
+        return False
+    reason = getattr(exc.args[0], "reason", None) if exc.args else None
+    return isinstance(reason, (NewConnectionError, ConnectTimeoutError))
+
+
+def _retry_after(resp: requests.Response) -> Optional[float]:
+    """``Retry-After`` in seconds (the HTTP-date form is ignored)."""
+    try:
+        return float(resp.headers.get("Retry-After", ""))
+    except ValueError:
+        return None
+
 
 @dataclass
 class LightningConfig:
@@ -17,47 +53,209 @@ class LightningConfig:
     api_key: Optional[str] = None
     timeout_s: int = 60
     api_keys: Optional[List[str]] = None
+    # Requests kept in flight per API key by transcribe_many().
+    requests_per_key: int = 1
+    # Retries per request with full-jitter exponential backoff between attempts.
+    max_retries: int = 3
+    backoff_s: float = 0.5
+    backoff_max_s: float = 8.0
+    # Consecutive failures that take a key out of rotation, and the first cooldown.
+    failure_threshold: int = FAILURE_THRESHOLD
+    cooldown_s: float = COOLDOWN_S
+    # Go through the service's /jobs API (long-polled) instead of one long /transcribe call.
+    use_jobs: bool = False
+    job_wait_s: float = 20.0
 
 
 class LightningTranscriber:
     """HTTP client for the Beam Cloud Whisper service (legacy Lightning naming).
 
-    For MVP, requires an already-uploaded audio URL. Chunking/upload is out of scope here.
+    Transcribes audio the service can fetch by URL; uploading local files and splitting
+    them into chunks (see :mod:`autoedit.backends.lightning.fanout`) is up to the caller.
+    All requests share one pooled keep-alive :class:`requests.Session`. Each request goes
+    to the fastest healthy API key (see :class:`KeyPool`), so :meth:`transcribe_many`
+    spreads concurrent requests across every configured Beam account and steers away from
+    throttled or failing ones. Throttling, 5xx responses and connection errors are retried
+    up to ``max_retries`` times with jittered exponential backoff.
     """
 
     def __init__(self, config: LightningConfig) -> None:
         self.config = config
         self._api_keys = [k for k in (config.api_keys or []) if k]
-        self._api_cycle = cycle(self._api_keys) if self._api_keys else None
-        self._api_cycle_lock = Lock() if self._api_cycle else None
         self._fallback_api_key = self.config.api_key or os.getenv("LIGHTNING_API_KEY")
+        self.keys = KeyPool(
+            self._api_keys or [self._fallback_api_key],
+            failure_threshold=config.failure_threshold,
+            cooldown_s=config.cooldown_s,
+        )
+        self._session: Optional[requests.Session] = None
+        self._pool_size = 0
+        self._session_lock = Lock()
+
+    def default_concurrency(self) -> int:
+        return max(1, len(self._api_keys)) * max(1, self.config.requests_per_key)
+
+    def session(self, pool_size: Optional[int] = None) -> requests.Session:
+        """The shared session, with a connection pool of at least ``pool_size``."""
+        size = max(pool_size or 0, self.default_concurrency())
+        with self._session_lock:
+            if self._session is None or self._pool_size < size:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=size)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                if self._session is not None:
+                    self._session.close()
+                self._session, self._pool_size = session, size
+            return self._session
+
+    def close(self) -> None:
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter backoff, but never less than the wait for some key to recover."""
+        cap = min(self.config.backoff_max_s, self.config.backoff_s * 2**attempt)
+        return max(random.uniform(0, cap), self.keys.wait_time())
 
-    def _choose_api_key(self) -> Optional[str]:
-        if self._api_cycle and self._api_cycle_lock:
-            with self._api_cycle_lock:
-                return next(self._api_cycle)
-        return self._fallback_api_key
+    def _request(
+        self,
+        method: str,
+        path: str,
+        payload: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        stream: bool = False,
+        timed: bool = True,
+    ) -> requests.Response:
+        """Request with per-key health tracking and retries; raises once retries run out.
+
+        Retryable status codes are always retried. Transport errors are retried for
+        idempotent methods, but for POST only when the connection was never established:
+        after a read timeout the server may still be transcribing.
+
+        ``timed=False`` keeps the response time out of the key's latency average (for
+        long-polls, whose duration says nothing about the key).
+        """
+        url = f"{self.config.base_url.rstrip('/')}{path}"
+        options: Dict[str, Any] = {"stream": True} if stream else {}
+        if payload is not None:
+            options["json"] = payload
+        if params is not None:
+            options["params"] = params
+        send = getattr(self.session(), method.lower())
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            health = self.keys.acquire()
+            headers = {"X-API-Key": health.key} if health.key else {}
+            started = time.monotonic()
+            try:
+                resp = send(url, headers=headers, timeout=self.config.timeout_s, **options)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                if not (idempotent or _never_sent(exc)):
+                    # The server may still be working on it (e.g. a long transcription hit the
+                    # read timeout): retrying would start a duplicate, and the key is not at fault.
+                    self.keys.forget(health)
+                    raise
+                self.keys.release(health, None, ok=False)
+                if attempt >= self.config.max_retries:
+                    raise
+            else:
+                latency = time.monotonic() - started if timed else None
+                status = resp.status_code
+                retry = status in RETRY_STATUSES or (status in KEY_STATUSES and len(self.keys) > 1)
+                # Other 4xx responses are the request's fault, not the key's.
+                key_ok = status not in RETRY_STATUSES and status not in KEY_STATUSES
+                self.keys.release(health, latency, ok=key_ok, retry_after=_retry_after(resp))
+                if not retry or attempt >= self.config.max_retries:
+                    resp.raise_for_status()
+                    return resp
+                resp.close()
+            _sleep(self._backoff(attempt))
+            attempt += 1
 
     def transcribe_url(
         self, audio_url: str, lang: Optional[str] = None, model: str = "medium"
     ) -> Transcript:
-        headers = {}
-        api_key = self._choose_api_key()
-        if api_key:
-            headers["X-API-Key"] = api_key
         payload = {"audio_url": audio_url, "lang": lang, "model": model}
-        resp = requests.post(
-            f"{self.config.base_url.rstrip('/')}/transcribe",
-            json=payload,
-            headers=headers,
-            timeout=self.config.timeout_s,
-        )
-        resp.raise_for_status()
-        data = resp.json()
+        if self.config.use_jobs:
+            data = self._run_job(payload)
+        else:
+            data = self._request("POST", "/transcribe", payload).json()
         segments = [
             TranscriptSegment(
                 start=s.get("start", 0.0), end=s.get("end", 0.0), text=s.get("text", "")
             )
             for s in data.get("segments", [])
         ]
-        return Transcript(text=data.get("text", ""), segments=segments)
+        return Transcript(text=data.get("text", ""), segments=segments, audio_hash=data.get("hash"))
+
+    def _run_job(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Submit to the service's job API and long-poll until the job finishes.
+
+        Returns the job's result payload. Raises RuntimeError if the job fails or is
+        cancelled; interrupting the wait (e.g. Ctrl-C) cancels the job server-side.
+        """
+        job = self._request("POST", "/jobs", payload).json()
+        path = f"/jobs/{job['id']}"
+        try:
+            while job["status"] not in JOB_FINAL_STATES:
+                params = {"wait": self.config.job_wait_s}
+                job = self._request("GET", path, params=params, timed=False).json()
+        except BaseException:
+            with suppress(requests.RequestException):
+                self._request("DELETE", path)
+            raise
+        if job["status"] != "done":
+            raise RuntimeError(f"Transcription job {job['id']} {job['status']}: {job.get('error')}")
+        return job["result"]
+
+    def transcribe_many(
+        self,
+        audio_urls: Sequence[str],
+        lang: Optional[str] = None,
+        model: str = "medium",
+        concurrency: Optional[int] = None,
+    ) -> Iterator[Tuple[int, Transcript]]:
+        """Transcribe ``audio_urls`` with up to ``concurrency`` requests in flight.
+
+        Yields ``(index, transcript)`` pairs in completion order; ``concurrency`` defaults
+        to ``requests_per_key`` times the number of API keys. The first failed request
+        raises once reached, and requests not yet started are cancelled.
+        """
+        workers = max(1, min(concurrency or self.default_concurrency(), len(audio_urls) or 1))
+        self.session(workers)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="autoedit-stt") as pool:
+            futures = {
+                pool.submit(self.transcribe_url, url, lang, model): i
+                for i, url in enumerate(audio_urls)
+            }
+            try:
+                for future in as_completed(futures):
+                    yield futures[future], future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def iter_segments_url(
+        self, audio_url: str, lang: Optional[str] = None, model: str = "medium"
+    ) -> Iterator[TranscriptSegment]:
+        """Stream segments from the service's NDJSON ``/transcribe/stream`` endpoint.
+
+        Segments are yielded as the service decodes them. Raises IOError if the stream
+        ends before the service's final ``{"done": true}`` line.
+        """
+        payload = {"audio_url": audio_url, "lang": lang, "model": model}
+        with self._request("POST", "/transcribe/stream", payload, stream=True) as resp:
+            for line in resp.iter_lines():
+                if not line:
+                    continue
+                s = json.loads(line)
+                if s.get("done"):
+                    return
+                yield TranscriptSegment(
+                    start=s.get("start", 0.0), end=s.get("end", 0.0), text=s.get("text", "")
+                )
+        raise IOError("Transcription stream ended before the service finished")
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from autoedit.schemas.transcript import TranscriptSegment
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import numpy as np
+
+# Longest chunk handed to one worker, and how far back from that limit to look for silence.
+CHUNK_MAX_S = 120.0
+SILENCE_SEARCH_S = 20.0
+# Boundary segments closer than this with the same text are treated as one.
+DEDUP_GAP_S = 1.0
+
+
+def plan_chunks(
+    energy_db: "np.ndarray",
+    frame_s: float,
+    max_chunk_s: float = CHUNK_MAX_S,
+    search_s: float = SILENCE_SEARCH_S,
+) -> List[Tuple[float, float]]:
+    """Split the timeline into chunks of at most ``max_chunk_s`` that end in silence.
+
+    Each boundary is placed on the quietest frame in the ``search_s`` seconds before the
+    length limit, so words are not cut in half.
+    """
+    import numpy as np
+
+    total = len(energy_db)
+    limit = max(1, int(max_chunk_s / frame_s))
+    # Never search the first half of a chunk, so every chunk is at least half the limit.
+    search = max(1, min(int(search_s / frame_s), limit // 2))
+    bounds = [0]
+    while total - bounds[-1] > limit:
+        hi = bounds[-1] + limit
+        lo = hi - search
+        bounds.append(lo + int(np.argmin(energy_db[lo:hi])))
+    bounds.append(total)
+    return [(a * frame_s, b * frame_s) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+def _norm(text: str) -> str:
+    return re.sub(r"\W+", " ", text).strip().lower()
+
+
+def iter_chunk_segments(
+    chunks: Iterable[Tuple[float, Sequence[TranscriptSegment]]],
+) -> Iterator[TranscriptSegment]:
+    """Merge per-chunk segments (times relative to their chunk) onto one timeline, lazily.
+
+    ``chunks`` yields ``(offset_s, segments)`` in timeline order. A segment that repeats
+    the previous chunk's last text right at the boundary is folded into it, so the last
+    segment seen is held back until the next one arrives.
+    """
+    pending: Optional[TranscriptSegment] = None
+    for offset, segments in chunks:
+        for i, seg in enumerate(segments):
+            shifted = TranscriptSegment(
+                start=seg.start + offset, end=seg.end + offset, text=seg.text
+            )
+            if (
+                i == 0
+                and pending is not None
+                and _norm(shifted.text) == _norm(pending.text)
+                and shifted.start - pending.end < DEDUP_GAP_S
+            ):
+                pending = pending.model_copy(update={"end": max(pending.end, shifted.end)})
+                continue
+            if pending is not None:
+                yield pending
+            pending = shifted
+    if pending is not None:
+        yield pending
+
+
+def merge_chunk_segments(
+    chunks: Iterable[Tuple[float, Sequence[TranscriptSegment]]],
+) -> List[TranscriptSegment]:
+    """List form of :func:`iter_chunk_segments`."""
+    return list(iter_chunk_segments(chunks))
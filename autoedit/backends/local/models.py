@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import os
+from collections import OrderedDict
+from threading import Lock, Thread
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+MODEL_BUDGET_ENV = "AUTOEDIT_MODEL_BUDGET_MB"
+DEFAULT_MODEL_BUDGET_MB = 4096
+
+# Approximate resident size (MB) of faster-whisper models with float32 weights (the CPU
+# default); int8 variants need roughly half. Only used to decide what to evict.
+MODEL_SIZES_MB = {
+    "tiny": 150,
+    "base": 290,
+    "small": 970,
+    "medium": 3000,
+    "large-v1": 6200,
+    "large-v2": 6200,
+    "large-v3": 6200,
+    "large": 6200,
+    "distil-large-v3": 3000,
+}
+
+# (model, device, compute_type, *sorted extra load options)
+ModelKey = Tuple[Any, ...]
+
+
+def estimate_model_bytes(model: str, compute_type: str = "default") -> int:
+    base = next((mb for name, mb in MODEL_SIZES_MB.items() if model.startswith(name)), 3000)
+    if model.endswith(".en") and model[:-3] in MODEL_SIZES_MB:
+        base = MODEL_SIZES_MB[model[:-3]]
+    if "int8" in compute_type:
+        base //= 2
+    return base * 1024 * 1024
+
+
+def _load_whisper(model: str, device: str, compute_type: str, **options: Any) -> Any:
+    from faster_whisper import WhisperModel
+
+    return WhisperModel(model, device=device, compute_type=compute_type, **options)
+
+
+class _Slot:
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.model: Any = None
+        self.size = 0
+
+
+class ModelRegistry:
+    """Process-wide cache of loaded Whisper models.
+
+    Models are keyed on ``(model, device, compute_type)`` plus any extra load options
+    (e.g. ``cpu_threads``/``num_workers``). Thread-safe: concurrent requests for the same
+    key wait for a single load, while different keys load in parallel. Models are kept in
+    LRU order and the least recently used ones are dropped once the estimated total
+    exceeds ``budget_bytes`` (the model being requested is always kept, even if it alone
+    exceeds the budget).
+    """
+
+    def __init__(
+        self,
+        budget_bytes: int = DEFAULT_MODEL_BUDGET_MB * 1024 * 1024,
+        loader: Callable[..., Any] = _load_whisper,
+    ) -> None:
+        self.budget_bytes = budget_bytes
+        self._loader = loader
+        self._lock = Lock()
+        self._slots: "OrderedDict[ModelKey, _Slot]" = OrderedDict()
+
+    def get(
+        self, model: str, device: str = "auto", compute_type: str = "default", **options: Any
+    ) -> Any:
+        key: ModelKey = (model, device, compute_type, *sorted(options.items()))
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = self._slots[key] = _Slot()
+            self._slots.move_to_end(key)
+        with slot.lock:
+            if slot.model is None:
+                slot.model = self._loader(model, device, compute_type, **options)
+                slot.size = estimate_model_bytes(model, compute_type)
+                self._evict(keep=key)
+            return slot.model
+
+    def _evict(self, keep: ModelKey) -> None:
+        with self._lock:
+            total = sum(s.size for s in self._slots.values())
+            for key in list(self._slots):
+                if total <= self.budget_bytes:
+                    break
+                slot = self._slots[key]
+                if key == keep or slot.model is None:
+                    continue
+                # Callers already holding the model keep it alive; we only drop our reference.
+                del self._slots[key]
+                total -= slot.size
+
+    def prewarm(
+        self,
+        models: Iterable[str],
+        device: str = "auto",
+        compute_type: str = "default",
+        **options: Any,
+    ) -> None:
+        """Load ``models`` ahead of the first transcription."""
+        for model in models:
+            self.get(model, device, compute_type, **options)
+
+    def prewarm_async(
+        self,
+        models: Iterable[str],
+        device: str = "auto",
+        compute_type: str = "default",
+        **options: Any,
+    ) -> Thread:
+        """Start loading ``models`` in a daemon thread so the load overlaps other work.
+
+        A later :meth:`get` for the same key waits for that load instead of starting its
+        own. Load errors are left for the caller's own :meth:`get` to raise.
+        """
+        names = list(models)
+
+        def run() -> None:
+            for model in names:
+                try:
+                    self.get(model, device, compute_type, **options)
+                except Exception:
+                    pass
+
+        thread = Thread(target=run, name="autoedit-model-prewarm", daemon=True)
+        thread.start()
+        return thread
+
+    def loaded(self) -> Dict[ModelKey, int]:
+        """Loaded keys (least recently used first) with their estimated sizes."""
+        with self._lock:
+            return {k: s.size for k, s in self._slots.items() if s.model is not None}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._slots.clear()
+
+
+_REGISTRY: Optional[ModelRegistry] = None
+_REGISTRY_LOCK = Lock()
+
+
+def get_registry() -> ModelRegistry:
+    """The shared registry; its budget comes from ``$AUTOEDIT_MODEL_BUDGET_MB``."""
+    global _REGISTRY
+    with _REGISTRY_LOCK:
+        if _REGISTRY is None:
+            budget_mb = int(os.getenv(MODEL_BUDGET_ENV, DEFAULT_MODEL_BUDGET_MB))
+            _REGISTRY = ModelRegistry(budget_bytes=budget_mb * 1024 * 1024)
+        return _REGISTRY
@@ -1,37 +1,149 @@
 from __future__ import annotations
 
+import itertools
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from threading import Thread
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from autoedit.backends.base import Transcriber
+from autoedit.backends.local.chunking import CHUNK_MAX_S, iter_chunk_segments, plan_chunks
+from autoedit.backends.local.models import ModelRegistry, get_registry
 from autoedit.schemas.transcript import Transcript, TranscriptSegment
 
+FASTER_WHISPER_HINT = (
+    "faster-whisper not installed. Install with 'pip install faster-whisper' "
+    "or use the [full] extra: 'pip install -e .[full]'."
+)
+
 
 class LocalTranscriber(Transcriber):
     """Local Whisper-based transcriber using faster-whisper if available.
 
     Falls back to a stub transcript if dependency is missing, with guidance to install.
+    Models come from the shared :class:`ModelRegistry`, so only the first transcription
+    with a given model/device/compute type pays the load.
+
+    With ``workers > 1`` the audio is split at silences into chunks of at most
+    ``chunk_length`` seconds that are transcribed concurrently by one model loaded with
+    ``num_workers=workers`` and ``cpu_threads`` threads per worker (default: CPU count
+    divided by workers).
     """
 
-    def __init__(self, model: str = "medium") -> None:
+    def __init__(
+        self,
+        model: str = "medium",
+        device: str = "auto",
+        compute_type: str = "default",
+        registry: Optional[ModelRegistry] = None,
+        workers: int = 1,
+        cpu_threads: int = 0,
+        chunk_length: float = CHUNK_MAX_S,
+    ) -> None:
         self.model_name = model
+        self.device = device
+        self.compute_type = compute_type
+        self.registry = registry or get_registry()
+        self.workers = max(1, workers)
+        self.cpu_threads = cpu_threads
+        self.chunk_length = chunk_length
+
+    def _model_options(self) -> Dict[str, Any]:
+        if self.workers == 1 and not self.cpu_threads:
+            return {}
+        threads = self.cpu_threads or max(1, (os.cpu_count() or 1) // self.workers)
+        return {"cpu_threads": threads, "num_workers": self.workers}
+
+    def _model(self):
+        return self.registry.get(
+            self.model_name, self.device, self.compute_type, **self._model_options()
+        )
+
+    def prewarm(self) -> Thread:
+        """Start loading this transcriber's model in the background."""
+        return self.registry.prewarm_async(
+            [self.model_name], self.device, self.compute_type, **self._model_options()
+        )
 
     def transcribe(self, audio_path: Path, language: Optional[str] = None) -> Transcript:
         try:
-            from faster_whisper import WhisperModel  # type: ignore
+            import faster_whisper  # noqa: F401
         except Exception:  # pragma: no cover - fallback path
             # Graceful fallback: return empty transcript with a hint
-            hint = (
-                "faster-whisper not installed. Install with 'pip install faster-whisper' "
-                "or use the [full] extra: 'pip install -e .[full]'."
-            )
-            return Transcript(text="", segments=[], note=hint)
-
-        model = WhisperModel(self.model_name, device="auto")
-        segments_iter, info = model.transcribe(str(audio_path), language=language)
-
-        segments = [
-            TranscriptSegment(start=s.start, end=s.end, text=s.text or "") for s in segments_iter
-        ]
+            return Transcript(text="", segments=[], note=FASTER_WHISPER_HINT)
+
+        segments = list(self.iter_segments(audio_path, language))
         full_text = " ".join(s.text for s in segments).strip()
         return Transcript(text=full_text, segments=segments)
+
+    def iter_segments(
+        self, audio_path: Path, language: Optional[str] = None
+    ) -> Iterator[TranscriptSegment]:
+        """Yield segments in timeline order as the decoder produces them.
+
+        Nothing is accumulated, so memory stays flat however long the audio is. Unlike
+        :meth:`transcribe` there is no stub fallback: raises ImportError without
+        faster-whisper.
+        """
+        try:
+            import faster_whisper  # noqa: F401
+        except ImportError as exc:
+            raise ImportError(FASTER_WHISPER_HINT) from exc
+
+        if self.workers > 1:
+            chunked = self._plan_chunks(audio_path)
+            if chunked is not None:
+                yield from self._iter_chunked(*chunked, language)
+                return
+        segments_iter, info = self._model().transcribe(str(audio_path), language=language)
+        for s in segments_iter:
+            yield TranscriptSegment(start=s.start, end=s.end, text=s.text or "")
+
+    def _plan_chunks(self, audio_path: Path) -> Optional[Tuple[Any, List[Tuple[float, float]]]]:
+        """Decoded samples and silence-aligned chunks; None means use the single stream."""
+        from autoedit.core.vad import (
+            FRAME_S,
+            VAD_SAMPLE_RATE,
+            decode_pcm,
+            energy_envelope,
+            load_pcm,
+        )
+
+        pcm = decode_pcm(audio_path)
+        if pcm is None:
+            return None
+        samples = load_pcm(pcm)
+        chunks = plan_chunks(energy_envelope(samples, VAD_SAMPLE_RATE), FRAME_S, self.chunk_length)
+        if len(chunks) < 2:
+            return None
+        return samples, chunks
+
+    def _iter_chunked(
+        self, samples: Any, chunks: List[Tuple[float, float]], language: Optional[str]
+    ) -> Iterator[TranscriptSegment]:
+        """Transcribe ``chunks`` concurrently, yielding each one's segments in order."""
+        from autoedit.core.vad import VAD_SAMPLE_RATE
+
+        model = self._model()
+
+        def run(chunk: Tuple[float, float], lang: Optional[str]):
+            a, b = (int(round(t * VAD_SAMPLE_RATE)) for t in chunk)
+            segments_iter, info = model.transcribe(samples[a:b], language=lang)
+            segs = [
+                TranscriptSegment(start=s.start, end=s.end, text=s.text or "")
+                for s in segments_iter
+            ]
+            return info, segs
+
+        head: List[List[TranscriptSegment]] = []
+        lang = language
+        if lang is None:
+            # The first chunk detects the language so every chunk decodes consistently.
+            info, first = run(chunks[0], None)
+            head, lang = [first], getattr(info, "language", None)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            # map() yields results in chunk order as soon as each is ready.
+            rest = pool.map(lambda c: run(c, lang)[1], chunks[len(head) :])
+            starts = (start for start, _ in chunks)
+            yield from iter_chunk_segments(zip(starts, itertools.chain(head, rest)))
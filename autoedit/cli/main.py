@@ -1,22 +1,45 @@
 from __future__ import annotations
 
 from pathlib import Path
+import importlib.util
 import os
-from typing import Any, List, Optional
+from typing import Any, Callable, Iterable, List, Optional, Tuple
 
 import typer
 from rich import print
 from rich.console import Console
 from rich.traceback import install
 
+from autoedit.core.cache import CACHE_DIR_ENV, DEFAULT_CACHE_MAX_BYTES
 from autoedit.core.ingest import ingest_media
-from autoedit.core.scene_detect import detect_scenes
-from autoedit.core.select import select_segments
+from autoedit.core.probe import ProbeStore
+from autoedit.core.proxy import PROXY_HEIGHT
+from autoedit.core.frame_diff import DEFAULT_THRESHOLDS
+from autoedit.core.scene_cache import SceneCache
+from autoedit.core.scene_detect import (
+    CHUNK_LENGTH_S,
+    DETECTORS,
+    DetectorConfig,
+    detect_scenes,
+)
+from autoedit.core.select import SPEECH_SOURCES, select_segments
+from autoedit.core.transcript_cache import TranscriptCache
+from autoedit.core.transcript_stream import (
+    TRANSCRIPT_JSONL,
+    iter_transcript_jsonl,
+    write_transcript_stream,
+)
+from autoedit.core.vad import VAD_NAME, analyze_audio
 from autoedit.exporters.mlt import export_mlt
 from autoedit.schemas.sequences import Sequences
 from autoedit.schemas.selection import Selection
-from autoedit.schemas.transcript import Transcript
+from autoedit.schemas.transcript import Transcript, TranscriptSegment
 from autoedit.backends.local.transcriber import LocalTranscriber
+from autoedit.backends.lightning.fanout import (
+    iter_fanout_segments,
+    plan_audio_chunks,
+    transcribe_fanout,
+)
 from autoedit.backends.lightning.transcriber import (
     LightningConfig,
     LightningTranscriber,
@@ -91,6 +114,222 @@ def _load_config(config_path: Optional[Path]) -> dict:
     return data
 
 
+def _detector_config(
+    name: str,
+    threshold: Optional[float] = None,
+    frame_skip: int = 0,
+    height: int = 72,
+    color: str = "gray",
+) -> DetectorConfig:
+    if name not in DETECTORS:
+        raise typer.BadParameter(f"Unknown detector '{name}'. Choose from: {', '.join(DETECTORS)}")
+    if color not in DEFAULT_THRESHOLDS:
+        raise typer.BadParameter("--color must be one of: gray, hsv")
+    return DetectorConfig(
+        name=name, threshold=threshold, frame_skip=frame_skip, height=height, color=color
+    )
+
+
+def _scene_cache(cache_dir: Optional[Path], max_mb: int) -> Optional[SceneCache]:
+    if cache_dir is None:
+        return None
+    return SceneCache(cache_dir, max_bytes=max_mb * 1024 * 1024)
+
+
+def _run_detection(raw_dir: Path, **kwargs: Any):
+    try:
+        return detect_scenes(raw_dir, **kwargs)
+    except ImportError as exc:
+        raise typer.BadParameter(str(exc)) from exc
+
+
+def _selection_rules(config: dict, cli_rules: Optional[List[str]]) -> Optional[List[Any]]:
+    """Rules from ``--rule`` options, else from the config's ``select.rules`` list."""
+    if cli_rules:
+        return list(cli_rules)
+    select_cfg = config.get("select") if config else None
+    if not select_cfg:
+        return None
+    if not isinstance(select_cfg, dict) or not isinstance(select_cfg.get("rules", []), list):
+        raise typer.BadParameter("Config 'select.rules' must be a list of rules")
+    return select_cfg.get("rules") or None
+
+
+def _run_selection(artifacts_dir: Path, **kwargs: Any) -> Selection:
+    try:
+        return select_segments(artifacts_dir, **kwargs)
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc)) from exc
+
+
+def _run_vad(audio: Path, output: Path, **kwargs: Any):
+    try:
+        activity = analyze_audio(audio, output, **kwargs)
+    except ImportError as exc:
+        raise typer.BadParameter(str(exc)) from exc
+    if activity is None:
+        raise typer.BadParameter(f"Could not decode {audio} with ffmpeg")
+    return activity
+
+
+def _speech_source(value: str) -> str:
+    if value not in SPEECH_SOURCES:
+        raise typer.BadParameter(f"--speech-source must be one of: {', '.join(SPEECH_SOURCES)}")
+    return value
+
+
+def _transcript_cache(
+    config: dict, cache_dir: Optional[Path], max_mb: Optional[int] = None
+) -> Optional[TranscriptCache]:
+    """Transcript cache from ``--cache-dir`` or the config's ``cache:`` block, if enabled."""
+    section = config.get("cache") or {}
+    if not isinstance(section, dict):
+        raise typer.BadParameter("Config 'cache' must be a mapping")
+    if section.get("transcripts") is False:
+        return None
+    root = cache_dir or section.get("dir")
+    if not root:
+        return None
+    max_mb = max_mb or section.get("max_mb") or DEFAULT_CACHE_MAX_BYTES // (1024 * 1024)
+    return TranscriptCache(Path(root).expanduser(), max_bytes=int(max_mb) * 1024 * 1024)
+
+
+def _transcribe_cached(
+    cache: Optional[TranscriptCache],
+    audio: Optional[Path],
+    key: Tuple[str, str, Optional[str]],
+    run: Callable[[], Transcript],
+) -> Transcript:
+    """``run()`` behind the transcript cache; ``key`` is (backend, model, language)."""
+    if cache is None or audio is None:
+        return run()
+    cached = cache.lookup(audio, *key)
+    if cached is not None:
+        print(f"Transcript cache hit for {audio.name}")
+        return cached
+    transcript = run()
+    cache.put(audio, *key, transcript)
+    return transcript
+
+
+def _stream_cached(
+    cache: Optional[TranscriptCache],
+    audio: Optional[Path],
+    key: Tuple[str, str, Optional[str]],
+    run: Callable[[], Iterable[TranscriptSegment]],
+    path: Path,
+) -> Path:
+    """Streaming counterpart of :func:`_transcribe_cached`; caches once the stream completes."""
+    if cache is None or audio is None:
+        return _write_stream(run(), path)
+    cached = cache.lookup(audio, *key)
+    if cached is not None:
+        print(f"Transcript cache hit for {audio.name}")
+        return _write_stream(cached.segments, path)
+    _write_stream(run(), path)
+    segments = list(iter_transcript_jsonl(path))
+    text = " ".join(s.text for s in segments).strip()
+    cache.put(audio, *key, Transcript(text=text, segments=segments))
+    return path
+
+
+def _fanout_chunks(audio: Path) -> Optional[List[Tuple[float, float]]]:
+    """Silence-aligned chunks for --fanout; None when one request is enough (or decode fails)."""
+    try:
+        chunks = plan_audio_chunks(audio)
+    except ImportError as exc:
+        raise typer.BadParameter(str(exc)) from exc
+    return chunks if chunks and len(chunks) > 1 else None
+
+
+def _write_stream(segments: Iterable[TranscriptSegment], path: Path) -> Path:
+    """Append ``segments`` to ``path`` (JSONL) as they are decoded."""
+    try:
+        count = write_transcript_stream(segments, path)
+    except ImportError as exc:
+        raise typer.BadParameter(str(exc)) from exc
+    print(f"Wrote {path} ({count} segments)")
+    return path
+
+
+def _beam_runners(
+    config: dict,
+    audio: Optional[Path],
+    audio_url: Optional[str],
+    endpoint: Optional[str],
+    language: Optional[str],
+    model: str,
+    fanout: bool = False,
+    remote_jobs: bool = False,
+    upload_prefix: Optional[str] = None,
+) -> Tuple[Callable[[], Transcript], Callable[[], Iterable[TranscriptSegment]]]:
+    """``run``/``run_stream`` callables for the Beam backend.
+
+    Without ``audio_url``, ``audio`` is uploaded to the configured storage, under
+    ``upload_prefix`` when given. Uploads only happen when a callable runs, i.e. on a
+    transcript cache miss.
+    """
+    base_url = endpoint or os.getenv("LIGHTNING_BASE_URL")
+    if not base_url:
+        raise typer.BadParameter(
+            "Provide --endpoint or set LIGHTNING_BASE_URL for the Beam backend "
+            "(alias: lightning)."
+        )
+    storage_client = _resolve_storage_client(config)
+    if not audio_url:
+        if audio is None:
+            raise typer.BadParameter(
+                "Provide an audio file path when uploading for the Beam backend."
+            )
+        if not storage_client:
+            raise typer.BadParameter(
+                "Provide --audio-url or configure storage for the Beam backend "
+                "(see docs/CLI.md)."
+            )
+    if fanout and (audio is None or not storage_client):
+        raise typer.BadParameter(
+            "--fanout uploads chunks itself: provide an audio file and configure storage."
+        )
+    beam_tokens = _collect_beam_tokens()
+    remote = LightningTranscriber(
+        LightningConfig(
+            base_url=base_url,
+            api_key=os.getenv("LIGHTNING_API_KEY"),
+            api_keys=beam_tokens or None,
+            use_jobs=remote_jobs,
+        )
+    )
+
+    def source_url() -> str:
+        if audio_url:
+            return audio_url
+        assert audio is not None and storage_client  # validated above
+        target = f"{upload_prefix}/{audio.name}" if upload_prefix else None
+        return storage_client.upload_file(audio, target_name=target).url
+
+    def chunk_url(path: Path) -> str:
+        # Chunks live in a uniquely named temp dir; keep that name to avoid collisions.
+        assert storage_client  # --fanout validated storage above
+        target = f"{upload_prefix or path.parent.name}/chunks/{path.name}"
+        return storage_client.upload_file(path, target_name=target).url
+
+    def run() -> Transcript:
+        if fanout and audio is not None:
+            chunks = _fanout_chunks(audio)
+            if chunks:
+                return transcribe_fanout(remote, audio, chunks, chunk_url, language, model)
+        return remote.transcribe_url(source_url(), lang=language, model=model)
+
+    def run_stream() -> Iterable[TranscriptSegment]:
+        if fanout and audio is not None:
+            chunks = _fanout_chunks(audio)
+            if chunks:
+                return iter_fanout_segments(remote, audio, chunks, chunk_url, language, model)
+        return remote.iter_segments_url(source_url(), lang=language, model=model)
+
+    return run, run_stream
+
+
 def _resolve_storage_client(config: dict) -> Optional[Any]:
     storage_cfg = config.get("storage") if config else None
     if not storage_cfg:
@@ -102,10 +341,33 @@ def _resolve_storage_client(config: dict) -> Optional[Any]:
 def ingest(
     inputs: List[Path] = typer.Argument(..., exists=True, readable=True),
     output: Path = typer.Option(..., "-o", "--output", help="Run directory, e.g. runs/demo"),
+    cache_dir: Optional[Path] = typer.Option(
+        None,
+        envvar=CACHE_DIR_ENV,
+        help="Content-addressed ingest cache; known media is linked instead of re-copied",
+    ),
+    workers: Optional[int] = typer.Option(
+        None, min=1, help="Parallel ingest workers (defaults to the CPU count)"
+    ),
+    proxies: bool = typer.Option(
+        False, help="Generate low-res all-intra proxies in proxies/ for faster analysis"
+    ),
+    proxy_height: int = typer.Option(PROXY_HEIGHT, min=64, help="Proxy height in pixels"),
+    stream: bool = typer.Option(
+        False, help="Read each source once, teeing the copy into ffmpeg (network mounts)"
+    ),
 ):
     """Ingest input media into a run directory and extract audio."""
     console.rule("Ingest")
-    out = ingest_media(inputs, output)
+    out = ingest_media(
+        inputs,
+        output,
+        cache_dir=cache_dir,
+        workers=workers,
+        proxies=proxies,
+        proxy_height=proxy_height,
+        stream=stream,
+    )
     print({"created": out})
 
 
@@ -113,10 +375,52 @@ def ingest(
 def cut(
     raw_dir: Path = typer.Argument(..., exists=True, file_okay=False),
     output: Path = typer.Option(..., "-o", "--output", help="Output sequences.json path"),
+    proxies: bool = typer.Option(True, help="Analyse proxies/ instead of originals if present"),
+    detector: str = typer.Option(
+        "content",
+        help="Scene detector: content (PySceneDetect) | numpy (ffmpeg pipe) | "
+        "ffmpeg (scene filter, fast) | keyframes (no decode, rough)",
+    ),
+    threshold: Optional[float] = typer.Option(
+        None, help="Cut threshold (detector-specific; defaults to the backend default)"
+    ),
+    frame_skip: int = typer.Option(0, min=0, help="Frames skipped between analysed frames"),
+    downscale: int = typer.Option(
+        72, min=16, help="Analysis frame height in pixels (numpy/ffmpeg detectors)"
+    ),
+    color: str = typer.Option("gray", help="Colour space for the numpy detector: gray|hsv"),
+    chunk_workers: int = typer.Option(
+        1, min=1, help="Split long videos into keyframe-aligned windows across N processes"
+    ),
+    chunk_length: float = typer.Option(
+        CHUNK_LENGTH_S, min=1.0, help="Window length in seconds for --chunk-workers"
+    ),
+    workers: Optional[int] = typer.Option(
+        None, min=1, help="Files analysed concurrently (defaults to the CPU count)"
+    ),
+    cache_dir: Optional[Path] = typer.Option(
+        None,
+        envvar=CACHE_DIR_ENV,
+        help="Persistent cache; results are reused for identical media and detector settings",
+    ),
+    cache_max_mb: int = typer.Option(
+        DEFAULT_CACHE_MAX_BYTES // (1024 * 1024),
+        min=1,
+        help="Size limit for cached scene results; least recently used entries are evicted",
+    ),
 ):
-    """Detect scenes and write sequences.json."""
+    """Detect scenes in every file in raw/ and write sequences.json."""
     console.rule("Scene Detection")
-    segments = detect_scenes(raw_dir)
+    config = _detector_config(detector, threshold, frame_skip, downscale, color)
+    segments = _run_detection(
+        raw_dir,
+        use_proxies=proxies,
+        config=config,
+        chunk_workers=chunk_workers,
+        chunk_length=chunk_length,
+        workers=workers,
+        cache=_scene_cache(cache_dir, cache_max_mb),
+    )
     data = Sequences(segments=segments)
     _ensure_parent(output)
     output.write_text(data.model_dump_json(indent=2))
@@ -143,47 +447,77 @@ def stt(
     config_path: Optional[Path] = typer.Option(
         None, help="Path to config.yaml (defaults to $AUTOEDIT_CONFIG if set)"
     ),
+    workers: int = typer.Option(
+        1, min=1, help="Local: transcribe silence-aligned chunks with N parallel workers"
+    ),
+    cpu_threads: int = typer.Option(
+        0, min=0, help="Local: CPU threads per worker (0 = CPU count / workers)"
+    ),
+    stream: bool = typer.Option(
+        False, help="Append segments to <output>.jsonl as they are decoded (crash-safe)"
+    ),
+    cache_dir: Optional[Path] = typer.Option(
+        None,
+        envvar=CACHE_DIR_ENV,
+        help="Persistent cache; identical audio, model and language skip transcription",
+    ),
+    cache_max_mb: Optional[int] = typer.Option(
+        None, min=1, help="Size limit for cached transcripts (default: config or 512)"
+    ),
+    fanout: bool = typer.Option(
+        False,
+        help="Beam: split at silences, upload chunks concurrently and spread them over all tokens",
+    ),
+    remote_jobs: bool = typer.Option(
+        False, help="Beam: submit to the service's /jobs API and long-poll for the result"
+    ),
 ):
     """Transcribe audio to transcript.json using the selected backend."""
     console.rule("Transcription")
+    config = _load_config(config_path)
+    cache = _transcript_cache(config, cache_dir, cache_max_mb) if audio is not None else None
     if backend == "local":
-        transcriber = LocalTranscriber(model=model)
-        transcript: Transcript = transcriber.transcribe(audio, language=language)
+        transcriber = LocalTranscriber(model=model, workers=workers, cpu_threads=cpu_threads)
+
+        def run() -> Transcript:
+            return transcriber.transcribe(audio, language=language)
+
+        def run_stream() -> Iterable[TranscriptSegment]:
+            return transcriber.iter_segments(audio, language=language)
+
     else:
-        base_url = endpoint or os.getenv("LIGHTNING_BASE_URL")
-        if not base_url:
-            raise typer.BadParameter(
-                "Provide --endpoint or set LIGHTNING_BASE_URL for the Beam backend "
-                "(alias: lightning)."
-            )
-        config = _load_config(config_path)
-        storage_client = _resolve_storage_client(config)
-        if not audio_url:
-            if audio is None:
-                raise typer.BadParameter(
-                    "Provide an audio file path when uploading for the Beam backend."
-                )
-            if not storage_client:
-                raise typer.BadParameter(
-                    "Provide --audio-url or configure storage for the Beam backend "
-                    "(see docs/CLI.md)."
-                )
-            upload = storage_client.upload_file(audio)
-            audio_url = upload.url
-        beam_tokens = _collect_beam_tokens()
-        transcriber = LightningTranscriber(
-            LightningConfig(
-                base_url=base_url,
-                api_key=os.getenv("LIGHTNING_API_KEY"),
-                api_keys=beam_tokens or None,
-            )
+        run, run_stream = _beam_runners(
+            config, audio, audio_url, endpoint, language, model, fanout, remote_jobs
         )
-        transcript = transcriber.transcribe_url(audio_url, lang=language, model=model)
+
+    key = (backend, model, language)
+    if stream:
+        _stream_cached(cache, audio, key, run_stream, output.with_suffix(".jsonl"))
+        return
+    transcript = _transcribe_cached(cache, audio, key, run)
     _ensure_parent(output)
     output.write_text(transcript.model_dump_json(indent=2))
     print(f"Wrote {output}")
 
 
+@app.command()
+def vad(
+    audio: Path = typer.Argument(..., exists=True, dir_okay=False),
+    output: Path = typer.Option(..., "-o", "--output", help="Output vad.json path"),
+    threshold_db: Optional[float] = typer.Option(
+        None, help="Speech threshold in dBFS (default: adaptive, above the noise floor)"
+    ),
+    min_speech: float = typer.Option(0.25, min=0.0, help="Drop speech shorter than this (s)"),
+    min_silence: float = typer.Option(0.3, min=0.0, help="Bridge pauses shorter than this (s)"),
+):
+    """Detect speech from audio energy (no transcription) and write vad.json + energy.npy."""
+    console.rule("Voice Activity")
+    activity = _run_vad(
+        audio, output, threshold_db=threshold_db, min_speech=min_speech, min_silence=min_silence
+    )
+    print(f"Wrote {output} ({len(activity.regions)} speech regions)")
+
+
 @app.command()
 def pipeline(
     inputs: List[Path] = typer.Argument(..., exists=True, readable=True),
@@ -204,72 +538,145 @@ def pipeline(
     speech_only: bool = typer.Option(False, help="Keep only segments with detected speech"),
     min_len: float = typer.Option(0.0, help="Drop shots shorter than this (seconds)"),
     max_len: float = typer.Option(0.0, help="Trim shots longer than this (seconds)"),
+    min_speech_ratio: float = typer.Option(
+        0.0, min=0.0, max=1.0, help="Drop shots with less of their duration covered by speech"
+    ),
     mlt_output: Optional[Path] = typer.Option(
         None, help="Optional explicit path for the generated MLT file"
     ),
     config_path: Optional[Path] = typer.Option(
         None, help="Path to config.yaml (defaults to $AUTOEDIT_CONFIG if set)"
     ),
+    cache_dir: Optional[Path] = typer.Option(
+        None,
+        envvar=CACHE_DIR_ENV,
+        help="Content-addressed cache for ingested media, scene-detection results and transcripts",
+    ),
+    workers: Optional[int] = typer.Option(
+        None, min=1, help="Parallel ingest workers (defaults to the CPU count)"
+    ),
+    proxies: bool = typer.Option(
+        False, help="Generate proxies during ingest and run scene detection on them"
+    ),
+    stream: bool = typer.Option(
+        False, help="Read each source once, teeing the copy into ffmpeg (network mounts)"
+    ),
+    detector: str = typer.Option(
+        "content",
+        help="Scene detector: content (PySceneDetect) | numpy (ffmpeg pipe) | "
+        "ffmpeg (scene filter, fast) | keyframes (no decode, rough)",
+    ),
+    chunk_workers: int = typer.Option(
+        1, min=1, help="Split long videos into keyframe-aligned windows across N processes"
+    ),
+    rule: Optional[List[str]] = typer.Option(
+        None, help="Selection rule, repeatable, e.g. 'cap_total:seconds=300' (see docs/CLI.md)"
+    ),
+    speech_source: str = typer.Option(
+        "transcript", help="Speech for selection: transcript | vad (audio energy) | both"
+    ),
+    stt_workers: int = typer.Option(
+        1, min=1, help="Local: transcribe silence-aligned chunks with N parallel workers"
+    ),
+    stream_transcript: bool = typer.Option(
+        False, help="Write artifacts/transcript.jsonl segment by segment instead of transcript.json"
+    ),
+    fanout: bool = typer.Option(
+        False,
+        help="Beam: split at silences, upload chunks concurrently and spread them over all tokens",
+    ),
+    remote_jobs: bool = typer.Option(
+        False, help="Beam: submit to the service's /jobs API and long-poll for the result"
+    ),
 ):
     """Run the full AutoEdit pipeline in one command."""
 
     console.rule("AutoEdit Pipeline")
-
-    ingest_media(inputs, run_dir)
+    detector_config = _detector_config(detector)
+    speech_source = _speech_source(speech_source)
+    config = _load_config(config_path)
+    rules = _selection_rules(config, rule)
+    local_transcriber = LocalTranscriber(model=model, workers=stt_workers)
+    needs_stt = speech_source != "vad"
+    if needs_stt and backend == "local" and importlib.util.find_spec("faster_whisper") is not None:
+        # Load the Whisper model while ingest and scene detection run.
+        local_transcriber.prewarm()
+
+    ingest_media(
+        inputs, run_dir, cache_dir=cache_dir, workers=workers, proxies=proxies, stream=stream
+    )
 
     artifacts_dir = run_dir / "artifacts"
     raw_dir = run_dir / "raw"
     audio_path = run_dir / "audio" / "main.flac"
 
-    # Scene detection
+    # Scene detection (reuses the probe database written during ingest)
+    probes = ProbeStore.for_run(run_dir)
     sequences_path = artifacts_dir / "sequences.json"
-    segments = detect_scenes(raw_dir)
+    segments = _run_detection(
+        raw_dir,
+        probes=probes,
+        use_proxies=proxies,
+        config=detector_config,
+        chunk_workers=chunk_workers,
+        workers=workers,
+        cache=_scene_cache(cache_dir, DEFAULT_CACHE_MAX_BYTES // (1024 * 1024)),
+    )
     sequences = Sequences(segments=segments)
     _ensure_parent(sequences_path)
     sequences_path.write_text(sequences.model_dump_json(indent=2))
 
-    # Transcription
-    transcript_path = artifacts_dir / "transcript.json"
-    config = _load_config(config_path)
-    storage_client = _resolve_storage_client(config)
-
-    if backend == "local":
-        transcriber = LocalTranscriber(model=model)
-        transcript: Transcript = transcriber.transcribe(audio_path, language=language)
-    else:
-        base_url = endpoint or os.getenv("LIGHTNING_BASE_URL")
-        if not base_url:
-            raise typer.BadParameter(
-                "Provide --endpoint or set LIGHTNING_BASE_URL for the Beam backend "
-                "(alias: lightning)."
+    # Voice activity (cheap, energy-based speech regions for selection)
+    if speech_source != "transcript":
+        _run_vad(audio_path, artifacts_dir / VAD_NAME)
+
+    # Transcription (skipped when selection only uses the energy VAD)
+    if needs_stt:
+        transcript_path = artifacts_dir / "transcript.json"
+        if stream_transcript:
+            # Selection prefers transcript.json, so drop any stale one from an earlier run.
+            transcript_path.unlink(missing_ok=True)
+            transcript_path = artifacts_dir / TRANSCRIPT_JSONL
+
+        transcript_cache = _transcript_cache(config, cache_dir)
+        if backend == "local":
+
+            def run() -> Transcript:
+                return local_transcriber.transcribe(audio_path, language=language)
+
+            def run_stream() -> Iterable[TranscriptSegment]:
+                return local_transcriber.iter_segments(audio_path, language=language)
+
+        else:
+            run, run_stream = _beam_runners(
+                config,
+                audio_path,
+                audio_url,
+                endpoint,
+                language,
+                model,
+                fanout,
+                remote_jobs,
+                upload_prefix=run_dir.name,
             )
-        if not audio_url:
-            if not storage_client:
-                raise typer.BadParameter(
-                    "Provide --audio-url or configure storage for the Beam backend "
-                    "(see docs/CLI.md)."
-                )
-            upload = storage_client.upload_file(audio_path, target_name=f"{run_dir.name}/main.flac")
-            audio_url = upload.url
-        beam_tokens = _collect_beam_tokens()
-        transcriber = LightningTranscriber(
-            LightningConfig(
-                base_url=base_url,
-                api_key=os.getenv("LIGHTNING_API_KEY"),
-                api_keys=beam_tokens or None,
-            )
-        )
-        transcript = transcriber.transcribe_url(audio_url, lang=language, model=model)
 
-    _ensure_parent(transcript_path)
-    transcript_path.write_text(transcript.model_dump_json(indent=2))
+        key = (backend, model, language)
+        if stream_transcript:
+            _stream_cached(transcript_cache, audio_path, key, run_stream, transcript_path)
+        else:
+            transcript = _transcribe_cached(transcript_cache, audio_path, key, run)
+            _ensure_parent(transcript_path)
+            transcript_path.write_text(transcript.model_dump_json(indent=2))
 
     # Selection
-    selection = select_segments(
+    selection = _run_selection(
         artifacts_dir,
         speech_only=speech_only,
         min_len=min_len,
         max_len=max_len,
+        rules=rules,
+        min_speech_ratio=min_speech_ratio,
+        speech_source=speech_source,
     )
     selection_path = artifacts_dir / "selection.json"
     _ensure_parent(selection_path)
@@ -278,13 +685,15 @@ def pipeline(
     # Export MLT
     final_mlt = mlt_output or run_dir / "outputs" / "edit.mlt"
     _ensure_parent(final_mlt)
-    export_mlt(selection, output_path=final_mlt)
+    info = probes.lookup(Path(segments[0].source)) if segments else None
+    fps = info.fps if info and info.fps else 25.0
+    export_mlt(selection, output_path=final_mlt, fps=fps)
 
     print(
         {
             "run_dir": str(run_dir),
             "sequences": str(sequences_path),
-            "transcript": str(transcript_path),
+            "transcript": str(transcript_path) if needs_stt else None,
             "selection": str(selection_path),
             "mlt": str(final_mlt),
         }
@@ -298,11 +707,31 @@ def select(
     speech_only: bool = typer.Option(False, help="Keep only segments with detected speech"),
     min_len: float = typer.Option(0.0, help="Drop shots shorter than this (seconds)"),
     max_len: float = typer.Option(0.0, help="Trim shots longer than this (seconds)"),
+    min_speech_ratio: float = typer.Option(
+        0.0, min=0.0, max=1.0, help="Drop shots with less of their duration covered by speech"
+    ),
+    rule: Optional[List[str]] = typer.Option(
+        None, help="Selection rule, repeatable, e.g. 'cap_total:seconds=300' (see docs/CLI.md)"
+    ),
+    config_path: Optional[Path] = typer.Option(
+        None, help="Path to config.yaml (defaults to $AUTOEDIT_CONFIG if set)"
+    ),
+    speech_source: str = typer.Option(
+        "transcript", help="Speech for selection: transcript | vad (vad.json) | both"
+    ),
 ):
     """Apply simple selection rules and write selection.json."""
     console.rule("Selection")
-    selection = select_segments(
-        artifacts_dir, speech_only=speech_only, min_len=min_len, max_len=max_len
+    speech_source = _speech_source(speech_source)
+    rules = _selection_rules(_load_config(config_path), rule)
+    selection = _run_selection(
+        artifacts_dir,
+        speech_only=speech_only,
+        min_len=min_len,
+        max_len=max_len,
+        rules=rules,
+        min_speech_ratio=min_speech_ratio,
+        speech_source=speech_source,
     )
     _ensure_parent(output)
     output.write_text(selection.model_dump_json(indent=2))
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+
+from autoedit.core.fsutil import atomic_write_text, hash_file, link_or_copy
+
+CACHE_DIR_ENV = "AUTOEDIT_CACHE_DIR"
+
+DEFAULT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+
+def cache_key(*parts: Any) -> str:
+    """Stable SHA-256 key for JSON-serialisable parts (dict order does not matter)."""
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class DiskCache:
+    """Small JSON blob store on local disk with size-based LRU eviction.
+
+    Each value is one file under ``root/<aa>/<key>.json``. Reads refresh the file's
+    mtime, and writes evict the least recently used files until the directory fits in
+    ``max_bytes``.
+    """
+
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_CACHE_MAX_BYTES) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self._path(key)
+        try:
+            data = json.loads(path.read_text())
+        except (FileNotFoundError, ValueError):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def put(self, key: str, value: Any) -> None:
+        atomic_write_text(self._path(key), json.dumps(value))
+        self.evict()
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def evict(self) -> int:
+        """Remove least recently used entries until under ``max_bytes``; returns the count."""
+        with self._lock:
+            entries = []
+            total = 0
+            for path in self.root.glob("*/*.json"):
+                try:
+                    st = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime_ns, st.st_size, path))
+                total += st.st_size
+            removed = 0
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                removed += 1
+            return removed
+
+
+@dataclass
+class IngestEntry:
+    digest: str
+    media: Optional[Path] = None
+    audio: Optional[Path] = None
+    probe: Optional[dict] = None
+
+
+class IngestCache:
+    """Content-addressed store of ingested media, extracted audio and probe data.
+
+    Layout under ``root``::
+
+        index.json                 stat fingerprint (path|size|mtime_ns) -> sha256
+        objects/<aa>/<sha256>/     media<ext>, audio.flac, probe.json
+
+    The stat index lets unchanged files skip re-hashing; the hash lets renamed or
+    re-exported copies of the same bytes hit the cache. Use :meth:`shared` to get the one
+    instance per root that a process's caches share; writes merge with ``index.json`` on
+    disk so entries from other processes are kept.
+    """
+
+    _shared: Dict[Path, "IngestCache"] = {}
+    _shared_lock = Lock()
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._index_path = root / "index.json"
+        self._index: Optional[Dict[str, str]] = None
+        self._lock = Lock()
+
+    @classmethod
+    def shared(cls, root: Path) -> "IngestCache":
+        """Return the process-wide instance for ``root``, creating it on first use."""
+        key = root.expanduser().resolve()
+        with cls._shared_lock:
+            cache = cls._shared.get(key)
+            if cache is None:
+                cache = cls._shared[key] = cls(root)
+            return cache
+
+    @staticmethod
+    def _fingerprint(path: Path) -> str:
+        st = path.stat()
+        return f"{path.resolve()}|{st.st_size}|{st.st_mtime_ns}"
+
+    def _load_index(self) -> Dict[str, str]:
+        if self._index is None:
+            try:
+                self._index = json.loads(self._index_path.read_text())
+            except (FileNotFoundError, ValueError):
+                self._index = {}
+        return self._index
+
+    def known_digest(self, path: Path) -> Optional[str]:
+        """Return the cached digest for ``path`` if its size and mtime are unchanged."""
+        key = self._fingerprint(path)
+        with self._lock:
+            return self._load_index().get(key)
+
+    def remember(self, path: Path, digest: str) -> None:
+        key = self._fingerprint(path)
+        with self._lock:
+            index = self._load_index()
+            if index.get(key) == digest:
+                return
+            index[key] = digest
+            try:
+                merged = json.loads(self._index_path.read_text())
+            except (FileNotFoundError, ValueError):
+                merged = {}
+            merged.update(index)
+            self._index = merged
+            atomic_write_text(self._index_path, json.dumps(merged, indent=2))
+
+    def digest(self, path: Path) -> str:
+        """Hash ``path`` incrementally, reusing the stat index when possible."""
+        known = self.known_digest(path)
+        if known:
+            return known
+        digest = hash_file(path)
+        self.remember(path, digest)
+        return digest
+
+    def entry_dir(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / digest
+
+    def lookup(self, digest: str) -> IngestEntry:
+        entry_dir = self.entry_dir(digest)
+        entry = IngestEntry(digest=digest)
+        if not entry_dir.is_dir():
+            return entry
+        media = sorted(entry_dir.glob("media*"))
+        if media:
+            entry.media = media[0]
+        audio = entry_dir / "audio.flac"
+        if audio.exists():
+            entry.audio = audio
+        probe = entry_dir / "probe.json"
+        if probe.exists():
+            try:
+                entry.probe = json.loads(probe.read_text())
+            except ValueError:
+                entry.probe = None
+        return entry
+
+    def put_media(self, digest: str, path: Path) -> bool:
+        """Register ``path`` as the cached media object without copying its bytes.
+
+        Only hardlinks and reflinks are used; returns False when neither is possible
+        (e.g. cache and run directory on different filesystems).
+        """
+        dest = self.entry_dir(digest) / f"media{path.suffix}"
+        if dest.exists():
+            return True
+        try:
+            link_or_copy(path, dest, modes=("hardlink", "reflink"))
+        except OSError:
+            return False
+        return True
+
+    def put_audio(self, digest: str, audio_path: Path) -> None:
+        # Never symlink back into a run directory: runs are disposable, the cache is not.
+        link_or_copy(
+            audio_path, self.entry_dir(digest) / "audio.flac", modes=("hardlink", "reflink", "copy")
+        )
+
+    def put_probe(self, digest: str, data: dict) -> None:
+        atomic_write_text(self.entry_dir(digest) / "probe.json", json.dumps(data, indent=2))
+
+
+class ContentCache:
+    """Cross-run JSON cache keyed on a file's SHA-256 plus caller-supplied parts.
+
+    Digests come from the :class:`IngestCache` stat index shared by every cache under
+    ``root``; values live in a :class:`DiskCache` under ``root/<directory>``. Subclasses
+    set ``directory`` and the key namespace ``kind`` and convert values to their types.
+    """
+
+    directory = ""
+    kind = ""
+
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_CACHE_MAX_BYTES) -> None:
+        self._hashes = IngestCache.shared(root)
+        self._blobs = DiskCache(root / self.directory, max_bytes=max_bytes)
+
+    def digest(self, path: Path) -> str:
+        return self._hashes.digest(path)
+
+    def _key(self, path: Path, parts: Tuple[Any, ...]) -> str:
+        return cache_key(self.kind, self.digest(path), *parts)
+
+    def _get(self, path: Path, parts: Tuple[Any, ...]) -> Optional[dict]:
+        data = self._blobs.get(self._key(path, parts))
+        return data if isinstance(data, dict) else None
+
+    def _put(self, path: Path, parts: Tuple[Any, ...], value: dict) -> None:
+        self._blobs.put(self._key(path, parts), value)
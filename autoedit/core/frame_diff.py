@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import io
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple, cast
+
+from autoedit.core.tools import require_numpy
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import numpy as np
+
+# Frames decoded per read; the buffer is allocated once and reused for the whole stream.
+FRAME_BATCH = 256
+
+# Mean absolute frame difference (0..255) that counts as a cut, per colour space. The HSV
+# value is on the same scale as PySceneDetect's ContentDetector default.
+DEFAULT_THRESHOLDS = {"gray": 20.0, "hsv": 27.0}
+
+
+def frame_size(source_size: Optional[Tuple[int, int]], height: int) -> Tuple[int, int]:
+    """Return an even ``(width, height)`` at ``height`` keeping the source aspect ratio."""
+    src_w, src_h = source_size or (16, 9)
+    width = max(2, int(round(height * src_w / src_h / 2)) * 2)
+    return width, max(2, height - height % 2)
+
+
+def _frame_cmd(
+    source: Path,
+    width: int,
+    height: int,
+    frame_skip: int,
+    pix_fmt: str,
+    start: float = 0.0,
+    end: Optional[float] = None,
+    threads: int = 0,
+) -> List[str]:
+    filters = []
+    if frame_skip > 0:
+        filters.append(f"framestep={frame_skip + 1}")
+    filters.append(f"scale={width}:{height}:flags=fast_bilinear")
+    cmd = ["ffmpeg", "-v", "error", "-nostdin"]
+    if threads:
+        cmd += ["-threads", str(threads)]
+    if start > 0:
+        # Input seeking: jumps to the keyframe before ``start`` and decodes accurately from there.
+        cmd += ["-ss", f"{start:.6f}"]
+    cmd += ["-i", str(source)]
+    if end is not None:
+        cmd += ["-t", f"{max(end - start, 0.0):.6f}"]
+    return cmd + [
+        "-map",
+        "0:v:0",
+        "-an",
+        "-vf",
+        ",".join(filters),
+        "-pix_fmt",
+        pix_fmt,
+        "-f",
+        "rawvideo",
+        "pipe:1",
+    ]
+
+
+def iter_frames(
+    source: Path,
+    width: int,
+    height: int,
+    frame_skip: int = 0,
+    color: str = "gray",
+    batch: int = FRAME_BATCH,
+    start: float = 0.0,
+    end: Optional[float] = None,
+    threads: int = 0,
+) -> Iterator["np.ndarray"]:
+    """Stream downscaled frames from an ffmpeg raw-video pipe in batches.
+
+    Frames are read with ``readinto`` straight into a preallocated ``uint8`` buffer of
+    shape ``(batch, height, width[, 3])``; each yielded array is a view into that buffer
+    and is only valid until the next iteration. Raises RuntimeError when ffmpeg is missing
+    or exits with an error, so a failed decode never passes for a clip without cuts.
+    """
+    np = require_numpy("the numpy scene detector")
+    channels = 3 if color == "hsv" else 1
+    shape: Tuple[int, ...] = (batch, height, width, 3) if channels == 3 else (batch, height, width)
+    buffer = np.empty(shape, dtype=np.uint8)
+    frame_bytes = width * height * channels
+    view = memoryview(buffer).cast("B")
+    pix_fmt = "rgb24" if channels == 3 else "gray"
+    cmd = _frame_cmd(source, width, height, frame_skip, pix_fmt, start, end, threads)
+    # stderr goes to a file rather than a pipe: nobody drains it while frames are read.
+    with tempfile.TemporaryFile() as log:
+        try:
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=log)
+        except FileNotFoundError as exc:
+            raise RuntimeError("ffmpeg is required for the numpy scene detector") from exc
+        assert proc.stdout is not None
+        # Popen's default buffering hands back a BufferedReader, which supports readinto.
+        stdout = cast(io.BufferedReader, proc.stdout)
+        try:
+            while True:
+                filled = 0
+                target = batch * frame_bytes
+                while filled < target:
+                    n = stdout.readinto(view[filled:target])
+                    if not n:
+                        break
+                    filled += n
+                frames = filled // frame_bytes
+                if frames:
+                    yield buffer[:frames]
+                if filled < target:
+                    break
+            if proc.wait() != 0:
+                log.seek(0)
+                detail = log.read().decode(errors="replace").strip()
+                raise RuntimeError(f"ffmpeg failed to decode {source.name}: {detail}")
+        finally:
+            proc.stdout.close()
+            proc.kill()
+            proc.wait()
+
+
+def rgb_to_hsv(frames: "np.ndarray") -> "np.ndarray":
+    """Vectorised RGB -> HSV for ``(..., 3)`` uint8 frames, all channels scaled to 0..255."""
+    np = require_numpy("the numpy scene detector")
+    rgb = frames.astype(np.float32)
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    v = rgb.max(axis=-1)
+    delta = v - rgb.min(axis=-1)
+    s = np.where(v > 0, delta / np.maximum(v, 1e-6) * 255.0, 0.0)
+    safe = np.maximum(delta, 1e-6)
+    h = np.where(
+        v == r,
+        (g - b) / safe,
+        np.where(v == g, 2.0 + (b - r) / safe, 4.0 + (r - g) / safe),
+    )
+    h = np.where(delta > 0, (h / 6.0) % 1.0 * 255.0, 0.0)
+    return np.stack([h, s, v], axis=-1)
+
+
+def frame_scores(frames: "np.ndarray", previous: Optional["np.ndarray"]) -> "np.ndarray":
+    """Mean absolute difference between consecutive frames, computed for a whole batch.
+
+    ``scores[i]`` compares ``frames[i]`` with the frame before it (``previous`` for
+    ``i == 0``; a missing previous frame scores 0).
+    """
+    np = require_numpy("the numpy scene detector")
+    data = frames.astype(np.int16)
+    scores = np.zeros(len(frames), dtype=np.float32)
+    axes = tuple(range(1, data.ndim))
+    if len(frames) > 1:
+        scores[1:] = np.abs(data[1:] - data[:-1]).mean(axis=axes)
+    if previous is not None and len(frames):
+        scores[0] = np.abs(data[0] - previous.astype(np.int16)).mean()
+    return scores
+
+
+def pick_cuts(
+    times: "np.ndarray", scores: "np.ndarray", threshold: float, min_gap: float
+) -> List[float]:
+    """Return cut times where ``scores`` exceed ``threshold``, at least ``min_gap`` apart."""
+    np = require_numpy("the numpy scene detector")
+    cuts: List[float] = []
+    last = -float("inf")
+    for idx in np.flatnonzero(scores > threshold):
+        t = float(times[idx])
+        if t - last >= min_gap:
+            cuts.append(t)
+            last = t
+    return cuts
+
+
+def detect_cuts(
+    source: Path,
+    fps: float,
+    source_size: Optional[Tuple[int, int]] = None,
+    threshold: Optional[float] = None,
+    height: int = 72,
+    frame_skip: int = 0,
+    min_scene_len: float = 0.5,
+    color: str = "gray",
+    start: float = 0.0,
+    end: Optional[float] = None,
+    threads: int = 0,
+) -> List[float]:
+    """Detect hard cuts in ``source`` from downscaled frames piped out of ffmpeg.
+
+    Returns cut times in seconds on the source timeline. With ``frame_skip=N`` only every
+    (N+1)-th frame is analysed, trading boundary precision for speed. ``start``/``end``
+    limit detection to a window; ``threads`` caps ffmpeg's decoder threads (0 = auto).
+    """
+    np = require_numpy("the numpy scene detector")
+    if threshold is None:
+        threshold = DEFAULT_THRESHOLDS[color]
+    width, height = frame_size(source_size, height)
+    step = (frame_skip + 1) / fps
+    cuts: List[float] = []
+    previous = None
+    index = 0
+    last_cut = start
+    frames_iter = iter_frames(
+        source,
+        width,
+        height,
+        frame_skip=frame_skip,
+        color=color,
+        start=start,
+        end=end,
+        threads=threads,
+    )
+    for frames in frames_iter:
+        data = rgb_to_hsv(frames) if color == "hsv" else frames
+        scores = frame_scores(data, previous)
+        times = start + (index + np.arange(len(frames))) * step
+        for t in pick_cuts(times, scores, threshold, min_scene_len):
+            if t - last_cut >= min_scene_len:
+                cuts.append(t)
+                last_cut = t
+        previous = data[-1].copy()
+        index += len(frames)
+    return cuts
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, Sequence
+
+# Large sequential reads keep hashing throughput close to disk bandwidth.
+HASH_CHUNK_SIZE = 8 * 1024 * 1024
+
+LINK_MODES = ("hardlink", "reflink", "symlink", "copy")
+
+_FICLONE = 0x40049409  # Linux ioctl: share extents between two files (btrfs/xfs/...)
+
+
+def hash_file(path: Path, chunk_size: int = HASH_CHUNK_SIZE) -> str:
+    """Return the SHA-256 hex digest of a file, read incrementally in chunks."""
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """Write text next to ``path`` then rename over it so readers never see partial files."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_text(text)
+    os.replace(tmp, path)
+
+
+def file_stamp(path: Path) -> Dict[str, int]:
+    """Size, mtime and inode of ``path``.
+
+    Copies and hardlinks keep the original file's mtime, so a newer-than check cannot
+    tell a re-ingested file from the one a derived file was built from; the full stamp
+    can.
+    """
+    st = path.stat()
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "ino": st.st_ino}
+
+
+def _stamp_path(derived: Path) -> Path:
+    return derived.with_name(f"{derived.name}.src.json")
+
+
+def built_from(derived: Path, source: Path) -> bool:
+    """True if ``derived`` exists and was built from ``source``'s current contents."""
+    try:
+        recorded = json.loads(_stamp_path(derived).read_text())
+        return derived.exists() and recorded == file_stamp(source)
+    except (FileNotFoundError, ValueError):
+        return False
+
+
+def forget_source(derived: Path) -> None:
+    """Drop ``derived``'s stamp before rebuilding it, so a crash leaves it stale."""
+    _stamp_path(derived).unlink(missing_ok=True)
+
+
+def record_source(derived: Path, stamp: Dict[str, int]) -> None:
+    """Record the :func:`file_stamp` of the source ``derived`` was built from."""
+    atomic_write_text(_stamp_path(derived), json.dumps(stamp))
+
+
+def _reflink(src: Path, dest: Path) -> None:
+    import fcntl
+
+    try:
+        with src.open("rb") as s, dest.open("wb") as d:
+            fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+    except OSError:
+        dest.unlink(missing_ok=True)
+        raise
+
+
+def link_or_copy(src: Path, dest: Path, modes: Sequence[str] = LINK_MODES) -> str:
+    """Materialise ``src`` at ``dest`` using the cheapest mode that works.
+
+    Modes are tried in order (``hardlink``, ``reflink``, ``symlink``, ``copy``). Returns the
+    mode used, or raises ``OSError`` if none succeeded.
+    """
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    if dest.is_symlink() or dest.exists():
+        dest.unlink()
+    last_error: OSError | None = None
+    for mode in modes:
+        try:
+            if mode == "hardlink":
+                os.link(src, dest)
+            elif mode == "reflink":
+                _reflink(src, dest)
+            elif mode == "symlink":
+                dest.symlink_to(src.resolve())
+            elif mode == "copy":
+                shutil.copy2(src, dest)
+            else:
+                raise ValueError(f"Unknown link mode: {mode}")
+            return mode
+        except (OSError, ImportError) as exc:
+            last_error = exc if isinstance(exc, OSError) else OSError(str(exc))
+    raise last_error or OSError(f"Could not link {src} to {dest}")
@@ -1,50 +1,34 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import os
+import queue
 import shutil
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
+from pydantic import ValidationError
 from rich import print
 
+from autoedit.core.cache import IngestCache, IngestEntry
+from autoedit.core.fsutil import link_or_copy
+from autoedit.core.probe import ProbeStore
+from autoedit.core.proxy import PROXY_HEIGHT, generate_proxies
+from autoedit.core.tools import run_tool
+from autoedit.schemas.media import MediaInfo
 
-LAYOUT_DIRS = ["raw", "audio", "proxies", "outputs", "artifacts", "logs"]
-
-
-def _run(cmd: List[str]) -> int:
-    try:
-        return subprocess.call(cmd)
-    except FileNotFoundError:
-        return 127
 
+LAYOUT_DIRS = ["raw", "audio", "proxies", "outputs", "artifacts", "logs"]
 
-def _ffprobe_duration(path: Path) -> float | None:
-    try:
-        import json as _json
-
-        result = subprocess.run(
-            [
-                "ffprobe",
-                "-v",
-                "error",
-                "-select_streams",
-                "v:0",
-                "-show_entries",
-                "format=duration",
-                "-of",
-                "json",
-                str(path),
-            ],
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-        data = _json.loads(result.stdout or "{}")
-        dur = data.get("format", {}).get("duration")
-        return float(dur) if dur is not None else None
-    except Exception:
-        return None
+# Streaming ingest reads sources in large chunks; the queue bounds memory held for ffmpeg.
+STREAM_CHUNK_SIZE = 8 * 1024 * 1024
+STREAM_QUEUE_DEPTH = 8
 
 
 def init_run_dir(run_dir: Path) -> Dict[str, str]:
@@ -57,51 +41,279 @@ def init_run_dir(run_dir: Path) -> Dict[str, str]:
     return created
 
 
-def ingest_media(inputs: List[Path], run_dir: Path) -> Dict[str, str]:
-    """Copy inputs to raw/, extract audio to audio/main.flac (first input)."""
+def _audio_cmd(src: str, audio_out: Path) -> List[str]:
+    return [
+        "ffmpeg",
+        "-y",
+        "-i",
+        src,
+        "-ac",
+        "1",
+        "-ar",
+        "16000",
+        "-vn",
+        "-c:a",
+        "flac",
+        str(audio_out),
+    ]
+
+
+def _extract_audio(src: Path, audio_out: Path) -> bool:
+    # Unlink first: the previous output may be a hardlink into the ingest cache.
+    audio_out.unlink(missing_ok=True)
+    return run_tool(_audio_cmd(str(src), audio_out), quiet=False) == 0
+
+
+def _feed(proc: subprocess.Popen, chunks: "queue.Queue[Optional[bytes]]") -> None:
+    """Write queued chunks to ffmpeg's stdin; keep draining if ffmpeg stops reading."""
+    assert proc.stdin is not None
+    broken = False
+    while True:
+        chunk = chunks.get()
+        if chunk is None:
+            break
+        if broken:
+            continue
+        try:
+            proc.stdin.write(chunk)
+        except (BrokenPipeError, OSError):
+            broken = True
+    with suppress(BrokenPipeError, OSError):
+        proc.stdin.close()
+
+
+def _stream_copy(
+    src: Path, dest: Path, audio_out: Optional[Path], chunk_size: int = STREAM_CHUNK_SIZE
+) -> Tuple[str, bool]:
+    """Copy ``src`` to ``dest`` in one read pass, teeing the bytes into a hash and ffmpeg.
+
+    Each chunk is hashed, written to ``dest`` and queued for a feeder thread that pipes it
+    into ffmpeg's stdin, so the copy and the audio extraction run concurrently from a
+    single read of the source. Returns ``(sha256, audio_ok)``; ``audio_ok`` is False when
+    ffmpeg is missing or could not decode from a pipe (e.g. MP4 with a trailing moov atom).
+    """
+    proc: Optional[subprocess.Popen] = None
+    if audio_out is not None:
+        audio_out.unlink(missing_ok=True)
+        try:
+            proc = subprocess.Popen(
+                _audio_cmd("pipe:0", audio_out),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        except FileNotFoundError:
+            proc = None
+
+    chunks: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=STREAM_QUEUE_DEPTH)
+    feeder = None
+    if proc is not None:
+        feeder = threading.Thread(target=_feed, args=(proc, chunks), daemon=True)
+        feeder.start()
+
+    digest = hashlib.sha256()
+    dest.unlink(missing_ok=True)
+    try:
+        with src.open("rb", buffering=0) as reader, dest.open("wb") as writer:
+            for chunk in iter(lambda: reader.read(chunk_size), b""):
+                digest.update(chunk)
+                writer.write(chunk)
+                if feeder is not None:
+                    chunks.put(chunk)
+    finally:
+        if feeder is not None:
+            chunks.put(None)
+            feeder.join()
+    shutil.copystat(src, dest)
+
+    audio_ok = False
+    if proc is not None:
+        audio_ok = proc.wait() == 0 and audio_out is not None and audio_out.exists()
+    return digest.hexdigest(), audio_ok
+
+
+@dataclass
+class _IngestedMedia:
+    path: Path
+    audio: Optional[Path] = None
+    duration: float | None = None
+    digest: Optional[str] = None
+
+
+def _unique_name(name: str, used: set) -> str:
+    """``name``, or ``<stem>-N<suffix>`` with the first N not in ``used``; marks it used."""
+    stem, suffix = Path(name).stem, Path(name).suffix
+    candidate, n = name, 1
+    while candidate in used:
+        candidate = f"{stem}-{n}{suffix}"
+        n += 1
+    used.add(candidate)
+    return candidate
+
+
+def _raw_dests(inputs: List[Path], raw_dir: Path) -> List[Path]:
+    """Return a unique raw/ path per input; inputs already in raw/ keep their name.
+
+    Equal basenames from different folders would otherwise overwrite each other.
+    """
+    raw = raw_dir.resolve()
+    in_place = [path.resolve().parent == raw for path in inputs]
+    used = {path.name for path, here in zip(inputs, in_place) if here}
+    return [
+        raw_dir / (path.name if here else _unique_name(path.name, used))
+        for path, here in zip(inputs, in_place)
+    ]
+
+
+def _audio_names(dests: List[Path]) -> List[str]:
+    """Return a unique ``<stem>.flac`` name per input (``main`` is reserved)."""
+    used = {"main.flac"}
+    return [_unique_name(f"{dest.stem}.flac", used) for dest in dests]
+
+
+def _cached_probe(entry: IngestEntry, dest: Path) -> Optional[MediaInfo]:
+    if not entry.probe:
+        return None
+    try:
+        info = MediaInfo.model_validate(entry.probe)
+    except ValidationError:
+        return None
+    st = dest.stat()
+    return info.model_copy(
+        update={"path": str(dest), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    )
+
+
+def _ingest_one(
+    path: Path,
+    dest: Path,
+    audio_out: Path,
+    cache: Optional[IngestCache],
+    probes: ProbeStore,
+    stream: bool = False,
+) -> _IngestedMedia:
+    """Copy (or link), extract audio and probe a single input."""
+    entry: Optional[IngestEntry] = None
+    if cache:
+        # Streaming hashes during the copy, so only trust the stat index up front.
+        digest = cache.known_digest(path) if stream else cache.digest(path)
+        entry = cache.lookup(digest) if digest else None
+
+    audio_done = False
+    if path.resolve() != dest.resolve():
+        if entry and entry.media:
+            link_or_copy(entry.media, dest)
+        elif stream:
+            tee_audio = None if entry and entry.audio else audio_out
+            digest, audio_done = _stream_copy(path, dest, tee_audio)
+            if cache and entry is None:
+                cache.remember(path, digest)
+                entry = cache.lookup(digest)
+        else:
+            dest.unlink(missing_ok=True)
+            shutil.copy2(path, dest)
+    if cache and entry:
+        if not entry.media:
+            cache.put_media(entry.digest, dest)
+        # Scene detection keys its cache on the raw/ copy: record its digest while known.
+        cache.remember(dest, entry.digest)
+
+    result = _IngestedMedia(path=dest, digest=entry.digest if entry else None)
+
+    if audio_done:
+        if cache and entry:
+            cache.put_audio(entry.digest, audio_out)
+    elif entry and entry.audio:
+        link_or_copy(entry.audio, audio_out)
+    elif _extract_audio(dest, audio_out):
+        if cache and entry and audio_out.exists():
+            cache.put_audio(entry.digest, audio_out)
+    else:
+        print(f"[yellow]ffmpeg not found or failed; skipping audio extraction for {dest}.[/yellow]")
+    if audio_out.exists():
+        result.audio = audio_out
+
+    info = _cached_probe(entry, dest) if entry else None
+    if info is not None:
+        probes.put(info)
+    else:
+        info = probes.get(dest)
+        if cache and entry and info is not None:
+            cache.put_probe(entry.digest, info.model_dump(mode="json"))
+    result.duration = info.duration if info else None
+    return result
+
+
+def ingest_media(
+    inputs: List[Path],
+    run_dir: Path,
+    cache_dir: Optional[Path] = None,
+    workers: Optional[int] = None,
+    proxies: bool = False,
+    proxy_height: int = PROXY_HEIGHT,
+    stream: bool = False,
+) -> Dict[str, str]:
+    """Copy inputs to raw/ and extract audio/<stem>.flac for every input.
+
+    Inputs sharing a basename are stored as ``<stem>-1<ext>``, ``<stem>-2<ext>``... in
+    raw/, in input order.
+
+    Inputs are ingested concurrently in a bounded thread pool (copies and ffmpeg/ffprobe
+    run outside the GIL); ``workers`` defaults to the CPU count. The first input's audio
+    is also linked to audio/main.flac for the transcription stage.
+
+    With ``cache_dir``, inputs are hashed and looked up in a content-addressed
+    :class:`IngestCache`; known media is linked into raw/ and its cached audio and
+    probe data are reused instead of copying and transcoding again.
+
+    With ``stream``, each source is read exactly once: the bytes are hashed, written to
+    raw/ and piped into ffmpeg concurrently. If ffmpeg cannot decode from a pipe, audio
+    is extracted from the local raw/ copy instead of re-reading the source.
+
+    With ``proxies``, low-resolution all-intra proxies are written to proxies/ so scene
+    detection and frame analysis can avoid decoding the originals.
+    """
     created = init_run_dir(run_dir)
 
     raw_dir = run_dir / "raw"
     audio_dir = run_dir / "audio"
     artifacts_dir = run_dir / "artifacts"
+    cache = IngestCache.shared(cache_dir) if cache_dir else None
 
-    copied = []
-    for path in inputs:
-        dest = raw_dir / path.name
-        if path.resolve() != dest.resolve():
-            shutil.copy2(path, dest)
-        else:
-            # already in place
-            pass
-        copied.append(dest)
-
-    # Extract audio from the first input
-    if copied:
-        src = copied[0]
-        audio_out = audio_dir / "main.flac"
-        cmd = [
-            "ffmpeg",
-            "-y",
-            "-i",
-            str(src),
-            "-ac",
-            "1",
-            "-ar",
-            "16000",
-            "-vn",
-            "-c:a",
-            "flac",
-            str(audio_out),
-        ]
-        code = _run(cmd)
-        if code != 0:
-            print("[yellow]ffmpeg not found or failed; skipping audio extraction.[/yellow]")
+    dests = _raw_dests(inputs, raw_dir)
+    audio_outs = [audio_dir / name for name in _audio_names(dests)]
+    probes = ProbeStore.for_run(run_dir)
+    max_workers = max(1, min(workers or os.cpu_count() or 1, len(inputs) or 1))
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        results = list(
+            pool.map(
+                lambda path, dest, audio_out: _ingest_one(
+                    path, dest, audio_out, cache=cache, probes=probes, stream=stream
+                ),
+                inputs,
+                dests,
+                audio_outs,
+            )
+        )
+
+    if results and results[0].audio:
+        main_audio = audio_dir / "main.flac"
+        link_or_copy(results[0].audio, main_audio, modes=("hardlink", "copy"))
 
     # Write minimal media db
-    media_db = {
-        "inputs": [str(p) for p in copied],
-        "durations": {str(p): _ffprobe_duration(p) for p in copied},
+    media_db: Dict[str, object] = {
+        "inputs": [str(r.path) for r in results],
+        "durations": {str(r.path): r.duration for r in results},
+        "audio": {str(r.path): str(r.audio) if r.audio else None for r in results},
+        # The input audio/main.flac (and so the transcript and vad.json) was taken from.
+        "main": str(results[0].path) if results and results[0].audio else None,
     }
+    if proxies:
+        media_db["proxies"] = generate_proxies(
+            [r.path for r in results], run_dir / "proxies", height=proxy_height, workers=workers
+        )
+    if cache:
+        media_db["hashes"] = {str(r.path): r.digest for r in results}
     (artifacts_dir / "media.db.json").write_text(json.dumps(media_db, indent=2))
 
     return created
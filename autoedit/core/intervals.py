@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from itertools import accumulate
+from typing import TYPE_CHECKING, Iterable, List, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import numpy as np
+
+
+class IntervalIndex:
+    """Static index over a set of ``(start, end)`` intervals.
+
+    Intervals are merged into disjoint, sorted runs once (O(m log m)); overlap and
+    coverage queries are then binary searches (O(log m)), so checking n shots against m
+    transcript segments costs O((n + m) log m) instead of O(n * m). Empty intervals are
+    ignored, and overlaps are strict (touching intervals do not overlap), matching
+    ``max(a.start, b.start) < min(a.end, b.end)``.
+    """
+
+    def __init__(self, intervals: Iterable[Tuple[float, float]]) -> None:
+        starts: List[float] = []
+        ends: List[float] = []
+        for start, end in sorted((s, e) for s, e in intervals if e > s):
+            if ends and start <= ends[-1]:
+                ends[-1] = max(ends[-1], end)
+            else:
+                starts.append(start)
+                ends.append(end)
+        self.starts = starts
+        self.ends = ends
+        # covered[i] = total length of the first i runs
+        self._covered = [0.0, *accumulate(e - s for s, e in zip(starts, ends))]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @property
+    def total(self) -> float:
+        return self._covered[-1]
+
+    def overlaps(self, start: float, end: float) -> bool:
+        """True if ``[start, end)`` shares a non-empty stretch with any indexed interval."""
+        if end <= start:
+            return False
+        idx = bisect_right(self.ends, start)
+        return idx < len(self.starts) and self.starts[idx] < end
+
+    def overlaps_many(self, starts: "np.ndarray", ends: "np.ndarray") -> "np.ndarray":
+        """Vectorised :meth:`overlaps` for arrays of query intervals (requires numpy)."""
+        import numpy as np
+
+        if not self.starts:
+            return np.zeros(len(starts), dtype=bool)
+        run_starts = np.asarray(self.starts)
+        idx = np.searchsorted(np.asarray(self.ends), starts, side="right")
+        inside = idx < len(run_starts)
+        nxt = run_starts[np.minimum(idx, len(run_starts) - 1)]
+        return inside & (nxt < ends) & (ends > starts)
+
+    def _covered_before(self, t: float) -> float:
+        idx = bisect_right(self.starts, t)
+        if idx == 0:
+            return 0.0
+        return self._covered[idx - 1] + min(t, self.ends[idx - 1]) - self.starts[idx - 1]
+
+    def coverage_many(self, starts: "np.ndarray", ends: "np.ndarray") -> "np.ndarray":
+        """Vectorised :meth:`coverage` for arrays of query intervals (requires numpy)."""
+        import numpy as np
+
+        if not self.starts:
+            return np.zeros(len(starts), dtype=np.float64)
+        run_starts = np.asarray(self.starts)
+        run_ends = np.asarray(self.ends)
+        covered = np.asarray(self._covered)
+
+        def before(t: "np.ndarray") -> "np.ndarray":
+            idx = np.searchsorted(run_starts, t, side="right") - 1
+            last = np.maximum(idx, 0)
+            partial = covered[last] + np.minimum(t, run_ends[last]) - run_starts[last]
+            return np.where(idx >= 0, partial, 0.0)
+
+        return np.where(ends > starts, before(ends) - before(starts), 0.0)
+
+    def coverage(self, start: float, end: float) -> float:
+        """Length of ``[start, end)`` covered by the indexed intervals."""
+        if end <= start:
+            return 0.0
+        return self._covered_before(end) - self._covered_before(start)
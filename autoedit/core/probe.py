@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import json
+import subprocess
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+from pydantic import ValidationError
+
+from autoedit.core.fsutil import atomic_write_text
+from autoedit.schemas.media import MediaInfo, StreamInfo
+
+PROBE_DB_NAME = "probe.db.json"
+
+
+def _run_ffprobe(path: Path, keyframes: bool = True) -> Optional[dict]:
+    """Run ffprobe once for format, streams and (optionally) packet keyframe flags."""
+    entries = "format:stream"
+    if keyframes:
+        entries += ":packet=stream_index,pts_time,flags"
+    try:
+        result = subprocess.run(
+            [
+                "ffprobe",
+                "-v",
+                "error",
+                "-show_entries",
+                entries,
+                "-of",
+                "json=compact=1",
+                str(path),
+            ],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+    except FileNotFoundError:
+        return None
+    if result.returncode != 0:
+        return None
+    try:
+        return json.loads(result.stdout or "{}")
+    except ValueError:
+        return None
+
+
+def _to_float(value: object) -> Optional[float]:
+    try:
+        return float(value)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_int(value: object) -> Optional[int]:
+    try:
+        return int(value)  # type: ignore[call-overload]
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_rate(value: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    if not value or "/" not in value:
+        return None, None
+    num, den = (_to_int(part) for part in value.split("/", 1))
+    if not num or not den:
+        return None, None
+    return num, den
+
+
+def _parse_stream(raw: dict) -> StreamInfo:
+    stream = StreamInfo(
+        index=int(raw.get("index", 0)),
+        codec_type=str(raw.get("codec_type", "unknown")),
+        codec_name=raw.get("codec_name"),
+        duration=_to_float(raw.get("duration")),
+    )
+    if stream.codec_type == "video":
+        stream.width = _to_int(raw.get("width"))
+        stream.height = _to_int(raw.get("height"))
+        num, den = _parse_rate(raw.get("avg_frame_rate"))
+        if num is None:
+            num, den = _parse_rate(raw.get("r_frame_rate"))
+        stream.fps_num, stream.fps_den = num, den
+    elif stream.codec_type == "audio":
+        stream.sample_rate = _to_int(raw.get("sample_rate"))
+        stream.channels = _to_int(raw.get("channels"))
+        stream.channel_layout = raw.get("channel_layout")
+    return stream
+
+
+def parse_probe(path: Path, data: dict) -> MediaInfo:
+    """Build a :class:`MediaInfo` from raw ffprobe JSON output."""
+    st = path.stat()
+    fmt = data.get("format") or {}
+    streams = [_parse_stream(s) for s in data.get("streams") or []]
+    video = next((s for s in streams if s.codec_type == "video"), None)
+    keyframes = []
+    if video is not None:
+        for packet in data.get("packets") or []:
+            if _to_int(packet.get("stream_index")) != video.index:
+                continue
+            if "K" not in str(packet.get("flags", "")):
+                continue
+            pts = _to_float(packet.get("pts_time"))
+            if pts is not None:
+                keyframes.append(pts)
+        keyframes.sort()
+    return MediaInfo(
+        path=str(path),
+        size=st.st_size,
+        mtime_ns=st.st_mtime_ns,
+        duration=_to_float(fmt.get("duration")),
+        format_name=fmt.get("format_name"),
+        streams=streams,
+        keyframes=keyframes,
+    )
+
+
+def probe_media(path: Path, keyframes: bool = True) -> Optional[MediaInfo]:
+    """Probe ``path`` with a single ffprobe call; returns None if ffprobe is unavailable."""
+    data = _run_ffprobe(path, keyframes=keyframes)
+    if data is None:
+        return None
+    return parse_probe(path, data)
+
+
+class ProbeStore:
+    """Persistent probe database keyed on resolved path, validated by size and mtime.
+
+    Entries live in ``artifacts/probe.db.json`` so every stage of a run shares one
+    ffprobe pass per file. ``db_path=None`` keeps the store in memory only.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None) -> None:
+        self.db_path = db_path
+        self._entries: Dict[str, MediaInfo] = {}
+        self._lock = Lock()
+        if db_path and db_path.exists():
+            try:
+                raw = json.loads(db_path.read_text())
+            except ValueError:
+                raw = {}
+            for key, value in raw.items():
+                try:
+                    self._entries[key] = MediaInfo.model_validate(value)
+                except ValidationError:
+                    continue
+
+    @classmethod
+    def for_run(cls, run_dir: Path) -> "ProbeStore":
+        artifacts_dir = run_dir / "artifacts"
+        return cls(artifacts_dir / PROBE_DB_NAME if artifacts_dir.is_dir() else None)
+
+    @staticmethod
+    def _key(path: Path) -> str:
+        return str(path.resolve())
+
+    def lookup(self, path: Path) -> Optional[MediaInfo]:
+        """Return the stored entry if the file's size and mtime are unchanged."""
+        with self._lock:
+            info = self._entries.get(self._key(path))
+        if info is None:
+            return None
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        if st.st_size != info.size or st.st_mtime_ns != info.mtime_ns:
+            return None
+        return info
+
+    def put(self, info: MediaInfo) -> None:
+        with self._lock:
+            self._entries[self._key(Path(info.path))] = info
+            if self.db_path:
+                payload = {k: v.model_dump(mode="json") for k, v in self._entries.items()}
+                atomic_write_text(self.db_path, json.dumps(payload))
+
+    def get(self, path: Path, keyframes: bool = True) -> Optional[MediaInfo]:
+        """Return probe data for ``path``, running ffprobe only on a miss."""
+        info = self.lookup(path)
+        if info is not None and not (keyframes and info.video and not info.keyframes):
+            return info
+        info = probe_media(path, keyframes=keyframes)
+        if info is not None:
+            self.put(info)
+        return info
+
+    def duration(self, path: Path) -> Optional[float]:
+        info = self.get(path)
+        return info.duration if info else None
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from autoedit.core.fsutil import built_from, file_stamp, forget_source, record_source
+from autoedit.core.tools import run_tool
+
+PROXY_HEIGHT = 360
+
+
+def proxy_path(source: Path, proxies_dir: Path) -> Path:
+    """Proxy location for ``source``; the full name is kept so clip.mov and clip.mp4 differ."""
+    return proxies_dir / f"{source.name}.mp4"
+
+
+def find_proxy(source: Path, proxies_dir: Path) -> Optional[Path]:
+    """Return an up-to-date proxy for ``source``, or None.
+
+    A proxy is current when the size, mtime and inode recorded next to it still match
+    ``source``, so re-ingesting a different clip under the same name rebuilds it.
+    """
+    proxy = proxy_path(source, proxies_dir)
+    if built_from(proxy, source) and proxy.stat().st_size > 0:
+        return proxy
+    return None
+
+
+def _proxy_cmd(source: Path, dest: Path, height: int, threads: int) -> List[str]:
+    # All-intra (-g 1) H.264 with source timestamps passed through: every frame decodes
+    # independently and frame N of the proxy is frame N of the source, so timecodes map 1:1.
+    return [
+        "ffmpeg",
+        "-y",
+        "-i",
+        str(source),
+        "-map",
+        "0:v:0",
+        "-vf",
+        f"scale=-2:{height}",
+        "-c:v",
+        "libx264",
+        "-preset",
+        "ultrafast",
+        "-tune",
+        "fastdecode",
+        "-g",
+        "1",
+        "-crf",
+        "28",
+        "-pix_fmt",
+        "yuv420p",
+        "-vsync",
+        "passthrough",
+        "-threads",
+        str(threads),
+        "-an",
+        str(dest),
+    ]
+
+
+def _generate_one(source: Path, proxies_dir: Path, height: int, threads: int) -> Optional[Path]:
+    existing = find_proxy(source, proxies_dir)
+    if existing:
+        return existing
+    dest = proxy_path(source, proxies_dir)
+    stamp = file_stamp(source)
+    forget_source(dest)
+    tmp = dest.with_name(f".{dest.name}.tmp.mp4")
+    if run_tool(_proxy_cmd(source, tmp, height, threads)) != 0 or not tmp.exists():
+        tmp.unlink(missing_ok=True)
+        return None
+    os.replace(tmp, dest)
+    record_source(dest, stamp)
+    return dest
+
+
+def generate_proxies(
+    sources: List[Path],
+    proxies_dir: Path,
+    height: int = PROXY_HEIGHT,
+    workers: Optional[int] = None,
+) -> Dict[str, Optional[str]]:
+    """Generate low-resolution all-intra proxies for ``sources`` in parallel.
+
+    Returns a mapping of source path to proxy path (None where ffmpeg failed). Proxies
+    built from the source as it is now (see :func:`find_proxy`) are reused.
+    """
+    proxies_dir.mkdir(parents=True, exist_ok=True)
+    if not sources:
+        return {}
+    cpus = os.cpu_count() or 1
+    max_workers = max(1, min(workers or cpus, len(sources)))
+    # Split encoder threads between concurrent jobs instead of oversubscribing the CPU.
+    threads = max(1, cpus // max_workers)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        proxies = list(
+            pool.map(lambda src: _generate_one(src, proxies_dir, height, threads), sources)
+        )
+    return {str(src): str(proxy) if proxy else None for src, proxy in zip(sources, proxies)}
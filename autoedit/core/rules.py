@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Union
+
+from autoedit.core.intervals import IntervalIndex
+
+
+class Shot(NamedTuple):
+    start: float
+    end: float
+    source: str
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+@dataclass
+class RuleContext:
+    """Data shared by every stage; ``speech`` is None when the run has no transcript.
+
+    Speech is timed against one input's audio: with ``speech_media`` set (a raw/ file
+    name), only shots of that source are matched against it.
+    """
+
+    speech: Optional[IntervalIndex] = None
+    speech_media: Optional[str] = None
+
+    def speech_for(self, shot: Shot) -> Optional[IntervalIndex]:
+        """Speech intervals that apply to ``shot``; None if it has none."""
+        if self.speech_media is not None and Path(shot.source).name != self.speech_media:
+            return None
+        return self.speech
+
+
+# A stage consumes a shot stream lazily and yields the shots it keeps (possibly changed).
+Stage = Callable[[Iterator[Shot]], Iterator[Shot]]
+
+RULES: Dict[str, Callable[..., Stage]] = {}
+
+
+def rule(name: str):
+    """Register a stage factory ``factory(ctx, **params) -> Stage`` under ``name``."""
+
+    def register(factory: Callable[..., Stage]) -> Callable[..., Stage]:
+        RULES[name] = factory
+        return factory
+
+    return register
+
+
+@rule("speech_only")
+def speech_only(ctx: RuleContext) -> Stage:
+    """Keep shots that overlap any transcript segment (no-op without a transcript)."""
+
+    def stage(shots: Iterator[Shot]) -> Iterator[Shot]:
+        for s in shots:
+            speech = ctx.speech_for(s)
+            if speech is None or speech.overlaps(s.start, s.end):
+                yield s
+
+    return stage
+
+
+@rule("min_len")
+def min_len(ctx: RuleContext, seconds: float) -> Stage:
+    """Drop shots shorter than ``seconds``."""
+
+    def stage(shots: Iterator[Shot]) -> Iterator[Shot]:
+        yield from (s for s in shots if s.duration >= seconds)
+
+    return stage
+
+
+@rule("max_len")
+def max_len(ctx: RuleContext, seconds: float) -> Stage:
+    """Trim shots longer than ``seconds`` to their first ``seconds``."""
+
+    def stage(shots: Iterator[Shot]) -> Iterator[Shot]:
+        for s in shots:
+            yield s._replace(end=s.start + seconds) if s.duration > seconds else s
+
+    return stage
+
+
+@rule("min_speech_ratio")
+def min_speech_ratio(ctx: RuleContext, ratio: float) -> Stage:
+    """Drop shots whose fraction covered by speech is below ``ratio`` (no-op without speech)."""
+
+    def stage(shots: Iterator[Shot]) -> Iterator[Shot]:
+        for s in shots:
+            speech = ctx.speech_for(s)
+            if speech is None:
+                yield s
+            elif s.duration > 0 and speech.coverage(s.start, s.end) / s.duration >= ratio:
+                yield s
+
+    return stage
+
+
+@rule("merge_adjacent")
+def merge_adjacent(ctx: RuleContext, gap: float = 0.0) -> Stage:
+    """Merge consecutive shots of the same source separated by at most ``gap`` seconds."""
+
+    def stage(shots: Iterator[Shot]) -> Iterator[Shot]:
+        pending: Optional[Shot] = None
+        for s in shots:
+            if pending and s.source == pending.source and 0 <= s.start - pending.end <= gap:
+                pending = pending._replace(end=max(pending.end, s.end))
+                continue
+            if pending:
+                yield pending
+            pending = s
+        if pending:
+            yield pending
+
+    return stage
+
+
+@rule("cap_total")
+def cap_total(ctx: RuleContext, seconds: float) -> Stage:
+    """Stop once ``seconds`` of footage are selected, trimming the last shot to fit."""
+
+    def stage(shots: Iterator[Shot]) -> Iterator[Shot]:
+        remaining = seconds
+        for s in shots:
+            if remaining <= 0:
+                return
+            if s.duration > remaining:
+                s = s._replace(end=s.start + remaining)
+            remaining -= s.duration
+            yield s
+
+    return stage
+
+
+@rule("cap_speech")
+def cap_speech(ctx: RuleContext, seconds: float) -> Stage:
+    """Stop once the selected shots contain ``seconds`` of speech ("first N minutes of speech")."""
+
+    def stage(shots: Iterator[Shot]) -> Iterator[Shot]:
+        heard = 0.0
+        for s in shots:
+            if heard >= seconds:
+                return
+            speech = ctx.speech_for(s)
+            heard += speech.coverage(s.start, s.end) if speech else 0.0
+            yield s
+
+    return stage
+
+
+@rule("limit")
+def limit(ctx: RuleContext, count: int) -> Stage:
+    """Stop after ``count`` shots."""
+
+    count = int(count)
+
+    def stage(shots: Iterator[Shot]) -> Iterator[Shot]:
+        if count <= 0:
+            return
+        for n, s in enumerate(shots, start=1):
+            yield s
+            if n >= count:
+                return
+
+    return stage
+
+
+RuleSpec = Union[str, Dict[str, Any]]
+
+
+def _coerce(value: str) -> Any:
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            pass
+    return value
+
+
+def parse_rule(spec: RuleSpec) -> Dict[str, Any]:
+    """Normalise ``"name"``, ``"name:key=value,..."`` or ``{"rule": name, ...}`` to a dict."""
+    if isinstance(spec, dict):
+        if "rule" not in spec:
+            raise ValueError(f"Rule entry needs a 'rule' key: {spec!r}")
+        return dict(spec)
+    name, _, args = str(spec).partition(":")
+    parsed: Dict[str, Any] = {"rule": name.strip()}
+    for item in filter(None, (a.strip() for a in args.split(","))):
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"Expected key=value in rule {spec!r}, got {item!r}")
+        parsed[key.strip()] = _coerce(value.strip())
+    return parsed
+
+
+def build_pipeline(specs: Iterable[RuleSpec], ctx: RuleContext) -> List[Stage]:
+    """Instantiate stages from rule specs, validating names and parameters up front."""
+    stages = []
+    for spec in specs:
+        params = parse_rule(spec)
+        name = params.pop("rule")
+        factory = RULES.get(name)
+        if factory is None:
+            raise ValueError(f"Unknown selection rule '{name}'. Choose from: {', '.join(RULES)}")
+        try:
+            stages.append(factory(ctx, **params))
+        except TypeError as exc:
+            raise ValueError(f"Bad parameters for rule '{name}': {exc}") from exc
+    return stages
+
+
+def run_pipeline(shots: Iterable[Shot], stages: Iterable[Stage]) -> Iterator[Shot]:
+    """Chain ``stages`` lazily over ``shots``.
+
+    Nothing is evaluated until the result is iterated, and a stage that stops early
+    (e.g. ``cap_total``) stops pulling from every stage upstream of it.
+    """
+    stream: Iterator[Shot] = iter(shots)
+    for stage in stages:
+        stream = stage(stream)
+    return stream
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+from autoedit.core.cache import ContentCache
+from autoedit.core.fsutil import atomic_write_text
+
+SCENES_DB_NAME = "scenes.db.json"
+
+
+@dataclass
+class SceneResult:
+    """Cut times detected in one media file, plus the detector's own end time if known."""
+
+    cuts: List[float]
+    end: Optional[float] = None
+
+
+class SceneIndex:
+    """Per-run cache of scene-detection results in ``artifacts/scenes.db.json``.
+
+    Entries are keyed on the resolved media path and are only reused while the file's
+    size and mtime and the detector parameters are unchanged, so adding a clip to
+    raw/ only analyses that clip. ``db_path=None`` disables persistence.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None) -> None:
+        self.db_path = db_path
+        self._entries: Dict[str, dict] = {}
+        self._lock = Lock()
+        if db_path and db_path.exists():
+            try:
+                self._entries = json.loads(db_path.read_text())
+            except ValueError:
+                self._entries = {}
+
+    @classmethod
+    def for_run(cls, run_dir: Path) -> "SceneIndex":
+        artifacts_dir = run_dir / "artifacts"
+        return cls(artifacts_dir / SCENES_DB_NAME if artifacts_dir.is_dir() else None)
+
+    @staticmethod
+    def _stamp(path: Path, params: Dict[str, Any]) -> Dict[str, Any]:
+        st = path.stat()
+        return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "params": params}
+
+    def lookup(self, path: Path, params: Dict[str, Any]) -> Optional[SceneResult]:
+        with self._lock:
+            entry = self._entries.get(str(path.resolve()))
+        if not entry:
+            return None
+        try:
+            stamp = self._stamp(path, params)
+        except FileNotFoundError:
+            return None
+        if any(entry.get(k) != v for k, v in stamp.items()):
+            return None
+        return SceneResult(cuts=list(entry.get("cuts", [])), end=entry.get("end"))
+
+    def put(self, path: Path, params: Dict[str, Any], result: SceneResult) -> None:
+        entry = {**self._stamp(path, params), **asdict(result)}
+        with self._lock:
+            self._entries[str(path.resolve())] = entry
+            if self.db_path:
+                atomic_write_text(self.db_path, json.dumps(self._entries, indent=2))
+
+
+class SceneCache(ContentCache):
+    """Persistent, cross-run scene-detection cache keyed on media content.
+
+    Results are stored per file digest and detector parameters under ``root/scenes``.
+    """
+
+    directory = "scenes"
+    kind = "scenes"
+
+    def lookup(self, path: Path, params: Dict[str, Any]) -> Optional[SceneResult]:
+        data = self._get(path, (params,))
+        if data is None:
+            return None
+        return SceneResult(cuts=list(data.get("cuts", [])), end=data.get("end"))
+
+    def put(self, path: Path, params: Dict[str, Any], result: SceneResult) -> None:
+        self._put(path, (params,), asdict(result))
@@ -1,67 +1,408 @@
 from __future__ import annotations
 
+import os
+from bisect import bisect_left, bisect_right
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
+from autoedit.core.probe import ProbeStore
+from autoedit.core.proxy import find_proxy
+from autoedit.core.scene_cache import SceneCache, SceneIndex, SceneResult
+from autoedit.schemas.media import MediaInfo
 from autoedit.schemas.sequences import Segment
 
+# "content": PySceneDetect ContentDetector; "numpy": built-in ffmpeg pipe + NumPy differ;
+# "ffmpeg": ffmpeg's scene filter; "keyframes": container keyframes, no decoding at all.
+DETECTORS = ("content", "numpy", "ffmpeg", "keyframes")
 
-def _ffprobe_duration(path: Path) -> float | None:
-    import json
-    import subprocess
-
-    try:
-        result = subprocess.run(
-            [
-                "ffprobe",
-                "-v",
-                "error",
-                "-show_entries",
-                "format=duration",
-                "-of",
-                "json",
-                str(path),
-            ],
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-        data = json.loads(result.stdout or "{}")
-        dur = data.get("format", {}).get("duration")
-        return float(dur) if dur is not None else None
-    except Exception:
-        return None
+# Chunked detection: window length and the lead-in each window re-analyses before its range.
+CHUNK_LENGTH_S = 300.0
+CHUNK_OVERLAP_S = 2.0
 
 
-def detect_scenes(raw_dir: Path) -> List[Segment]:
-    """Detect scenes in the first media file in raw_dir.
+@dataclass(frozen=True)
+class DetectorConfig:
+    """Scene detector selection and tuning.
 
-    Uses PySceneDetect if available, else returns a single full-length segment.
+    ``threshold``/``min_scene_len`` of None use each backend's own default. ``height``
+    applies to the numpy and ffmpeg backends, ``color`` only to numpy; ``frame_skip``
+    applies to every backend that decodes frames.
     """
-    files = sorted([p for p in raw_dir.iterdir() if p.is_file()])
-    if not files:
-        return []
-    source = files[0]
 
+    name: str = "content"
+    threshold: Optional[float] = None
+    min_scene_len: Optional[float] = None
+    frame_skip: int = 0
+    height: int = 72
+    color: str = "gray"
+
+
+def _fps(info: Optional[MediaInfo]) -> float:
+    return float(info.fps) if info and info.fps else 25.0
+
+
+def _content_cuts(
+    analysed: Path,
+    info: Optional[MediaInfo],
+    config: DetectorConfig,
+    start: float = 0.0,
+    end: Optional[float] = None,
+    threads: int = 0,
+) -> Optional[Tuple[List[float], Optional[float]]]:
     try:
         from scenedetect import open_video, SceneManager
         from scenedetect.detectors import ContentDetector
     except Exception:
-        dur = _ffprobe_duration(source) or 0.0
-        return [Segment(start=0.0, end=max(dur, 0.0), source=str(source))]
+        return None
+
+    kwargs: dict = {}
+    if config.threshold is not None:
+        kwargs["threshold"] = config.threshold
+    if config.min_scene_len is not None:
+        kwargs["min_scene_len"] = max(1, int(round(config.min_scene_len * _fps(info))))
 
-    video = open_video(str(source))
+    video = open_video(str(analysed))
+    if start > 0:
+        video.seek(start)
     manager = SceneManager()
-    manager.add_detector(ContentDetector())
-    manager.detect_scenes(video)
+    manager.add_detector(ContentDetector(**kwargs))
+    detect_kwargs: dict = {}
+    if config.frame_skip:
+        detect_kwargs["frame_skip"] = config.frame_skip
+    if end is not None:
+        detect_kwargs["end_time"] = end
+    manager.detect_scenes(video, **detect_kwargs)
     scene_list = manager.get_scene_list()
+    if not scene_list:
+        return [], None
+    cuts = [scene_start.get_seconds() for scene_start, _ in scene_list[1:]]
+    return cuts, scene_list[-1][1].get_seconds()
 
-    segments: List[Segment] = []
-    for start_time, end_time in scene_list:
-        segments.append(
-            Segment(start=start_time.get_seconds(), end=end_time.get_seconds(), source=str(source))
+
+def _numpy_cuts(
+    analysed: Path,
+    info: Optional[MediaInfo],
+    config: DetectorConfig,
+    start: float = 0.0,
+    end: Optional[float] = None,
+    threads: int = 0,
+) -> Optional[Tuple[List[float], Optional[float]]]:
+    from autoedit.core.frame_diff import detect_cuts
+
+    video = info.video if info else None
+    size = (video.width, video.height) if video and video.width and video.height else None
+    try:
+        cuts = detect_cuts(
+            analysed,
+            fps=_fps(info),
+            source_size=size,
+            threshold=config.threshold,
+            height=config.height,
+            frame_skip=config.frame_skip,
+            min_scene_len=0.5 if config.min_scene_len is None else config.min_scene_len,
+            color=config.color,
+            start=start,
+            end=end,
+            threads=threads,
         )
-    if not segments:
-        dur = _ffprobe_duration(source) or 0.0
-        segments.append(Segment(start=0.0, end=max(dur, 0.0), source=str(source)))
+    except RuntimeError:
+        return None  # ffmpeg missing or the decode failed: nothing trustworthy to cache
+    return cuts, None
+
+
+def _ffmpeg_cuts(
+    analysed: Path,
+    info: Optional[MediaInfo],
+    config: DetectorConfig,
+    start: float = 0.0,
+    end: Optional[float] = None,
+    threads: int = 0,
+) -> Optional[Tuple[List[float], Optional[float]]]:
+    from autoedit.core.scene_filter import detect_scene_filter
+
+    cuts = detect_scene_filter(
+        analysed,
+        threshold=config.threshold,
+        height=config.height,
+        frame_skip=config.frame_skip,
+        min_scene_len=0.5 if config.min_scene_len is None else config.min_scene_len,
+        start=start,
+        end=end,
+        threads=threads,
+    )
+    return None if cuts is None else (cuts, None)
+
+
+def _keyframe_cuts(
+    analysed: Path,
+    info: Optional[MediaInfo],
+    config: DetectorConfig,
+    start: float = 0.0,
+    end: Optional[float] = None,
+    threads: int = 0,
+) -> Optional[Tuple[List[float], Optional[float]]]:
+    from autoedit.core.scene_filter import keyframe_cuts
+
+    # ``info`` always describes the source; an all-intra proxy would have a keyframe per frame.
+    if info is None or not info.keyframes:
+        return None
+    min_len = 0.5 if config.min_scene_len is None else config.min_scene_len
+    return keyframe_cuts(info.keyframes, min_len, start, end), None
+
+
+_BACKENDS = {
+    "content": _content_cuts,
+    "numpy": _numpy_cuts,
+    "ffmpeg": _ffmpeg_cuts,
+    "keyframes": _keyframe_cuts,
+}
+
+
+def plan_windows(
+    duration: float, keyframes: List[float], length: float, overlap: float
+) -> List[Tuple[float, float, float]]:
+    """Split ``[0, duration]`` into keyframe-aligned detection windows.
+
+    Returns ``(analyse_from, own_from, own_to)`` triples. Window boundaries snap forward to
+    the next keyframe so each window starts on a cheap seek point; each window analyses
+    ``overlap`` seconds before the range it owns so the detector has the previous frames
+    (and the last cut) in view when it reaches its own range.
+    """
+    if duration <= 0 or length <= 0 or duration <= length:
+        return [(0.0, 0.0, max(duration, 0.0))]
+    keys = sorted(keyframes)
+    bounds = [0.0]
+    nominal = length
+    while nominal < duration:
+        idx = bisect_left(keys, nominal)
+        snapped = keys[idx] if idx < len(keys) else nominal
+        if bounds[-1] < snapped < duration:
+            bounds.append(snapped)
+        nominal = max(nominal, snapped) + length
+    bounds.append(duration)
+
+    windows = []
+    for own_from, own_to in zip(bounds, bounds[1:]):
+        analyse_from = max(0.0, own_from - overlap)
+        idx = bisect_right(keys, analyse_from) - 1
+        if own_from > 0 and idx >= 0:
+            analyse_from = keys[idx]
+        windows.append((analyse_from, own_from, own_to))
+    return windows
+
+
+def merge_cuts(cuts: List[float], tolerance: float) -> List[float]:
+    """Sort cut times and collapse those closer than ``tolerance`` (seconds)."""
+    merged: List[float] = []
+    for cut in sorted(cuts):
+        if merged and cut - merged[-1] < tolerance:
+            continue
+        merged.append(cut)
+    return merged
+
+
+def _detect_window(
+    name: str,
+    analysed: Path,
+    info: Optional[MediaInfo],
+    config: DetectorConfig,
+    window: Tuple[float, float, Optional[float]],
+    threads: int,
+) -> Optional[SceneResult]:
+    """Pool task: detect cuts in one window of a file and keep those it owns.
+
+    ``window`` is ``(analyse_from, own_from, own_to)``; ``own_to=None`` means the
+    whole file. Returns None when the backend is unavailable.
+    """
+    analyse_from, own_from, own_to = window
+    detected = _BACKENDS[name](analysed, info, config, analyse_from, own_to, threads)
+    if detected is None:
+        return None
+    cuts, end = detected
+    if own_to is not None:
+        cuts = [c for c in cuts if own_from <= c < own_to]
+    return SceneResult(cuts=cuts, end=end)
+
+
+@dataclass
+class _Job:
+    source: Path
+    analysed: Path
+    info: Optional[MediaInfo]
+    windows: List[Tuple[float, float, Optional[float]]]
+
+
+def _run_jobs(
+    jobs: List[_Job], config: DetectorConfig, workers: int, per_file: int = 0
+) -> List[Optional[SceneResult]]:
+    """Run every window of every job, in a process pool when more than one is allowed.
+
+    At most ``per_file`` windows of one file run at once (0 = no limit); the pool only
+    grows as large as that cap lets the jobs use, and never beyond ``workers``.
+    """
+    limit = per_file or max(len(job.windows) for job in jobs)
+    usable = sum(min(len(job.windows), limit) for job in jobs)
+    pool_size = max(1, min(workers, usable))
+    threads = 0 if pool_size == 1 else max(1, (os.cpu_count() or 1) // pool_size)
+    partial: List[List[Optional[SceneResult]]] = [[] for _ in jobs]
+    if pool_size == 1:
+        for i, job in enumerate(jobs):
+            for w in job.windows:
+                partial[i].append(
+                    _detect_window(config.name, job.analysed, job.info, config, w, threads)
+                )
+    else:
+        queued = [list(job.windows) for job in jobs]
+        running = [0] * len(jobs)
+        with ProcessPoolExecutor(max_workers=pool_size) as pool:
+            futures: Dict[Future, int] = {}
+
+            def fill() -> None:
+                # Round-robin over files, so each one gets a share of the pool.
+                added = True
+                while added and len(futures) < pool_size:
+                    added = False
+                    for i, job in enumerate(jobs):
+                        if not queued[i] or running[i] >= limit or len(futures) >= pool_size:
+                            continue
+                        w = queued[i].pop(0)
+                        running[i] += 1
+                        future = pool.submit(
+                            _detect_window, config.name, job.analysed, job.info, config, w, threads
+                        )
+                        futures[future] = i
+                        added = True
+
+            fill()
+            while futures:
+                finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    i = futures.pop(future)
+                    running[i] -= 1
+                    partial[i].append(future.result())
+                fill()
+
+    results: List[Optional[SceneResult]] = []
+    for job, parts in zip(jobs, partial):
+        done = [p for p in parts if p is not None]
+        if len(done) != len(parts):
+            results.append(None)
+            continue
+        cuts = merge_cuts([c for p in done for c in p.cuts], tolerance=1.0 / _fps(job.info))
+        ends = [p.end for p in done if p.end is not None]
+        results.append(SceneResult(cuts=cuts, end=max(ends) if ends else None))
+    return results
+
+
+def _media_files(raw_dir: Path) -> List[Path]:
+    return sorted(p for p in raw_dir.iterdir() if p.is_file() and not p.name.startswith("."))
+
+
+def segments_from_cuts(cuts: List[float], duration: float, source: str) -> List[Segment]:
+    """Turn cut times into contiguous segments covering ``[0, duration]``."""
+    duration = max(duration, 0.0)
+    bounds = [0.0] + sorted({c for c in cuts if 0.0 < c < duration}) + [duration]
+    segments = [Segment(start=a, end=b, source=source) for a, b in zip(bounds, bounds[1:]) if b > a]
+    return segments or [Segment(start=0.0, end=duration, source=source)]
+
+
+def detect_scenes(
+    raw_dir: Path,
+    probes: Optional[ProbeStore] = None,
+    use_proxies: bool = True,
+    config: Optional[DetectorConfig] = None,
+    chunk_workers: int = 1,
+    chunk_length: float = CHUNK_LENGTH_S,
+    chunk_overlap: float = CHUNK_OVERLAP_S,
+    workers: Optional[int] = None,
+    index: Optional[SceneIndex] = None,
+    cache: Optional[SceneCache] = None,
+) -> List[Segment]:
+    """Detect scenes in every media file in raw_dir.
+
+    Files are analysed concurrently in a process pool of up to ``workers`` processes
+    (default: CPU count) and their segments are concatenated in file-name order, each
+    with its own ``source``. Results are cached per file in ``artifacts/scenes.db.json``
+    (see :class:`SceneIndex`), so re-running after adding a clip only analyses that clip.
+    An optional :class:`SceneCache` adds a persistent cross-run layer keyed on content
+    hash and detector parameters.
+
+    The backend is chosen by ``config.name`` (see :data:`DETECTORS`). The default
+    PySceneDetect backend returns a single full-length segment when the library is not
+    installed. ``ffmpeg`` and ``keyframes`` are fast rough-cut modes: the first runs
+    ffmpeg's scene filter, the second reads keyframe times from the probe without decoding.
+    Durations come from the run's probe database (``artifacts/probe.db.json``).
+
+    With ``use_proxies``, frames are analysed from an up-to-date proxy in the sibling
+    proxies/ directory; proxies share the source timeline, so ``Segment.source`` still
+    names the original file.
+
+    With ``chunk_workers > 1``, files longer than ``chunk_length`` seconds are split into
+    keyframe-aligned windows (plus ``chunk_overlap`` seconds of lead-in) that are analysed
+    in parallel, at most ``chunk_workers`` windows of a file at a time; window results
+    are merged and de-duplicated within one frame. Decoder threads are split evenly
+    between the processes actually started.
+    """
+    config = config or DetectorConfig()
+    if config.name not in _BACKENDS:
+        raise ValueError(f"Unknown scene detector: {config.name} (choose from {DETECTORS})")
+
+    files = _media_files(raw_dir)
+    if not files:
+        return []
+    run_dir = raw_dir.parent
+    if probes is None:
+        probes = ProbeStore.for_run(run_dir)
+    if index is None:
+        index = SceneIndex.for_run(run_dir)
+
+    results: Dict[Path, SceneResult] = {}
+    jobs: List[_Job] = []
+    params: Dict[Path, dict] = {}
+    for source in files:
+        analysed = source
+        if use_proxies:
+            analysed = find_proxy(source, run_dir / "proxies") or source
+        params[source] = {**asdict(config), "proxy": analysed != source}
+        cached = index.lookup(source, params[source])
+        if cached is None and cache is not None:
+            cached = cache.lookup(source, params[source])
+            if cached is not None:
+                index.put(source, params[source], cached)
+        if cached is not None:
+            results[source] = cached
+            continue
+        info = probes.get(source)
+        duration = info.duration if info else None
+        windows: List[Tuple[float, float, Optional[float]]] = [(0.0, 0.0, None)]
+        if chunk_workers > 1 and duration and duration > chunk_length:
+            keyframes = info.keyframes if info else []
+            windows = list(plan_windows(duration, keyframes, chunk_length, chunk_overlap))
+        jobs.append(_Job(source=source, analysed=analysed, info=info, windows=windows))
+
+    if jobs:
+        # Files run side by side on up to ``workers`` processes; one file's windows use at
+        # most ``chunk_workers`` of them, even when it is the only file.
+        pool_size = max(workers or os.cpu_count() or 1, chunk_workers)
+        if config.name == "keyframes":
+            pool_size = 1  # no decoding: a process pool would only add start-up cost
+        outcomes = _run_jobs(jobs, config, pool_size, per_file=chunk_workers)
+        for job, result in zip(jobs, outcomes):
+            if result is None:
+                # Backend unavailable: fall back to one full-length segment, don't cache.
+                results[job.source] = SceneResult(cuts=[])
+                continue
+            results[job.source] = result
+            index.put(job.source, params[job.source], result)
+            if cache is not None:
+                cache.put(job.source, params[job.source], result)
+
+    segments: List[Segment] = []
+    for source in files:
+        result = results[source]
+        info = probes.get(source)
+        duration = (info.duration if info else None) or result.end or 0.0
+        segments.extend(segments_from_cuts(result.cuts, duration, str(source)))
     return segments
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import re
+import subprocess
+from pathlib import Path
+from typing import List, Optional
+
+# ffmpeg's scene score is 0..1; 0.3 is the value commonly used for hard cuts.
+DEFAULT_SCENE_THRESHOLD = 0.3
+
+_PTS_TIME = re.compile(r"\bpts_time:\s*(-?[0-9.]+)")
+
+
+def _scene_cmd(
+    source: Path,
+    threshold: float,
+    height: int,
+    frame_skip: int = 0,
+    start: float = 0.0,
+    end: Optional[float] = None,
+    threads: int = 0,
+) -> List[str]:
+    filters = []
+    if frame_skip > 0:
+        filters.append(f"framestep={frame_skip + 1}")
+    filters += [
+        f"scale=-2:{height}:flags=fast_bilinear",
+        f"select='gt(scene,{threshold})'",
+        "showinfo",
+    ]
+    cmd = ["ffmpeg", "-hide_banner", "-nostdin", "-v", "info"]
+    if threads:
+        cmd += ["-threads", str(threads)]
+    if start > 0:
+        cmd += ["-ss", f"{start:.6f}"]
+    cmd += ["-i", str(source)]
+    if end is not None:
+        cmd += ["-t", f"{max(end - start, 0.0):.6f}"]
+    return cmd + ["-map", "0:v:0", "-an", "-vf", ",".join(filters), "-f", "null", "-"]
+
+
+def _run_showinfo(cmd: List[str]) -> Optional[str]:
+    """Run ffmpeg and return its stderr (where showinfo logs), or None if ffmpeg is missing."""
+    try:
+        proc = subprocess.run(
+            cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=False
+        )
+    except FileNotFoundError:
+        return None
+    return proc.stderr
+
+
+def parse_showinfo(log: str) -> List[float]:
+    """Extract frame times from ``showinfo`` lines in an ffmpeg log."""
+    times = []
+    for line in log.splitlines():
+        if "Parsed_showinfo" not in line:
+            continue
+        match = _PTS_TIME.search(line)
+        if match:
+            times.append(float(match.group(1)))
+    return times
+
+
+def _spaced(times: List[float], floor: float, min_gap: float) -> List[float]:
+    cuts: List[float] = []
+    last = floor
+    for t in sorted(times):
+        if t > floor and t - last >= min_gap:
+            cuts.append(t)
+            last = t
+    return cuts
+
+
+def detect_scene_filter(
+    source: Path,
+    threshold: Optional[float] = None,
+    height: int = 72,
+    frame_skip: int = 0,
+    min_scene_len: float = 0.5,
+    start: float = 0.0,
+    end: Optional[float] = None,
+    threads: int = 0,
+) -> Optional[List[float]]:
+    """Rough cuts from ffmpeg's ``select='gt(scene,T)'`` filter, decoded entirely in ffmpeg.
+
+    Frames are downscaled to ``height`` before scoring. Returns cut times on the source
+    timeline, or None when ffmpeg is not available.
+    """
+    if threshold is None:
+        threshold = DEFAULT_SCENE_THRESHOLD
+    log = _run_showinfo(_scene_cmd(source, threshold, height, frame_skip, start, end, threads))
+    if log is None:
+        return None
+    # Input seeking rebases timestamps to zero, so shift them back onto the source timeline.
+    times = [start + t for t in parse_showinfo(log)] if start > 0 else parse_showinfo(log)
+    return _spaced(times, start, min_scene_len)
+
+
+def keyframe_cuts(
+    keyframes: List[float],
+    min_scene_len: float = 0.5,
+    start: float = 0.0,
+    end: Optional[float] = None,
+) -> List[float]:
+    """Rough cuts from container keyframe times, without decoding any frames.
+
+    Encoders usually force a keyframe on scene changes, so keyframes are a cheap proxy
+    for shot boundaries; ``min_scene_len`` drops the regular GOP keyframes in between
+    when it is set to at least the GOP length.
+    """
+    times = [k for k in keyframes if end is None or k < end]
+    return _spaced(times, start, min_scene_len)
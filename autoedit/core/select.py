@@ -1,14 +1,200 @@
 from __future__ import annotations
 
+import json
+from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional, Sequence
 
+from autoedit.core.intervals import IntervalIndex
+from autoedit.core.rules import RuleContext, RuleSpec, Shot, build_pipeline, run_pipeline
+from autoedit.core.transcript_stream import TRANSCRIPT_JSONL, iter_transcript_jsonl
+from autoedit.core.vad import VAD_NAME
 from autoedit.schemas.selection import Selection
-from autoedit.schemas.sequences import Sequences, Segment
-from autoedit.schemas.transcript import Transcript
+from autoedit.schemas.sequences import Segment
 
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import numpy as np
 
-def _overlaps(a_start: float, a_end: float, b_start: float, b_end: float) -> bool:
-    return max(a_start, b_start) < min(a_end, b_end)
+# Digits kept for speech_ratio in selection.json.
+RATIO_DIGITS = 4
+
+# Where speech intervals come from: the STT transcript, the energy VAD (vad.json), or both.
+SPEECH_SOURCES = ("transcript", "vad", "both")
+
+
+def _numpy():
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+    return np
+
+
+@dataclass
+class ShotTable:
+    """Shots as columns: ``start``/``end`` float64 arrays and an int32 index into ``sources``.
+
+    Selection rules run as vectorised masks over the columns; pydantic ``Segment`` objects
+    are only built for the shots that survive (see :meth:`to_selection`).
+    """
+
+    starts: "np.ndarray"
+    ends: "np.ndarray"
+    source_ids: "np.ndarray"
+    sources: List[str]
+
+    @classmethod
+    def from_records(cls, records: Sequence[dict]) -> "ShotTable":
+        np = _numpy()
+        ids: dict = {}
+        source_ids = [ids.setdefault(str(r["source"]), len(ids)) for r in records]
+        return cls(
+            starts=np.fromiter((r["start"] for r in records), np.float64, len(records)),
+            ends=np.fromiter((r["end"] for r in records), np.float64, len(records)),
+            source_ids=np.asarray(source_ids, dtype=np.int32),
+            sources=list(ids),
+        )
+
+    def from_source(self, name: Optional[str]) -> "np.ndarray":
+        """Mask of shots whose source file is named ``name`` (every shot if None)."""
+        np = _numpy()
+        if name is None:
+            return np.ones(len(self.starts), dtype=bool)
+        ids = [i for i, source in enumerate(self.sources) if Path(source).name == name]
+        return np.isin(self.source_ids, ids)
+
+    def to_selection(
+        self,
+        keep: "np.ndarray",
+        ends: "np.ndarray",
+        ratios: Optional["np.ndarray"] = None,
+        rows: slice = slice(None),
+    ) -> Selection:
+        """Build the ``Selection`` for the kept shots among ``rows``.
+
+        ``ratios`` holds each shot's speech coverage (NaN where unscored).
+        """
+        mask = keep[rows]
+        starts = self.starts[rows][mask].tolist()
+        scores: List[Optional[float]] = [None] * len(starts)
+        if ratios is not None:
+            scores = [None if r != r else r for r in ratios[rows][mask].round(RATIO_DIGITS)]
+        shots = [
+            Segment(start=s, end=e, source=self.sources[i], speech_ratio=r)
+            for s, e, i, r in zip(
+                starts, ends[rows][mask].tolist(), self.source_ids[rows][mask].tolist(), scores
+            )
+        ]
+        return Selection(shots=shots)
+
+
+def speech_ratio(speech: IntervalIndex, start: float, end: float) -> float:
+    """Fraction of ``[start, end)`` covered by speech; O(log n) via the index's prefix sums."""
+    if end <= start:
+        return 0.0
+    return speech.coverage(start, end) / (end - start)
+
+
+def speech_ratios(speech: IntervalIndex, starts: "np.ndarray", ends: "np.ndarray") -> "np.ndarray":
+    """Vectorised :func:`speech_ratio` (requires numpy)."""
+    np = _numpy()
+    durations = ends - starts
+    covered = speech.coverage_many(starts, ends)
+    return np.divide(covered, durations, out=np.zeros_like(covered), where=durations > 0)
+
+
+def _load_shots(artifacts_dir: Path) -> Optional[List[dict]]:
+    seq_path = artifacts_dir / "sequences.json"
+    if not seq_path.exists():
+        return None
+    return json.loads(seq_path.read_text()).get("segments") or []
+
+
+def _speech_media(artifacts_dir: Path) -> Optional[str]:
+    """File name of the input audio/main.flac was extracted from; None if unknown.
+
+    Transcripts and vad.json are timed against main.flac, so speech only describes that
+    input. Runs without a media db (hand-made artifacts) apply speech to every shot.
+    """
+    db_path = artifacts_dir / "media.db.json"
+    if not db_path.exists():
+        return None
+    db = json.loads(db_path.read_text())
+    main = db.get("main") or next(iter(db.get("inputs") or []), None)
+    return Path(main).name if main else None
+
+
+def _load_speech(artifacts_dir: Path, source: str = "transcript") -> Optional[IntervalIndex]:
+    """Speech intervals from ``source`` (see :data:`SPEECH_SOURCES`); None if none exist.
+
+    Without transcript.json, a streamed transcript.jsonl is used instead, so selection can
+    run on the partial timeline of a transcription that is still going (or crashed).
+    """
+    if source not in SPEECH_SOURCES:
+        raise ValueError(f"Unknown speech source '{source}'. Choose from: {SPEECH_SOURCES}")
+    found = False
+    intervals: List[tuple] = []
+    tx_path = artifacts_dir / "transcript.json"
+    stream_path = artifacts_dir / TRANSCRIPT_JSONL
+    if source in ("transcript", "both") and tx_path.exists():
+        found = True
+        segments = json.loads(tx_path.read_text()).get("segments") or []
+        intervals += [(float(t["start"]), float(t["end"])) for t in segments]
+    elif source in ("transcript", "both") and stream_path.exists():
+        found = True
+        intervals += [(t.start, t.end) for t in iter_transcript_jsonl(stream_path)]
+    vad_path = artifacts_dir / VAD_NAME
+    if source in ("vad", "both") and vad_path.exists():
+        found = True
+        regions = json.loads(vad_path.read_text()).get("regions") or []
+        intervals += [(float(r["start"]), float(r["end"])) for r in regions]
+    return IntervalIndex(intervals) if found else None
+
+
+def _select_python(
+    records: List[dict],
+    run_speech: Optional[IntervalIndex],
+    media: Optional[str],
+    speech_only: bool,
+    min_len: float,
+    max_len: float,
+    min_speech_ratio: float,
+) -> Selection:
+    shots = []
+    for r in records:
+        start, end = float(r["start"]), float(r["end"])
+        speech = run_speech
+        if media is not None and Path(r["source"]).name != media:
+            speech = None
+        if speech_only and speech is not None and not speech.overlaps(start, end):
+            continue
+        if min_len > 0 and end - start < min_len:
+            continue
+        if max_len > 0 and end - start > max_len:
+            end = start + max_len
+        ratio = None
+        if speech is not None:
+            ratio = speech_ratio(speech, start, end)
+            if ratio < min_speech_ratio:
+                continue
+            ratio = round(ratio, RATIO_DIGITS)
+        shots.append(Segment(start=start, end=end, source=r["source"], speech_ratio=ratio))
+    return Selection(shots=shots)
+
+
+def _flag_rules(
+    speech_only: bool, min_len: float, max_len: float, min_speech_ratio: float
+) -> List[RuleSpec]:
+    specs: List[RuleSpec] = []
+    if speech_only:
+        specs.append("speech_only")
+    if min_len > 0:
+        specs.append({"rule": "min_len", "seconds": min_len})
+    if max_len > 0:
+        specs.append({"rule": "max_len", "seconds": max_len})
+    if min_speech_ratio > 0:
+        specs.append({"rule": "min_speech_ratio", "ratio": min_speech_ratio})
+    return specs
 
 
 def select_segments(
@@ -16,43 +202,105 @@ def select_segments(
     speech_only: bool = False,
     min_len: float = 0.0,
     max_len: float = 0.0,
+    rules: Optional[Sequence[RuleSpec]] = None,
+    min_speech_ratio: float = 0.0,
+    speech_source: str = "transcript",
 ) -> Selection:
     """Selection with simple heuristics.
 
-    - If speech_only, keeps only shots that overlap any transcript segment.
+    - If speech_only, keeps only shots that overlap any speech interval.
     - If min_len > 0: drops shots shorter than min_len.
     - If max_len > 0: trims shots longer than max_len (end = start + max_len).
+    - If min_speech_ratio > 0: drops (trimmed) shots with less speech coverage.
+
+    Speech comes from ``speech_source``: ``transcript`` (transcript.json), ``vad`` (the
+    energy VAD in vad.json, no STT needed) or ``both`` (their union). When speech data
+    exists, every selected shot gets its ``speech_ratio``: the fraction of it covered by
+    merged speech intervals.
+
+    Speech is extracted from audio/main.flac, i.e. one input (recorded as ``main`` in
+    media.db.json). Speech rules and scores only apply to that input's shots; shots of
+    other inputs are kept unfiltered with no ``speech_ratio``.
+
+    ``rules`` (see :mod:`autoedit.core.rules`) run after those heuristics as a lazy
+    generator pipeline; shots stream through every stage and rules such as
+    ``cap_total`` stop the scan early. Raises ValueError for unknown rules or sources.
     """
-    seq_path = artifacts_dir / "sequences.json"
-    if not seq_path.exists():  # fallback: empty selection
-        return Selection(shots=[])
-    sequences = Sequences.model_validate_json(seq_path.read_text())
+    if not rules:
+        return select_many(
+            [artifacts_dir],
+            speech_only,
+            min_len,
+            max_len,
+            min_speech_ratio=min_speech_ratio,
+            speech_source=speech_source,
+        )[0]
 
-    shots = [Segment(**s.model_dump()) for s in sequences.segments]
+    ctx = RuleContext(
+        speech=_load_speech(artifacts_dir, speech_source),
+        speech_media=_speech_media(artifacts_dir),
+    )
+    flags = _flag_rules(speech_only, min_len, max_len, min_speech_ratio)
+    stages = build_pipeline([*flags, *rules], ctx)
+    records = _load_shots(artifacts_dir) or []
+    shots = (Shot(float(r["start"]), float(r["end"]), str(r["source"])) for r in records)
+    selected = []
+    for s in run_pipeline(shots, stages):
+        speech = ctx.speech_for(s)
+        ratio = round(speech_ratio(speech, s.start, s.end), RATIO_DIGITS) if speech else None
+        selected.append(Segment(start=s.start, end=s.end, source=s.source, speech_ratio=ratio))
+    return Selection(shots=selected)
 
-    if speech_only:
-        tx_path = artifacts_dir / "transcript.json"
-        if tx_path.exists():
-            tx = Transcript.model_validate_json(tx_path.read_text())
-            kept = []
-            for seg in shots:
-                has_overlap = any(
-                    _overlaps(seg.start, seg.end, t.start, t.end) for t in tx.segments
-                )
-                if has_overlap:
-                    kept.append(seg)
-            shots = kept
 
-    if min_len > 0:
-        shots = [s for s in shots if (s.end - s.start) >= min_len]
+def select_many(
+    artifacts_dirs: Sequence[Path],
+    speech_only: bool = False,
+    min_len: float = 0.0,
+    max_len: float = 0.0,
+    min_speech_ratio: float = 0.0,
+    speech_source: str = "transcript",
+) -> List[Selection]:
+    """Run :func:`select_segments` over many runs' artifacts in one vectorised pass.
 
+    All shots are loaded into a single :class:`ShotTable` and every rule is one vectorised
+    mask over it; speech overlap and coverage are ``searchsorted`` lookups per run against
+    that run's merged speech intervals. Without numpy the rules are applied shot by shot.
+    """
+    loaded = [_load_shots(d) for d in artifacts_dirs]
+    speech = [_load_speech(d, speech_source) for d in artifacts_dirs]
+    media = [_speech_media(d) for d in artifacts_dirs]
+    np = _numpy()
+    if np is None:
+        return [
+            _select_python(
+                records or [], index, name, speech_only, min_len, max_len, min_speech_ratio
+            )
+            for records, index, name in zip(loaded, speech, media)
+        ]
+
+    records = [r for rs in loaded for r in rs or []]
+    table = ShotTable.from_records(records)
+    bounds = np.cumsum([0, *(len(rs or []) for rs in loaded)])
+    runs = [(slice(bounds[k], bounds[k + 1]), index) for k, index in enumerate(speech)]
+
+    ends = table.ends
     if max_len > 0:
-        trimmed = []
-        for s in shots:
-            dur = s.end - s.start
-            if dur > max_len:
-                s = Segment(start=s.start, end=s.start + max_len, source=s.source)
-            trimmed.append(s)
-        shots = trimmed
+        ends = np.where(ends - table.starts > max_len, table.starts + max_len, ends)
 
-    return Selection(shots=shots)
+    # Shots without speech data (no transcript, or not the main.flac input) keep every
+    # shot (no speech filtering) and stay unscored.
+    keep = np.ones(len(records), dtype=bool)
+    ratios = np.full(len(records), np.nan)
+    for (rows, index), name in zip(runs, media):
+        if index is None:
+            continue
+        scored = np.flatnonzero(table.from_source(name)[rows]) + rows.start
+        if speech_only:
+            keep[scored] = index.overlaps_many(table.starts[scored], table.ends[scored])
+        ratios[scored] = speech_ratios(index, table.starts[scored], ends[scored])
+    if min_len > 0:
+        keep &= (table.ends - table.starts) >= min_len
+    if min_speech_ratio > 0:
+        keep &= ~(ratios < min_speech_ratio)
+
+    return [table.to_selection(keep, ends, ratios, rows) for rows, _ in runs]
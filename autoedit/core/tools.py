@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import subprocess
+from typing import Any, List
+
+
+def run_tool(cmd: List[str], quiet: bool = True) -> int:
+    """Run an external tool and return its exit code; 127 when it is not installed.
+
+    ``quiet`` discards the tool's stdout and stderr.
+    """
+    output = subprocess.DEVNULL if quiet else None
+    try:
+        return subprocess.call(cmd, stdout=output, stderr=output)
+    except FileNotFoundError:
+        return 127
+
+
+def require_numpy(feature: str) -> Any:
+    """Import numpy, or raise ImportError naming the ``feature`` that needs it."""
+    try:
+        import numpy as np
+    except ImportError as exc:  # pragma: no cover - dependency missing
+        raise ImportError(
+            f"numpy is required for {feature}. Install with 'pip install numpy' "
+            "or use the [full] extra."
+        ) from exc
+    return np
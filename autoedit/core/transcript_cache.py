@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Callable, Optional
+
+from autoedit.core.cache import ContentCache
+from autoedit.schemas.transcript import Transcript
+
+
+class TranscriptCache(ContentCache):
+    """Persistent, cross-run transcript cache keyed on audio content.
+
+    Transcripts are stored per audio digest, backend, model and language under
+    ``root/transcripts``.
+    """
+
+    directory = "transcripts"
+    kind = "transcript"
+
+    def lookup(
+        self, audio_path: Path, backend: str, model: str, language: Optional[str]
+    ) -> Optional[Transcript]:
+        data = self._get(audio_path, (backend, model, language))
+        if data is None:
+            return None
+        try:
+            return Transcript.model_validate(data)
+        except ValueError:
+            return None
+
+    def put(
+        self,
+        audio_path: Path,
+        backend: str,
+        model: str,
+        language: Optional[str],
+        transcript: Transcript,
+    ) -> bool:
+        """Store ``transcript``; returns False when it is not cacheable.
+
+        Stub transcripts (those carrying a ``note``) are never stored, nor are transcripts
+        whose service-reported ``audio_hash`` differs from the local file's.
+        """
+        if transcript.note:
+            return False
+        if transcript.audio_hash and transcript.audio_hash != self.digest(audio_path):
+            return False
+        self._put(audio_path, (backend, model, language), transcript.model_dump(mode="json"))
+        return True
+
+    def get_or_transcribe(
+        self,
+        audio_path: Path,
+        backend: str,
+        model: str,
+        language: Optional[str],
+        transcribe: Callable[[], Transcript],
+    ) -> Transcript:
+        """Return the cached transcript, or run ``transcribe`` and cache its result."""
+        cached = self.lookup(audio_path, backend, model, language)
+        if cached is not None:
+            return cached
+        transcript = transcribe()
+        self.put(audio_path, backend, model, language, transcript)
+        return transcript
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import IO, Iterable, Iterator, Optional
+
+from autoedit.schemas.transcript import TranscriptSegment
+
+TRANSCRIPT_JSONL = "transcript.jsonl"
+# Appended lines are flushed immediately and fsync'ed at most this often.
+FSYNC_INTERVAL_S = 5.0
+
+
+class TranscriptWriter:
+    """Append-only ``transcript.jsonl`` writer: one JSON segment per line.
+
+    Each line is flushed as soon as it is written so readers see the partial timeline,
+    and the file is fsync'ed every ``fsync_interval`` seconds (and on close) so a crash
+    loses at most the last few seconds of output.
+    """
+
+    def __init__(self, path: Path, fsync_interval: float = FSYNC_INTERVAL_S) -> None:
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self.count = 0
+        self._fh: Optional[IO[str]] = None
+        self._last_sync = 0.0
+
+    def __enter__(self) -> "TranscriptWriter":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = self.path.open("w", encoding="utf-8")
+        self._last_sync = time.monotonic()
+        return self
+
+    def write(self, segment: TranscriptSegment) -> None:
+        assert self._fh is not None, "use TranscriptWriter as a context manager"
+        self._fh.write(segment.model_dump_json() + "\n")
+        self._fh.flush()
+        self.count += 1
+        now = time.monotonic()
+        if now - self._last_sync >= self.fsync_interval:
+            os.fsync(self._fh.fileno())
+            self._last_sync = now
+
+    def __exit__(self, *exc) -> None:
+        if self._fh is not None:
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+            self._fh.close()
+            self._fh = None
+
+
+def write_transcript_stream(
+    segments: Iterable[TranscriptSegment],
+    path: Path,
+    fsync_interval: float = FSYNC_INTERVAL_S,
+) -> int:
+    """Drain ``segments`` into ``path`` as they arrive; returns the number written."""
+    with TranscriptWriter(path, fsync_interval) as writer:
+        for segment in segments:
+            writer.write(segment)
+    return writer.count
+
+
+def iter_transcript_jsonl(path: Path) -> Iterator[TranscriptSegment]:
+    """Read segments back one line at a time.
+
+    A truncated last line (the writer was interrupted mid-write) is skipped, so a partial
+    file from a running or crashed transcription is always readable.
+    """
+    with path.open("r", encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield TranscriptSegment.model_validate(json.loads(line))
+            except ValueError:
+                continue
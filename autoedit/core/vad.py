@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import os
+import uuid
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from autoedit.core.fsutil import (
+    atomic_write_text,
+    built_from,
+    file_stamp,
+    forget_source,
+    record_source,
+)
+from autoedit.core.tools import require_numpy, run_tool
+from autoedit.schemas.vad import SpeechRegion, VoiceActivity
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import numpy as np
+
+VAD_NAME = "vad.json"
+ENERGY_NAME = "energy.npy"
+
+# Analysis format: mono float32 at 16 kHz is plenty for energy/VAD and keeps the cache small.
+VAD_SAMPLE_RATE = 16000
+FRAME_S = 0.02
+# Frames reduced per vectorised block, so only one block of the memmap is paged in at a time.
+ENERGY_BLOCK_FRAMES = 1 << 16
+
+# Adaptive threshold: speech sits this far above the noise floor (10th percentile of frame
+# energy), but never below the absolute floor.
+NOISE_MARGIN_DB = 12.0
+FLOOR_DB = -50.0
+SILENCE_DB = -100.0
+
+
+def pcm_cache_path(audio_path: Path, sample_rate: int = VAD_SAMPLE_RATE) -> Path:
+    return audio_path.with_name(f"{audio_path.stem}.{sample_rate}.f32")
+
+
+def decode_pcm(audio_path: Path, sample_rate: int = VAD_SAMPLE_RATE) -> Optional[Path]:
+    """Decode ``audio_path`` once to raw mono float32 next to it; reused while up to date.
+
+    ffmpeg writes the file directly, so decoding never holds the signal in memory. The
+    PCM is reused while the size, mtime and inode recorded next to it match
+    ``audio_path``: a re-ingest hardlinks main.flac to cached audio with an old mtime,
+    which a newer-than check would miss. Returns None when ffmpeg fails.
+    """
+    dest = pcm_cache_path(audio_path, sample_rate)
+    if built_from(dest, audio_path):
+        return dest
+    stamp = file_stamp(audio_path)
+    forget_source(dest)
+    tmp = dest.with_name(f".{dest.name}.{uuid.uuid4().hex}.tmp")
+    cmd = [
+        "ffmpeg",
+        "-y",
+        "-v",
+        "error",
+        "-nostdin",
+        "-i",
+        str(audio_path),
+        "-ac",
+        "1",
+        "-ar",
+        str(sample_rate),
+        "-f",
+        "f32le",
+        str(tmp),
+    ]
+    if run_tool(cmd) != 0 or not tmp.exists():
+        tmp.unlink(missing_ok=True)
+        return None
+    os.replace(tmp, dest)
+    record_source(dest, stamp)
+    return dest
+
+
+def load_pcm(path: Path) -> "np.ndarray":
+    """Memory-map a raw float32 PCM file (read-only)."""
+    np = require_numpy("voice-activity analysis")
+    if path.stat().st_size < 4:
+        return np.zeros(0, dtype=np.float32)
+    return np.memmap(path, dtype=np.float32, mode="r")
+
+
+def energy_envelope(
+    samples: "np.ndarray",
+    sample_rate: int,
+    frame_s: float = FRAME_S,
+    block: int = ENERGY_BLOCK_FRAMES,
+) -> "np.ndarray":
+    """Per-frame RMS energy in dBFS (float32), computed block by block over ``samples``."""
+    np = require_numpy("voice-activity analysis")
+    hop = max(1, int(round(sample_rate * frame_s)))
+    count = len(samples) // hop
+    out = np.empty(count, dtype=np.float32)
+    for i in range(0, count, block):
+        j = min(count, i + block)
+        frames = np.asarray(samples[i * hop : j * hop], dtype=np.float32).reshape(j - i, hop)
+        power = np.einsum("ij,ij->i", frames, frames) / hop
+        out[i:j] = 10.0 * np.log10(np.maximum(power, 10 ** (SILENCE_DB / 10)))
+    return out
+
+
+def speech_regions(
+    energy_db: "np.ndarray",
+    frame_s: float = FRAME_S,
+    threshold_db: Optional[float] = None,
+    min_speech: float = 0.25,
+    min_silence: float = 0.3,
+) -> Tuple[List[Tuple[float, float]], float]:
+    """Turn an energy envelope into speech regions; returns ``(regions, threshold_db)``.
+
+    Frames above the threshold are speech; pauses shorter than ``min_silence`` are bridged
+    and regions shorter than ``min_speech`` dropped.
+    """
+    np = require_numpy("voice-activity analysis")
+    if threshold_db is None:
+        noise = float(np.percentile(energy_db, 10)) if len(energy_db) else SILENCE_DB
+        threshold_db = max(noise + NOISE_MARGIN_DB, FLOOR_DB)
+    active = np.concatenate(([0], (energy_db > threshold_db).astype(np.int8), [0]))
+    edges = np.flatnonzero(np.diff(active))
+    starts = edges[0::2] * frame_s
+    ends = edges[1::2] * frame_s
+    if len(starts) > 1 and min_silence > 0:
+        gap_ok = starts[1:] - ends[:-1] >= min_silence
+        starts = np.concatenate((starts[:1], starts[1:][gap_ok]))
+        ends = np.concatenate((ends[:-1][gap_ok], ends[-1:]))
+    long_enough = ends - starts >= min_speech
+    regions = list(zip(starts[long_enough].tolist(), ends[long_enough].tolist()))
+    return regions, float(threshold_db)
+
+
+def analyze_audio(
+    audio_path: Path,
+    output_path: Path,
+    threshold_db: Optional[float] = None,
+    frame_s: float = FRAME_S,
+    min_speech: float = 0.25,
+    min_silence: float = 0.3,
+) -> Optional[VoiceActivity]:
+    """Energy/VAD analysis of ``audio_path`` without running speech recognition.
+
+    Decodes once to a memory-mapped float32 cache (``<stem>.16000.f32`` next to the
+    audio), writes the speech regions to ``output_path`` (vad.json) and the float16
+    energy envelope to ``energy.npy`` beside it. Returns None if decoding fails.
+    """
+    np = require_numpy("voice-activity analysis")
+    pcm = decode_pcm(audio_path)
+    if pcm is None:
+        return None
+    samples = load_pcm(pcm)
+    energy = energy_envelope(samples, VAD_SAMPLE_RATE, frame_s)
+    regions, threshold = speech_regions(energy, frame_s, threshold_db, min_speech, min_silence)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    energy_path = output_path.with_name(ENERGY_NAME)
+    np.save(energy_path, energy.astype(np.float16))
+    activity = VoiceActivity(
+        sample_rate=VAD_SAMPLE_RATE,
+        frame_s=frame_s,
+        threshold_db=threshold,
+        duration=len(samples) / VAD_SAMPLE_RATE,
+        regions=[SpeechRegion(start=s, end=e) for s, e in regions],
+        energy_path=energy_path.name,
+    )
+    atomic_write_text(output_path, activity.model_dump_json(indent=2))
+    return activity
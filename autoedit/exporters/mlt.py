@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+from fractions import Fraction
 from pathlib import Path
+from typing import Union
 
 from autoedit.schemas.selection import Selection
 
@@ -9,15 +11,23 @@ def _producer_id(index: int) -> str:
     return f"producer{index}"
 
 
-def _sec_to_frames(sec: float, fps: float) -> int:
+def _sec_to_frames(sec: float, fps: Fraction) -> int:
     return max(int(round(sec * fps)), 0)
 
 
-def export_mlt(selection: Selection, output_path: Path, fps: float = 25.0) -> None:
+def _rational_fps(fps: Union[float, Fraction]) -> Fraction:
+    # NTSC rates such as 30000/1001 stay exact; plain floats like 29.97 become 2997/100.
+    return Fraction(fps).limit_denominator(1001)
+
+
+def export_mlt(selection: Selection, output_path: Path, fps: Union[float, Fraction] = 25.0) -> None:
     """Write a minimal MLT XML compatible with Kdenlive/Shotcut.
 
-    Assumes all shots reference the same source file (MVP constraint).
+    Assumes all shots reference the same source file (MVP constraint). ``fps`` may be a
+    ``Fraction`` (e.g. a probed 30000/1001); the profile's frame_rate_num/den and every
+    entry's in/out frames use the same rational rate.
     """
+    fps = _rational_fps(fps)
     if not selection.shots:
         output_path.write_text("""<mlt><playlist id=\"playlist0\"></playlist></mlt>""")
         return
@@ -55,9 +65,9 @@ def export_mlt(selection: Selection, output_path: Path, fps: float = 25.0) -> No
     xml = f"""
 <mlt title="autoedit" version="7.8.0">
  <profile
-  description="HD 1080p {fps} fps"
-  frame_rate_num="{int(fps)}"
-  frame_rate_den="1"
+  description="HD 1080p {float(fps):.5g} fps"
+  frame_rate_num="{fps.numerator}"
+  frame_rate_den="{fps.denominator}"
   width="1920"
   height="1080"
   colorspace="709"/>
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from fractions import Fraction
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class StreamInfo(BaseModel):
+    index: int
+    codec_type: str
+    codec_name: Optional[str] = None
+    duration: Optional[float] = None
+    # video
+    width: Optional[int] = None
+    height: Optional[int] = None
+    fps_num: Optional[int] = None
+    fps_den: Optional[int] = None
+    # audio
+    sample_rate: Optional[int] = None
+    channels: Optional[int] = None
+    channel_layout: Optional[str] = None
+
+    @property
+    def fps(self) -> Optional[Fraction]:
+        if not self.fps_num or not self.fps_den:
+            return None
+        return Fraction(self.fps_num, self.fps_den)
+
+
+class MediaInfo(BaseModel):
+    path: str
+    size: int
+    mtime_ns: int
+    duration: Optional[float] = None
+    format_name: Optional[str] = None
+    streams: List[StreamInfo] = []
+    keyframes: List[float] = []
+
+    @property
+    def video(self) -> Optional[StreamInfo]:
+        return next((s for s in self.streams if s.codec_type == "video"), None)
+
+    @property
+    def audio(self) -> Optional[StreamInfo]:
+        return next((s for s in self.streams if s.codec_type == "audio"), None)
+
+    @property
+    def fps(self) -> Optional[Fraction]:
+        return self.video.fps if self.video else None
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -9,6 +9,8 @@ class Segment(BaseModel):
     start: float = Field(ge=0)
     end: float = Field(ge=0)
     source: str
+    # Fraction of the shot covered by speech; set by selection when scored.
+    speech_ratio: Optional[float] = Field(default=None, ge=0, le=1)
 
 
 class Sequences(BaseModel):
@@ -15,3 +15,5 @@ class Transcript(BaseModel):
     text: str
     segments: List[TranscriptSegment]
     note: Optional[str] = None
+    # SHA-256 of the audio as reported by the remote service, when available.
+    audio_hash: Optional[str] = None
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class SpeechRegion(BaseModel):
+    start: float = Field(ge=0)
+    end: float = Field(ge=0)
+
+
+class VoiceActivity(BaseModel):
+    sample_rate: int
+    frame_s: float
+    threshold_db: float
+    duration: float
+    regions: List[SpeechRegion]
+    # Frame-level RMS envelope (dBFS, float16) saved next to vad.json.
+    energy_path: Optional[str] = None
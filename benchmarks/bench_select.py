@@ -0,0 +1,56 @@
+"""Benchmark speech_only overlap checks: naive pairwise scan vs. IntervalIndex.
+
+Usage: python benchmarks/bench_select.py [--shots 100000] [--speech 100000] [--naive-sample 200]
+
+The naive scan is O(shots * speech), so it is timed on a sample of shots and extrapolated.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import List, Tuple
+
+from autoedit.core.intervals import IntervalIndex
+
+
+def _synthetic(n: int, span: float, max_len: float, seed: int) -> List[Tuple[float, float]]:
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        start = rng.uniform(0.0, span)
+        out.append((start, start + rng.uniform(0.05, max_len)))
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shots", type=int, default=100_000)
+    parser.add_argument("--speech", type=int, default=100_000)
+    parser.add_argument("--naive-sample", type=int, default=200)
+    args = parser.parse_args()
+
+    span = float(max(args.shots, args.speech)) * 2.0
+    shots = _synthetic(args.shots, span, 6.0, seed=1)
+    speech = _synthetic(args.speech, span, 3.0, seed=2)
+
+    t0 = time.perf_counter()
+    index = IntervalIndex(speech)
+    fast = [index.overlaps(s, e) for s, e in shots]
+    indexed_s = time.perf_counter() - t0
+
+    sample = shots[: args.naive_sample]
+    t0 = time.perf_counter()
+    naive = [any(max(s, a) < min(e, b) for a, b in speech) for s, e in sample]
+    naive_s = (time.perf_counter() - t0) * len(shots) / max(len(sample), 1)
+
+    assert naive == fast[: len(sample)], "indexed result differs from the naive scan"
+    print(f"{args.shots} shots x {args.speech} speech segments, {sum(fast)} shots with speech")
+    print(f"  interval index: {indexed_s:8.3f} s")
+    print(f"  naive scan:     {naive_s:8.3f} s (extrapolated from {len(sample)} shots)")
+    print(f"  speedup:        {naive_s / indexed_s:8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
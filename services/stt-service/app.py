@@ -1,15 +1,22 @@
 from __future__ import annotations
 
+import asyncio
 import hashlib
+import json
 import os
+import sqlite3
 import tempfile
+import threading
+import time
 import uuid
-from contextlib import suppress
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import asynccontextmanager, suppress
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import httpx
 from fastapi import FastAPI, HTTPException, Header
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 
@@ -25,10 +32,46 @@ class TranscribeResponse(BaseModel):
     hash: Optional[str] = None
 
 
-app = FastAPI(title="AutoEdit STT Service (MVP)")
+class JobStatus(BaseModel):
+    id: str
+    status: str  # queued | running | done | failed | cancelled
+    result: Optional[TranscribeResponse] = None
+    error: Optional[str] = None
+
+
+@asynccontextmanager
+async def _lifespan(_app: FastAPI):
+    _job_runner()  # re-queue jobs persisted by a previous process
+    yield
+    if _RUNNER is not None:
+        _RUNNER.shutdown()
+
+
+app = FastAPI(title="AutoEdit STT Service (MVP)", lifespan=_lifespan)
 
 _MODEL_CACHE: Dict[str, object] = {}
+_PIPELINE_CACHE: Dict[str, object] = {}
+_MODEL_LOCK = threading.Lock()
 _DOWNLOAD_TIMEOUT_S = float(os.getenv("DOWNLOAD_TIMEOUT_S", "30"))
+# Background jobs: concurrent transcriptions, queue bound, retention of finished jobs, and
+# an optional SQLite file (local to this replica) that lets queued jobs survive restarts.
+_JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+_JOB_QUEUE_MAX = int(os.getenv("JOB_QUEUE_MAX", "100"))
+_JOB_TTL_S = float(os.getenv("JOB_TTL_S", "3600"))
+_JOB_DB = os.getenv("JOB_DB")
+_MAX_WAIT_S = 60.0
+_POLL_S = 0.1
+# Persistent result cache keyed on audio hash + model + language ("" disables it).
+_RESULT_CACHE_DIR = os.getenv(
+    "RESULT_CACHE_DIR", str(Path(tempfile.gettempdir()) / "autoedit-stt-results")
+)
+_RESULT_CACHE_MAX_MB = int(os.getenv("RESULT_CACHE_MAX_MB", "1024"))
+# At most MODEL_CONCURRENCY transcriptions run on one model at a time. Requests are not
+# merged across callers; each extra slot is one more CTranslate2 worker, which on GPU costs
+# roughly another copy of the model's memory, hence the default of 1.
+_MODEL_CONCURRENCY = int(os.getenv("MODEL_CONCURRENCY", "1"))
+# BatchedInferencePipeline decodes BATCH_SIZE chunks of one request per pass (0 = plain model).
+_BATCH_SIZE = int(os.getenv("BATCH_SIZE", "8"))
 
 
 @app.get("/healthz")
@@ -50,9 +93,11 @@ def _sha256(path: Path) -> str:
     return digest.hexdigest()
 
 
-def _download_audio(url: str) -> Path:
+def _download_audio(url: str) -> Tuple[Path, str]:
+    """Download to a temp file, hashing the bytes as they arrive; returns (path, sha256)."""
     suffix = Path(httpx.URL(url).path).suffix or ".bin"
     tmp_path = Path(tempfile.gettempdir()) / f"autoedit-{uuid.uuid4().hex}{suffix}"
+    digest = hashlib.sha256()
     try:
         with httpx.stream("GET", url, follow_redirects=True, timeout=_DOWNLOAD_TIMEOUT_S) as resp:
             resp.raise_for_status()
@@ -60,25 +105,122 @@ def _download_audio(url: str) -> Path:
                 for chunk in resp.iter_bytes(64 * 1024):
                     if chunk:
                         fh.write(chunk)
+                        digest.update(chunk)
     except httpx.HTTPError as exc:
         with suppress(FileNotFoundError):
             tmp_path.unlink()
         raise HTTPException(status_code=502, detail=f"Failed to download audio: {exc}") from exc
-    return tmp_path
+    return tmp_path, digest.hexdigest()
 
 
-def _resolve_audio_source(audio_url: str) -> Tuple[Path, bool]:
+def _resolve_audio_source(audio_url: str) -> Tuple[Path, bool, str]:
+    """Local path, whether it is a temp download to delete, and the audio's SHA-256."""
     lowered = audio_url.lower()
     if lowered.startswith("http://") or lowered.startswith("https://"):
-        path = _download_audio(audio_url)
-        return path, True
+        path, digest = _download_audio(audio_url)
+        return path, True, digest
     if lowered.startswith("file://"):
         path = Path(audio_url[7:])
     else:
         path = Path(audio_url)
     if not path.exists():
         raise HTTPException(status_code=400, detail="Audio source not found")
-    return path, False
+    return path, False, _sha256(path)
+
+
+def _release_audio(path: Path, cleanup: bool) -> None:
+    if cleanup:
+        with suppress(FileNotFoundError):
+            path.unlink()
+
+
+class ResultCache:
+    """Transcription results on disk, keyed on audio SHA-256 + model + language.
+
+    One JSON file per result under ``root/<aa>/<key>.json``. Hits refresh the file's
+    mtime; writes evict the least recently used files until the total fits ``max_bytes``.
+    """
+
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(digest: str, model: str, lang: Optional[str]) -> str:
+        return hashlib.sha256(json.dumps([digest, model, lang]).encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[TranscribeResponse]:
+        path = self._path(key)
+        try:
+            result = TranscribeResponse.model_validate_json(path.read_text())
+        except (FileNotFoundError, ValueError):
+            return None
+        with suppress(OSError):
+            os.utime(path)
+        return result
+
+    def put(self, key: str, result: TranscribeResponse) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        tmp.write_text(result.model_dump_json())
+        os.replace(tmp, path)
+        self.evict()
+
+    def evict(self) -> None:
+        with self._lock:
+            entries = []
+            for path in self.root.glob("*/*.json"):
+                with suppress(FileNotFoundError):
+                    st = path.stat()
+                    entries.append((st.st_mtime_ns, st.st_size, path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+
+
+_RESULT_CACHES: Dict[str, ResultCache] = {}
+# Separate from _MODEL_LOCK so a cache hit never waits behind a model load.
+_RESULT_CACHES_LOCK = threading.Lock()
+
+
+def _result_cache() -> Optional[ResultCache]:
+    """The cache under ``_RESULT_CACHE_DIR``; None when caching is disabled."""
+    if not _RESULT_CACHE_DIR:
+        return None
+    with _RESULT_CACHES_LOCK:
+        if _RESULT_CACHE_DIR not in _RESULT_CACHES:
+            _RESULT_CACHES[_RESULT_CACHE_DIR] = ResultCache(
+                Path(_RESULT_CACHE_DIR), _RESULT_CACHE_MAX_MB * 1024 * 1024
+            )
+        return _RESULT_CACHES[_RESULT_CACHE_DIR]
+
+
+def _cached_result(req: "TranscribeRequest", digest: str) -> Optional[TranscribeResponse]:
+    cache = _result_cache()
+    return cache.get(ResultCache.key(digest, req.model, req.lang)) if cache else None
+
+
+def _store_result(req: "TranscribeRequest", result: TranscribeResponse) -> None:
+    cache = _result_cache()
+    if cache is not None and result.hash:
+        cache.put(ResultCache.key(result.hash, req.model, req.lang), result)
+
+
+_LOAD_LOCKS: Dict[str, threading.Lock] = {}
+
+
+def _load_lock(name: str) -> threading.Lock:
+    """Per-model lock, so loading one model never stalls requests for another."""
+    with _MODEL_LOCK:
+        return _LOAD_LOCKS.setdefault(name, threading.Lock())
 
 
 def _get_model(model_name: str):
@@ -87,27 +229,79 @@ def _get_model(model_name: str):
     except Exception as exc:  # pragma: no cover - dependency missing in env
         raise HTTPException(status_code=503, detail="faster-whisper not available") from exc
 
-    if model_name not in _MODEL_CACHE:
-        device = os.getenv("STT_DEVICE", "auto")
-        compute_type = os.getenv("STT_COMPUTE_TYPE")
-        kwargs = {"device": device}
-        if compute_type:
-            kwargs["compute_type"] = compute_type
-        _MODEL_CACHE[model_name] = WhisperModel(model_name, **kwargs)
-    return _MODEL_CACHE[model_name]
+    model = _MODEL_CACHE.get(model_name)
+    if model is not None:
+        return model
+    with _load_lock(model_name):
+        if model_name not in _MODEL_CACHE:
+            device = os.getenv("STT_DEVICE", "auto")
+            compute_type = os.getenv("STT_COMPUTE_TYPE")
+            # One CTranslate2 worker per slot (see _MODEL_CONCURRENCY).
+            kwargs = {"device": device, "num_workers": max(1, _MODEL_CONCURRENCY)}
+            if compute_type:
+                kwargs["compute_type"] = compute_type
+            _MODEL_CACHE[model_name] = WhisperModel(model_name, **kwargs)
+        return _MODEL_CACHE[model_name]
+
 
+def _get_pipeline(model_name: str):
+    """faster-whisper's BatchedInferencePipeline for ``model_name``.
 
-def _run_transcription(audio_path: Path, model_name: str, language: Optional[str]):
+    None when ``BATCH_SIZE`` is 0 or faster-whisper predates the pipeline (< 1.1).
+    """
+    if _BATCH_SIZE <= 0:
+        return None
     model = _get_model(model_name)
-    segments_iter, _info = model.transcribe(str(audio_path), language=language)
-    segments: list[dict] = []
-    text_parts: list[str] = []
+    try:
+        from faster_whisper import BatchedInferencePipeline  # type: ignore
+    except ImportError:
+        return None
+    pipeline = _PIPELINE_CACHE.get(model_name)
+    if pipeline is not None:
+        return pipeline
+    with _load_lock(model_name):
+        if model_name not in _PIPELINE_CACHE:
+            _PIPELINE_CACHE[model_name] = BatchedInferencePipeline(model=model)
+        return _PIPELINE_CACHE[model_name]
+
+
+def _iter_segments(audio_path: Path, model_name: str, language: Optional[str]) -> Iterator[dict]:
+    pipeline = _get_pipeline(model_name)
+    if pipeline is not None:
+        # The pipeline splits audio at voice activity, so it needs vad_filter; its default
+        # without_timestamps=True would leave segment times at chunk granularity.
+        segments_iter, _info = pipeline.transcribe(
+            str(audio_path),
+            language=language,
+            batch_size=_BATCH_SIZE,
+            vad_filter=True,
+            without_timestamps=False,
+        )
+    else:
+        segments_iter, _info = _get_model(model_name).transcribe(str(audio_path), language=language)
     for seg in segments_iter:  # type: ignore[attr-defined]
-        payload = {
+        yield {
             "start": float(getattr(seg, "start", 0.0)),
             "end": float(getattr(seg, "end", 0.0)),
             "text": getattr(seg, "text", "") or "",
         }
+
+
+class _Cancelled(Exception):
+    pass
+
+
+def _transcribe_now(
+    audio_path: Path,
+    model_name: str,
+    language: Optional[str],
+    cancel: Optional[threading.Event] = None,
+):
+    segments: list[dict] = []
+    text_parts: list[str] = []
+    for payload in _iter_segments(audio_path, model_name, language):
+        if cancel is not None and cancel.is_set():
+            raise _Cancelled()
         segments.append(payload)
         if payload["text"]:
             text_parts.append(payload["text"].strip())
@@ -115,21 +309,301 @@ def _run_transcription(audio_path: Path, model_name: str, language: Optional[str
     return text, segments
 
 
+_SLOTS: Dict[str, threading.BoundedSemaphore] = {}
+
+
+def _model_slots(model_name: str) -> threading.BoundedSemaphore:
+    """Caps concurrent transcriptions of one model at ``_MODEL_CONCURRENCY``.
+
+    This is only a concurrency cap: requests are not merged into batches, each one runs
+    on its caller's thread once a slot is free. It keeps ``/transcribe``, the stream
+    endpoint and jobs from oversubscribing the model's CTranslate2 workers.
+    """
+    with _MODEL_LOCK:
+        if model_name not in _SLOTS:
+            _SLOTS[model_name] = threading.BoundedSemaphore(max(1, _MODEL_CONCURRENCY))
+        return _SLOTS[model_name]
+
+
+def _run_transcription(
+    audio_path: Path,
+    model_name: str,
+    language: Optional[str],
+    cancel: Optional[threading.Event] = None,
+):
+    """Transcribe in one of the model's slots; returns ``(text, segments)``."""
+    with _model_slots(model_name):
+        return _transcribe_now(audio_path, model_name, language, cancel)
+
+
 @app.post("/transcribe", response_model=TranscribeResponse)
 def transcribe(req: TranscribeRequest, x_api_key: Optional[str] = Header(None)):
     _check_api_key(x_api_key)
 
-    audio_path, cleanup = _resolve_audio_source(req.audio_url)
+    audio_path, cleanup, digest = _resolve_audio_source(req.audio_url)
     try:
-        text, segments = _run_transcription(audio_path, req.model, req.lang)
-        payload = TranscribeResponse(
-            text=text,
-            segments=segments,
-            hash=_sha256(audio_path),
-        )
+        return _transcribe_cached(req, audio_path, digest)
     finally:
-        if cleanup:
-            with suppress(FileNotFoundError):
-                audio_path.unlink()
+        _release_audio(audio_path, cleanup)
+
+
+def _transcribe_cached(
+    req: TranscribeRequest,
+    audio_path: Path,
+    digest: str,
+    cancel: Optional[threading.Event] = None,
+) -> TranscribeResponse:
+    """Cached result for this audio/model/language, or transcribe and cache it."""
+    cached = _cached_result(req, digest)
+    if cached is not None:
+        return cached
+    text, segments = _run_transcription(audio_path, req.model, req.lang, cancel)
+    result = TranscribeResponse(text=text, segments=segments, hash=digest)
+    _store_result(req, result)
+    return result
+
+
+@app.post("/transcribe/stream")
+def transcribe_stream(req: TranscribeRequest, x_api_key: Optional[str] = Header(None)):
+    """NDJSON: one segment per line as it is decoded, then ``{"done": true, "hash": ...}``."""
+    _check_api_key(x_api_key)
+
+    audio_path, cleanup, digest = _resolve_audio_source(req.audio_url)
+    cached = _cached_result(req, digest)
+    if cached is None:
+        try:
+            # Fail with a proper status before the response starts, not mid-stream.
+            _get_model(req.model)
+        except HTTPException:
+            _release_audio(audio_path, cleanup)
+            raise
+
+    def lines() -> Iterator[str]:
+        try:
+            if cached is not None:
+                for payload in cached.segments:
+                    yield json.dumps(payload) + "\n"
+            else:
+                decoded: List[dict] = []
+                with _model_slots(req.model):
+                    for payload in _iter_segments(audio_path, req.model, req.lang):
+                        decoded.append(payload)
+                        yield json.dumps(payload) + "\n"
+                text = " ".join(p["text"].strip() for p in decoded if p["text"]).strip()
+                _store_result(req, TranscribeResponse(text=text, segments=decoded, hash=digest))
+            yield json.dumps({"done": True, "hash": digest}) + "\n"
+        finally:
+            _release_audio(audio_path, cleanup)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+_FINAL_STATES = frozenset({"done", "failed", "cancelled"})
+
+
+class _Job:
+    def __init__(
+        self,
+        job_id: str,
+        request: TranscribeRequest,
+        status: str = "queued",
+        result: Optional[dict] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        self.id = job_id
+        self.request = request
+        self.status = status
+        self.result = result
+        self.error = error
+        self.updated = time.time()
+        self.cancel = threading.Event()
+        self.finished = threading.Event()
+        self.future: Optional[Future] = None
+        if status in _FINAL_STATES:
+            self.finished.set()
+
+    def view(self) -> JobStatus:
+        return JobStatus(id=self.id, status=self.status, result=self.result, error=self.error)
+
+
+class JobStore:
+    """Jobs by id; with ``db_path`` every state change is also written to SQLite.
+
+    The database is read once at startup, so it belongs to one service process: it
+    must not be shared between replicas.
+    """
+
+    def __init__(self, db_path: Optional[str] = None) -> None:
+        self._jobs: Dict[str, _Job] = {}
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, status TEXT NOT NULL, "
+                "request TEXT NOT NULL, result TEXT, error TEXT, updated REAL NOT NULL)"
+            )
+            self._db.commit()
+            rows = self._db.execute("SELECT id, status, request, result, error, updated FROM jobs")
+            for job_id, status, request, result, error, updated in rows.fetchall():
+                # Work interrupted by the restart starts over.
+                job = _Job(
+                    job_id,
+                    TranscribeRequest.model_validate_json(request),
+                    "queued" if status == "running" else status,
+                    json.loads(result) if result else None,
+                    error,
+                )
+                job.updated = updated
+                self._jobs[job_id] = job
+
+    def get(self, job_id: str) -> Optional[_Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def save(self, job: _Job) -> None:
+        job.updated = time.time()
+        with self._lock:
+            self._jobs[job.id] = job
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        job.id,
+                        job.status,
+                        job.request.model_dump_json(),
+                        json.dumps(job.result) if job.result is not None else None,
+                        job.error,
+                        job.updated,
+                    ),
+                )
+                self._db.commit()
+
+    def queued(self) -> List[_Job]:
+        with self._lock:
+            return [j for j in self._jobs.values() if j.status == "queued"]
+
+    def purge(self, ttl_s: float) -> None:
+        """Forget finished jobs not updated for ``ttl_s`` seconds."""
+        cutoff = time.time() - ttl_s
+        with self._lock:
+            stale = [
+                j.id
+                for j in self._jobs.values()
+                if j.status in _FINAL_STATES and j.updated < cutoff
+            ]
+            for job_id in stale:
+                del self._jobs[job_id]
+            if self._db is not None and stale:
+                self._db.executemany("DELETE FROM jobs WHERE id = ?", [(i,) for i in stale])
+                self._db.commit()
 
-    return payload
+
+class JobRunner:
+    """Runs jobs from a :class:`JobStore` on a bounded thread pool."""
+
+    def __init__(self, store: JobStore, workers: int = _JOB_WORKERS) -> None:
+        self.store = store
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="stt-job")
+        for job in store.queued():
+            self._schedule(job)
+
+    def submit(self, request: TranscribeRequest) -> _Job:
+        self.store.purge(_JOB_TTL_S)
+        if len(self.store.queued()) >= _JOB_QUEUE_MAX:
+            raise HTTPException(status_code=503, detail="Job queue is full")
+        job = _Job(uuid.uuid4().hex, request)
+        self.store.save(job)
+        self._schedule(job)
+        return job
+
+    def _schedule(self, job: _Job) -> None:
+        job.future = self._pool.submit(self._run, job)
+
+    def cancel(self, job: _Job) -> None:
+        """Queued jobs are dropped; running ones stop at the next decoded segment."""
+        if job.status in _FINAL_STATES:
+            return
+        job.cancel.set()
+        if job.future is not None and job.future.cancel():
+            self._finish(job, "cancelled")
+
+    def _finish(
+        self, job: _Job, status: str, result: Optional[dict] = None, error: Optional[str] = None
+    ) -> None:
+        job.status, job.result, job.error = status, result, error
+        self.store.save(job)
+        job.finished.set()
+
+    def _run(self, job: _Job) -> None:
+        if job.cancel.is_set():
+            self._finish(job, "cancelled")
+            return
+        job.status = "running"
+        self.store.save(job)
+        req = job.request
+        try:
+            audio_path, cleanup, digest = _resolve_audio_source(req.audio_url)
+            try:
+                result = _transcribe_cached(req, audio_path, digest, job.cancel)
+            finally:
+                _release_audio(audio_path, cleanup)
+        except _Cancelled:
+            self._finish(job, "cancelled")
+        except HTTPException as exc:
+            self._finish(job, "failed", error=str(exc.detail))
+        except Exception as exc:  # pragma: no cover - surfaced through the job status
+            self._finish(job, "failed", error=f"{type(exc).__name__}: {exc}")
+        else:
+            self._finish(job, "done", result=result.model_dump())
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+_RUNNER: Optional[JobRunner] = None
+_RUNNER_LOCK = threading.Lock()
+
+
+def _job_runner() -> JobRunner:
+    global _RUNNER
+    with _RUNNER_LOCK:
+        if _RUNNER is None:
+            _RUNNER = JobRunner(JobStore(_JOB_DB))
+        return _RUNNER
+
+
+def _get_job(job_id: str) -> _Job:
+    job = _job_runner().store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@app.post("/jobs", status_code=202, response_model=JobStatus)
+def create_job(req: TranscribeRequest, x_api_key: Optional[str] = Header(None)):
+    """Queue a transcription and return its id immediately."""
+    _check_api_key(x_api_key)
+    return _job_runner().submit(req).view()
+
+
+@app.get("/jobs/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str, wait: float = 0.0, x_api_key: Optional[str] = Header(None)):
+    """Job status; ``wait`` long-polls up to that many seconds (max 60) for it to finish.
+
+    Waiting sleeps on the event loop, so idle long-polls do not hold threadpool threads.
+    """
+    _check_api_key(x_api_key)
+    job = _get_job(job_id)
+    deadline = time.monotonic() + min(wait, _MAX_WAIT_S)
+    while not job.finished.is_set() and time.monotonic() < deadline:
+        await asyncio.sleep(_POLL_S)
+    return job.view()
+
+
+@app.delete("/jobs/{job_id}", response_model=JobStatus)
+def cancel_job(job_id: str, x_api_key: Optional[str] = Header(None)):
+    _check_api_key(x_api_key)
+    job = _get_job(job_id)
+    _job_runner().cancel(job)
+    return job.view()
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import copy
+from typing import Callable, Iterable, Optional, Union
+
+import pytest
+
+
+@pytest.fixture
+def fake_ffprobe(monkeypatch) -> Callable[..., None]:
+    """Serve canned ffprobe output: ``fake_ffprobe(duration, video=..., packets=...)``.
+
+    ``video=True`` adds a 25 fps video stream, a dict adds fields to it (e.g. width and
+    height); ``duration=None`` makes every probe fail.
+    """
+
+    def install(
+        duration: Optional[float],
+        video: Union[bool, dict] = False,
+        packets: Optional[Iterable[dict]] = None,
+    ) -> None:
+        payload: Optional[dict] = None
+        if duration is not None:
+            payload = {"format": {"duration": str(duration)}, "streams": []}
+            if video:
+                stream = {"index": 0, "codec_type": "video", "avg_frame_rate": "25/1"}
+                payload["streams"].append({**stream, **(video if isinstance(video, dict) else {})})
+            if packets is not None:
+                payload["packets"] = list(packets)
+        monkeypatch.setattr(
+            "autoedit.core.probe._run_ffprobe",
+            lambda path, keyframes=True: copy.deepcopy(payload),
+        )
+
+    return install
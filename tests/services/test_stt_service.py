@@ -2,6 +2,12 @@ from __future__ import annotations
 
 import hashlib
 import importlib.util
+import json
+import sys
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List
 
@@ -17,14 +23,17 @@ def _load_service_module():
     spec = importlib.util.spec_from_file_location("stt_service_app", MODULE_PATH)
     module = importlib.util.module_from_spec(spec)
     assert spec.loader is not None
+    # Registered so FastAPI/pydantic can resolve the module's postponed annotations.
+    sys.modules[spec.name] = module
     spec.loader.exec_module(module)  # type: ignore[assignment]
     return module
 
 
 @pytest.fixture()
-def service_module(monkeypatch):
+def service_module(monkeypatch, tmp_path):
     module = _load_service_module()
     module._MODEL_CACHE.clear()
+    monkeypatch.setattr(module, "_RESULT_CACHE_DIR", str(tmp_path / "results"))
     monkeypatch.delenv("API_KEY", raising=False)
     return module
 
@@ -44,7 +53,7 @@ def test_transcribe_local_file(service_module, tmp_path, monkeypatch):
 
     expected_hash = hashlib.sha256(b"hello world").hexdigest()
 
-    def fake_transcription(path, model_name, language):
+    def fake_transcription(path, model_name, language, cancel=None):
         assert path == audio_file
         assert model_name == "medium"
         return "synthetic text", [{"start": 0.0, "end": 1.0, "text": "segment"}]
@@ -73,7 +82,7 @@ def test_transcribe_remote_download(service_module, monkeypatch):
 
     captured_paths: List[Path] = []
 
-    def fake_transcription(path, model_name, language):
+    def fake_transcription(path, model_name, language, cancel=None):
         captured_paths.append(path)
         assert path.exists()
         return "remote", []
@@ -101,3 +110,201 @@ def test_transcribe_missing_file(service_module):
     )
     assert resp.status_code == 400
     assert resp.json()["detail"] == "Audio source not found"
+
+
+def test_transcribe_stream_emits_ndjson(service_module, tmp_path, monkeypatch):
+    audio_file = tmp_path / "clip.flac"
+    audio_file.write_bytes(b"streamed")
+
+    def fake_segments(path, model_name, language):
+        for i in range(2):
+            yield {"start": float(i), "end": i + 0.5, "text": f"s{i}"}
+
+    monkeypatch.setattr(service_module, "_get_model", lambda name: object())
+    monkeypatch.setattr(service_module, "_iter_segments", fake_segments)
+
+    client = TestClient(service_module.app)
+    resp = client.post("/transcribe/stream", json={"audio_url": str(audio_file)})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert [line.get("text") for line in lines[:-1]] == ["s0", "s1"]
+    assert lines[-1] == {"done": True, "hash": hashlib.sha256(b"streamed").hexdigest()}
+
+
+def test_job_lifecycle(service_module, tmp_path, monkeypatch):
+    audio_file = tmp_path / "clip.flac"
+    audio_file.write_bytes(b"queued audio")
+
+    def fake_segments(path, model_name, language):
+        yield {"start": 0.0, "end": 1.0, "text": " hi "}
+
+    monkeypatch.setattr(service_module, "_iter_segments", fake_segments)
+    client = TestClient(service_module.app)
+
+    resp = client.post("/jobs", json={"audio_url": str(audio_file)})
+    assert resp.status_code == 202
+    job_id = resp.json()["id"]
+
+    status = client.get(f"/jobs/{job_id}", params={"wait": 5}).json()
+    assert status["status"] == "done"
+    assert status["result"]["text"] == "hi"
+    assert status["result"]["hash"] == hashlib.sha256(b"queued audio").hexdigest()
+    assert client.get("/jobs/unknown").status_code == 404
+
+
+def test_cancel_running_job(service_module, tmp_path, monkeypatch):
+    audio_file = tmp_path / "clip.flac"
+    audio_file.write_bytes(b"long audio")
+    started, release = threading.Event(), threading.Event()
+
+    def slow_segments(path, model_name, language):
+        started.set()
+        release.wait(5)
+        for i in range(100):
+            yield {"start": float(i), "end": i + 1.0, "text": "word"}
+
+    monkeypatch.setattr(service_module, "_iter_segments", slow_segments)
+    client = TestClient(service_module.app)
+
+    job_id = client.post("/jobs", json={"audio_url": str(audio_file)}).json()["id"]
+    assert started.wait(5)
+    assert client.delete(f"/jobs/{job_id}").status_code == 200
+    release.set()
+    assert client.get(f"/jobs/{job_id}", params={"wait": 5}).json()["status"] == "cancelled"
+
+
+def test_job_store_requeues_interrupted_jobs(service_module, tmp_path):
+    db = str(tmp_path / "jobs.sqlite")
+    store = service_module.JobStore(db)
+    request = service_module.TranscribeRequest(audio_url="/tmp/a.flac")
+    for job_id, status in (("a", "queued"), ("b", "running"), ("c", "done")):
+        store.save(service_module._Job(job_id, request, status=status))
+
+    reopened = service_module.JobStore(db)
+    assert sorted(j.id for j in reopened.queued()) == ["a", "b"]
+    assert reopened.get("c").status == "done"
+
+
+def test_model_slots_cap_concurrent_transcriptions(service_module, monkeypatch):
+    lock = threading.Lock()
+    state = {"in_flight": 0, "peak": 0}
+
+    def fake_transcribe(path, model_name, language, cancel=None):
+        with lock:
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+        time.sleep(0.05)
+        with lock:
+            state["in_flight"] -= 1
+        return str(path), []
+
+    monkeypatch.setattr(service_module, "_transcribe_now", fake_transcribe)
+    monkeypatch.setattr(service_module, "_MODEL_CONCURRENCY", 2)
+    monkeypatch.setattr(service_module, "_SLOTS", {})
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        results = list(
+            pool.map(
+                lambda i: service_module._run_transcription(
+                    Path(f"/audio/{i}.flac"), "small", None
+                ),
+                range(6),
+            )
+        )
+
+    assert [text for text, _ in results] == [f"/audio/{i}.flac" for i in range(6)]
+    assert state["peak"] == 2
+
+
+def _fake_faster_whisper(monkeypatch, calls: list):
+    segment = types.SimpleNamespace(start=0.25, end=1.5, text=" hi")
+
+    class WhisperModel:
+        def __init__(self, name, **kwargs):
+            calls.append(("load", name, kwargs))
+
+        def transcribe(self, audio, **kwargs):
+            calls.append(("model", kwargs))
+            return iter([segment]), None
+
+    class BatchedInferencePipeline:
+        def __init__(self, model):
+            self.model = model
+
+        def transcribe(self, audio, **kwargs):
+            calls.append(("batched", kwargs))
+            return iter([segment]), None
+
+    module = types.ModuleType("faster_whisper")
+    module.WhisperModel = WhisperModel
+    module.BatchedInferencePipeline = BatchedInferencePipeline
+    monkeypatch.setitem(sys.modules, "faster_whisper", module)
+
+
+def test_batched_pipeline_keeps_segment_timestamps(service_module, monkeypatch):
+    calls: list = []
+    _fake_faster_whisper(monkeypatch, calls)
+    service_module._PIPELINE_CACHE.clear()
+
+    segments = list(service_module._iter_segments(Path("/a.flac"), "small", "en"))
+    assert segments == [{"start": 0.25, "end": 1.5, "text": " hi"}]
+    assert calls[0] == ("load", "small", {"device": "auto", "num_workers": 1})
+    assert calls[1] == (
+        "batched",
+        {
+            "language": "en",
+            "batch_size": service_module._BATCH_SIZE,
+            "vad_filter": True,
+            "without_timestamps": False,
+        },
+    )
+
+    # BATCH_SIZE=0 decodes with the plain model instead.
+    monkeypatch.setattr(service_module, "_BATCH_SIZE", 0)
+    list(service_module._iter_segments(Path("/a.flac"), "small", "en"))
+    assert calls[-1] == ("model", {"language": "en"})
+
+
+@respx.mock
+def test_duplicate_audio_served_from_result_cache(service_module, monkeypatch):
+    content = b"same bytes"
+    respx.get("https://example.com/a.flac").mock(return_value=httpx.Response(200, content=content))
+    respx.get("https://example.com/b.flac").mock(return_value=httpx.Response(200, content=content))
+    calls = []
+
+    def fake_transcription(path, model_name, language, cancel=None):
+        calls.append(path)
+        return "cached text", [{"start": 0.0, "end": 1.0, "text": "cached text"}]
+
+    def no_model(name):
+        raise AssertionError("a cache hit must not touch the model")
+
+    monkeypatch.setattr(service_module, "_run_transcription", fake_transcription)
+    client = TestClient(service_module.app)
+
+    first = client.post("/transcribe", json={"audio_url": "https://example.com/a.flac"})
+    monkeypatch.setattr(service_module, "_get_model", no_model)
+    second = client.post("/transcribe", json={"audio_url": "https://example.com/b.flac"})
+    assert first.json() == second.json()
+    assert second.json()["hash"] == hashlib.sha256(content).hexdigest()
+    assert len(calls) == 1
+
+    # Another language is a different result; the stream endpoint replays cached segments.
+    client.post("/transcribe", json={"audio_url": "https://example.com/a.flac", "lang": "fr"})
+    assert len(calls) == 2
+    lines = client.post("/transcribe/stream", json={"audio_url": "https://example.com/b.flac"})
+    assert [json.loads(line).get("text") for line in lines.text.splitlines()] == [
+        "cached text",
+        None,
+    ]
+
+
+def test_result_cache_evicts_least_recently_used(service_module, tmp_path):
+    cache = service_module.ResultCache(tmp_path / "lru", max_bytes=200)  # ~86 bytes per entry
+    result = service_module.TranscribeResponse(text="x" * 50, segments=[], hash="h")
+    for key in ("aa1", "bb2", "cc3"):
+        cache.put(key, result)
+        time.sleep(0.01)
+    assert cache.get("aa1") is None
+    assert cache.get("bb2") is not None and cache.get("cc3") is not None
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+from autoedit.backends.local.chunking import merge_chunk_segments, plan_chunks
+from autoedit.backends.local.models import ModelRegistry
+from autoedit.backends.local.transcriber import LocalTranscriber
+from autoedit.core import vad as vad_module
+from autoedit.schemas.transcript import TranscriptSegment
+
+np = pytest.importorskip("numpy")
+
+
+def test_plan_chunks_cuts_in_silence():
+    frame_s = 0.5
+    energy = np.full(100, -10.0)  # 50 s of speech
+    energy[[15, 37, 70]] = -90.0  # pauses at 7.5 s, 18.5 s and 35 s
+    chunks = plan_chunks(energy, frame_s, max_chunk_s=20.0, search_s=8.0)
+    assert chunks == [(0.0, 18.5), (18.5, 35.0), (35.0, 50.0)]
+    assert plan_chunks(energy, frame_s, max_chunk_s=60.0) == [(0.0, 50.0)]
+
+
+def test_merge_chunk_segments_offsets_and_dedups():
+    seg = TranscriptSegment
+    merged = merge_chunk_segments(
+        [
+            (0.0, [seg(start=0.0, end=2.0, text="Hello."), seg(start=8.0, end=9.5, text="Bye")]),
+            (10.0, [seg(start=0.0, end=0.4, text=" bye"), seg(start=1.0, end=2.0, text="Next")]),
+        ]
+    )
+    assert [(s.start, s.end, s.text) for s in merged] == [
+        (0.0, 2.0, "Hello."),
+        (8.0, 10.4, "Bye"),
+        (11.0, 12.0, "Next"),
+    ]
+
+
+def test_chunked_transcription_merges_chunks_on_one_timeline(tmp_path: Path, monkeypatch):
+    rate = vad_module.VAD_SAMPLE_RATE
+    signal = np.full(rate * 30, 0.2, dtype=np.float32)
+    signal[rate * 9 : rate * 11] = 0.0  # silence around 10 s
+    signal[rate * 19 : rate * 21] = 0.0  # and around 20 s
+
+    monkeypatch.setattr(vad_module, "run_tool", lambda cmd: signal.tofile(cmd[-1]) or 0)
+    monkeypatch.setitem(sys.modules, "faster_whisper", types.ModuleType("faster_whisper"))
+
+    calls = []
+
+    class FakeModel:
+        def transcribe(self, audio, language=None):
+            calls.append((len(audio), language))
+            seconds = len(audio) / rate
+            seg = types.SimpleNamespace(start=0.5, end=seconds - 0.5, text=f"{seconds:.0f}s")
+            return iter([seg]), types.SimpleNamespace(language="fr")
+
+    loads = []
+    registry = ModelRegistry(loader=lambda *key, **opts: loads.append((key, opts)) or FakeModel())
+    audio = tmp_path / "main.flac"
+    audio.write_bytes(b"flac")
+    transcriber = LocalTranscriber(
+        model="small", registry=registry, workers=2, cpu_threads=3, chunk_length=12.0
+    )
+    transcript = transcriber.transcribe(audio)
+
+    assert loads == [(("small", "auto", "default"), {"cpu_threads": 3, "num_workers": 2})]
+    assert sum(n for n, _ in calls) == len(signal)
+    assert [lang for _, lang in calls] == [None, "fr", "fr"]
+    starts = [s.start for s in transcript.segments]
+    assert len(starts) == 3 and 9.0 <= starts[1] - 0.5 <= 11.0 and 19.0 <= starts[2] - 0.5 <= 21.0
+
+    # A known language skips detection: every chunk, the first included, goes to the pool.
+    calls.clear()
+    again = transcriber.transcribe(audio, language="de")
+    assert [lang for _, lang in calls] == ["de", "de", "de"]
+    assert [s.start for s in again.segments] == starts
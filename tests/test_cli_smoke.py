@@ -16,7 +16,7 @@ runner = CliRunner()
 
 
 @pytest.fixture()
-def cli_env(tmp_path, monkeypatch):
+def cli_env(tmp_path, monkeypatch, fake_ffprobe):
     run_dir = tmp_path / "run"
     selection_path = run_dir / "artifacts" / "selection.json"
     mlt_path = run_dir / "outputs" / "edit.mlt"
@@ -26,13 +26,13 @@ def cli_env(tmp_path, monkeypatch):
 
     from autoedit.core import ingest as ingest_module
 
-    def fake_run(cmd):
+    def fake_run(cmd, quiet=True):
         audio_target.parent.mkdir(parents=True, exist_ok=True)
         audio_target.write_bytes(b"FAKE")
         return 0
 
-    monkeypatch.setattr(ingest_module, "_run", fake_run)
-    monkeypatch.setattr(ingest_module, "_ffprobe_duration", lambda _: 5.0)
+    monkeypatch.setattr(ingest_module, "run_tool", fake_run)
+    fake_ffprobe(5.0)
 
     from autoedit.core import scene_detect as scene_module
 
@@ -151,6 +151,29 @@ def test_pipeline_command(cli_env):
     assert "mlt" in content.lower()
 
 
+def test_pipeline_vad_speech_skips_transcription(cli_env, monkeypatch):
+    from autoedit.backends.local.transcriber import LocalTranscriber
+
+    def no_stt(*args, **kwargs):
+        raise AssertionError("--speech-source vad must not transcribe")
+
+    vad_calls = []
+    monkeypatch.setattr(LocalTranscriber, "transcribe", no_stt)
+    monkeypatch.setattr(LocalTranscriber, "prewarm", no_stt)
+    monkeypatch.setattr(
+        "autoedit.cli.main._run_vad", lambda audio, output: vad_calls.append(output)
+    )
+    run_dir = cli_env["run_dir"]
+
+    result = runner.invoke(
+        app,
+        ["pipeline", str(cli_env["sample_file"]), "-o", str(run_dir), "--speech-source", "vad"],
+    )
+    assert result.exit_code == 0, result.output
+    assert vad_calls and cli_env["selection_path"].exists()
+    assert not (run_dir / "artifacts" / "transcript.json").exists()
+
+
 def test_pipeline_lightning_upload(cli_env, monkeypatch):
     run_dir = cli_env["run_dir"]
     selection_path = cli_env["selection_path"]
@@ -21,3 +21,14 @@ def test_mlt_multisource(tmp_path: Path):
     assert xml.count('<producer id="producer1">') == 1
     # three entries
     assert xml.count("<entry producer=") == 3
+
+
+def test_mlt_fractional_fps_profile_matches_frames(tmp_path: Path):
+    from fractions import Fraction
+
+    sel = Selection(shots=[Segment(start=100.0, end=101.0, source="/a.mp4")])
+    out = tmp_path / "edit.mlt"
+    export_mlt(sel, out, fps=Fraction(30000, 1001))
+    xml = out.read_text()
+    assert 'frame_rate_num="30000"' in xml and 'frame_rate_den="1001"' in xml
+    assert 'in="2997"' in xml
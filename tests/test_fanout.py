@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+import pytest
+import requests
+
+from autoedit.backends.lightning import fanout as fanout_module
+from autoedit.backends.lightning.fanout import plan_audio_chunks, transcribe_fanout
+from autoedit.backends.lightning.transcriber import LightningConfig, LightningTranscriber
+from autoedit.core import vad as vad_module
+
+np = pytest.importorskip("numpy")
+
+
+class FakeResponse:
+    status_code = 200
+    headers: dict = {}
+
+    def __init__(self, payload: dict) -> None:
+        self._payload = payload
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def json(self) -> dict:
+        return self._payload
+
+
+def test_fanout_uploads_chunks_and_stitches_timeline(tmp_path: Path, monkeypatch):
+    rate = vad_module.VAD_SAMPLE_RATE
+    signal = np.full(rate * 30, 0.2, dtype=np.float32)
+    signal[rate * 9 : rate * 11] = 0.0
+    signal[rate * 19 : rate * 21] = 0.0
+    monkeypatch.setattr(vad_module, "run_tool", lambda cmd: signal.tofile(cmd[-1]) or 0)
+
+    cuts = {}
+
+    def fake_ffmpeg(cmd):
+        dest = Path(cmd[-1])
+        dest.write_bytes(b"flac")
+        cuts[dest.name] = (float(cmd[cmd.index("-ss") + 1]), float(cmd[cmd.index("-t") + 1]))
+        return 0
+
+    monkeypatch.setattr(fanout_module, "run_tool", fake_ffmpeg)
+
+    lock = threading.Lock()
+    keys = []
+
+    def fake_post(self, url, json=None, headers=None, **kwargs):
+        with lock:
+            keys.append(headers["X-API-Key"])
+        name = json["audio_url"].rsplit("/", 1)[-1]
+        length = cuts[name][1]
+        segment = {"start": 0.5, "end": length - 0.5, "text": name}
+        return FakeResponse({"text": name, "segments": [segment], "hash": None})
+
+    monkeypatch.setattr(requests.Session, "post", fake_post)
+
+    uploaded = []
+
+    def upload(path: Path) -> str:
+        assert path.exists()
+        uploaded.append(path.name)
+        return f"https://bucket.example/{path.name}"
+
+    audio = tmp_path / "main.flac"
+    audio.write_bytes(b"flac")
+    chunks = plan_audio_chunks(audio, chunk_length=12.0)
+    assert len(chunks) == 3
+
+    transcriber = LightningTranscriber(
+        LightningConfig(base_url="https://beam.example", api_keys=["a", "b", "c"])
+    )
+    transcript = transcribe_fanout(transcriber, audio, chunks, upload, model="small")
+
+    assert sorted(uploaded) == ["main.0000.flac", "main.0001.flac", "main.0002.flac"]
+    assert sorted(keys) == ["a", "b", "c"]
+    assert [s.text for s in transcript.segments] == sorted(uploaded)
+    for segment, (start, _) in zip(transcript.segments, chunks):
+        assert segment.start == pytest.approx(start + 0.5)
+    assert transcript.segments[-1].end == pytest.approx(29.5, abs=0.05)
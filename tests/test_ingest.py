@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+from autoedit.core import ingest as ingest_module
+
+
+def test_ingest_extracts_audio_for_every_input(tmp_path: Path, monkeypatch, fake_ffprobe):
+    def fake_run(cmd, quiet=True):
+        Path(cmd[-1]).write_bytes(b"FLAC:" + Path(cmd[cmd.index("-i") + 1]).name.encode())
+        return 0
+
+    monkeypatch.setattr(ingest_module, "run_tool", fake_run)
+    fake_ffprobe(3.0)
+
+    inputs = []
+    for name in ["a.mp4", "b.mp4", "a.mov", "main.mp4"]:
+        p = tmp_path / "src" / name
+        p.parent.mkdir(exist_ok=True)
+        p.write_bytes(name.encode())
+        inputs.append(p)
+
+    run_dir = tmp_path / "run"
+    ingest_module.ingest_media(inputs, run_dir, workers=4)
+
+    audio_dir = run_dir / "audio"
+    assert sorted(p.name for p in audio_dir.iterdir()) == [
+        "a-1.flac",
+        "a.flac",
+        "b.flac",
+        "main-1.flac",
+        "main.flac",
+    ]
+    assert (audio_dir / "main.flac").read_bytes() == b"FLAC:a.mp4"
+
+    db = json.loads((run_dir / "artifacts" / "media.db.json").read_text())
+    assert db["inputs"] == [str(run_dir / "raw" / p.name) for p in inputs]
+    assert db["audio"][str(run_dir / "raw" / "a.mov")] == str(audio_dir / "a-1.flac")
+    assert set(db["durations"].values()) == {3.0}
+
+
+def test_ingest_keeps_inputs_with_the_same_basename(tmp_path: Path, monkeypatch, fake_ffprobe):
+    monkeypatch.setattr(ingest_module, "run_tool", lambda cmd, quiet=True: 1)
+    fake_ffprobe(None)
+
+    inputs = []
+    for folder in ["day1", "day2", "day3"]:
+        p = tmp_path / folder / "clip.mp4"
+        p.parent.mkdir()
+        p.write_bytes(folder.encode())
+        inputs.append(p)
+
+    run_dir = tmp_path / "run"
+    ingest_module.ingest_media(inputs, run_dir, workers=3)
+
+    raw_dir = run_dir / "raw"
+    names = ["clip.mp4", "clip-1.mp4", "clip-2.mp4"]
+    assert [(raw_dir / n).read_bytes() for n in names] == [b"day1", b"day2", b"day3"]
+    db = json.loads((run_dir / "artifacts" / "media.db.json").read_text())
+    assert db["inputs"] == [str(raw_dir / n) for n in names]
+
+
+def test_stream_ingest_tees_single_read(tmp_path: Path, monkeypatch, fake_ffprobe):
+    # Stand-in for ffmpeg that dumps whatever it receives on stdin to the output path.
+    def fake_audio_cmd(src, audio_out):
+        assert src == "pipe:0"
+        code = "import sys; open(sys.argv[1], 'wb').write(sys.stdin.buffer.read())"
+        return [sys.executable, "-c", code, str(audio_out)]
+
+    def fail_run(cmd, quiet=True):
+        raise AssertionError("streaming ingest must not re-run ffmpeg on the copy")
+
+    monkeypatch.setattr(ingest_module, "_audio_cmd", fake_audio_cmd)
+    monkeypatch.setattr(ingest_module, "run_tool", fail_run)
+    monkeypatch.setattr(ingest_module, "STREAM_CHUNK_SIZE", 1000)
+    fake_ffprobe(None)
+
+    src = tmp_path / "clip.mp4"
+    payload = bytes(range(256)) * 100
+    src.write_bytes(payload)
+    run_dir = tmp_path / "run"
+    ingest_module.ingest_media([src], run_dir, cache_dir=tmp_path / "cache", stream=True)
+
+    assert (run_dir / "raw" / "clip.mp4").read_bytes() == payload
+    assert (run_dir / "audio" / "clip.flac").read_bytes() == payload
+    assert (run_dir / "raw" / "clip.mp4").stat().st_mtime_ns == src.stat().st_mtime_ns
+    db = json.loads((run_dir / "artifacts" / "media.db.json").read_text())
+    assert db["hashes"][str(run_dir / "raw" / "clip.mp4")] == hashlib.sha256(payload).hexdigest()
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+from autoedit.core import ingest as ingest_module
+from autoedit.core.cache import DiskCache, IngestCache, cache_key
+from autoedit.core.fsutil import hash_file, link_or_copy
+from autoedit.core.scene_cache import SceneCache
+from autoedit.core.transcript_cache import TranscriptCache
+
+
+def _fake_tools(monkeypatch, calls: dict):
+    def fake_run(cmd, quiet=True):
+        calls["ffmpeg"] = calls.get("ffmpeg", 0) + 1
+        Path(cmd[-1]).write_bytes(b"FLAC")
+        return 0
+
+    def fake_probe(path, keyframes=True):
+        calls["ffprobe"] = calls.get("ffprobe", 0) + 1
+        return {"format": {"duration": "12.5"}, "streams": []}
+
+    monkeypatch.setattr(ingest_module, "run_tool", fake_run)
+    monkeypatch.setattr("autoedit.core.probe._run_ffprobe", fake_probe)
+
+
+def test_reingest_reuses_cache(tmp_path: Path, monkeypatch):
+    calls: dict = {}
+    _fake_tools(monkeypatch, calls)
+    src = tmp_path / "clip.mp4"
+    src.write_bytes(b"x" * 4096)
+    cache_dir = tmp_path / "cache"
+
+    ingest_module.ingest_media([src], tmp_path / "run1", cache_dir=cache_dir)
+    assert calls == {"ffmpeg": 1, "ffprobe": 1}
+
+    ingest_module.ingest_media([src], tmp_path / "run2", cache_dir=cache_dir)
+    assert calls == {"ffmpeg": 1, "ffprobe": 1}, "second ingest must not transcode or probe"
+
+    run2 = tmp_path / "run2"
+    assert (run2 / "raw" / "clip.mp4").read_bytes() == src.read_bytes()
+    assert (run2 / "audio" / "main.flac").read_bytes() == b"FLAC"
+    db = json.loads((run2 / "artifacts" / "media.db.json").read_text())
+    assert db["durations"][str(run2 / "raw" / "clip.mp4")] == 12.5
+    assert db["hashes"][str(run2 / "raw" / "clip.mp4")] == hash_file(src)
+    # The raw/ copies are indexed too, so the scene cache never re-hashes them.
+    index = IngestCache(cache_dir)
+    for run in (tmp_path / "run1", run2):
+        assert index.known_digest(run / "raw" / "clip.mp4") == hash_file(src)
+
+
+def test_cache_matches_renamed_content(tmp_path: Path):
+    cache = IngestCache(tmp_path / "cache")
+    a = tmp_path / "a.mov"
+    b = tmp_path / "b.mov"
+    a.write_bytes(b"same bytes")
+    b.write_bytes(b"same bytes")
+    digest = cache.digest(a)
+    cache.put_probe(digest, {"duration": 1.0})
+    assert cache.lookup(cache.digest(b)).probe == {"duration": 1.0}
+
+
+def test_index_is_shared_and_merged_on_write(tmp_path: Path):
+    root = tmp_path / "cache"
+    scenes = SceneCache(root)
+    transcripts = TranscriptCache(root)
+    assert scenes._hashes is transcripts._hashes is IngestCache.shared(root)
+
+    a = tmp_path / "a.mov"
+    b = tmp_path / "b.mov"
+    a.write_bytes(b"first")
+    b.write_bytes(b"second")
+    # Two processes' views of the same root: each write keeps the other's entries.
+    first, second = IngestCache(root), IngestCache(root)
+    # Both load the (empty) index before either writes.
+    assert first.known_digest(a) is None
+    assert second.known_digest(b) is None
+    first.remember(a, hash_file(a))
+    second.remember(b, hash_file(b))
+    fresh = IngestCache(root)
+    assert fresh.known_digest(a) == hash_file(a)
+    assert fresh.known_digest(b) == hash_file(b)
+
+
+def test_link_or_copy_falls_back(tmp_path: Path, monkeypatch):
+    def no_link(src, dst):
+        raise OSError("cross-device link")
+
+    monkeypatch.setattr("autoedit.core.fsutil.os.link", no_link)
+    src = tmp_path / "src.bin"
+    src.write_bytes(b"data")
+    dest = tmp_path / "out" / "dest.bin"
+    mode = link_or_copy(src, dest, modes=("hardlink", "copy"))
+    assert mode == "copy"
+    assert dest.read_bytes() == b"data"
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path: Path):
+    cache = DiskCache(tmp_path / "blobs", max_bytes=250)
+    keys = [cache_key("k", i) for i in range(3)]
+    for i, key in enumerate(keys[:2]):
+        cache.put(key, {"v": "x" * 80})
+        path = tmp_path / "blobs" / key[:2] / f"{key}.json"
+        os.utime(path, ns=(i * 10**9, i * 10**9))
+
+    assert cache.get(keys[0]) == {"v": "x" * 80}  # refreshes keys[0]
+    cache.put(keys[2], {"v": "x" * 80})
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None and cache.get(keys[2]) is not None
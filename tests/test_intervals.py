@@ -0,0 +1,43 @@
+import random
+
+import pytest
+
+from autoedit.core.intervals import IntervalIndex
+
+
+def _overlaps(a_start, a_end, b_start, b_end):
+    return max(a_start, b_start) < min(a_end, b_end)
+
+
+def test_interval_index_matches_pairwise_scan():
+    rng = random.Random(0)
+    speech = [(s, s + rng.uniform(0.0, 2.0)) for s in (rng.uniform(0, 50) for _ in range(60))]
+    speech += [(10.0, 11.0), (11.0, 12.0), (20.0, 20.0)]
+    index = IntervalIndex(speech)
+    for _ in range(500):
+        start = rng.uniform(0, 55)
+        end = start + rng.choice([0.0, rng.uniform(0, 3)])
+        expected = any(_overlaps(start, end, a, b) for a, b in speech)
+        assert index.overlaps(start, end) == expected
+
+
+def test_interval_index_coverage():
+    index = IntervalIndex([(1.0, 2.0), (1.5, 3.0), (5.0, 6.0), (4.0, 4.0)])
+    assert list(zip(index.starts, index.ends)) == [(1.0, 3.0), (5.0, 6.0)]
+    assert index.total == 3.0
+    assert index.coverage(0.0, 10.0) == 3.0
+    assert index.coverage(2.5, 5.5) == 1.0
+    assert index.coverage(3.0, 5.0) == 0.0
+    assert not index.overlaps(3.0, 5.0)
+
+
+def test_coverage_many_matches_scalar():
+    np = pytest.importorskip("numpy")
+    rng = random.Random(1)
+    index = IntervalIndex(
+        (s, s + rng.uniform(0, 3)) for s in (rng.uniform(0, 40) for _ in range(30))
+    )
+    starts = np.array([rng.uniform(-5, 45) for _ in range(200)])
+    ends = starts + np.array([rng.choice([0.0, rng.uniform(0, 6)]) for _ in range(200)])
+    expected = [index.coverage(s, e) for s, e in zip(starts, ends)]
+    assert np.allclose(index.coverage_many(starts, ends), expected)
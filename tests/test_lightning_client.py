@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+import requests
+
+from autoedit.backends.lightning import transcriber as transcriber_module
+from autoedit.backends.lightning.health import KeyPool
+from autoedit.backends.lightning.transcriber import LightningConfig, LightningTranscriber
+
+
+class FakeResponse:
+    def __init__(self, payload: dict, status_code: int = 200, headers=None) -> None:
+        self._payload = payload
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error")
+
+    def close(self) -> None:
+        pass
+
+    def json(self) -> dict:
+        return self._payload
+
+
+def test_transcribe_many_runs_concurrently_across_keys(monkeypatch):
+    lock = threading.Lock()
+    state = {"in_flight": 0, "peak": 0}
+    keys_used = []
+    sessions = set()
+
+    def fake_post(self, url, json=None, headers=None, **kwargs):
+        sessions.add(id(self))
+        with lock:
+            keys_used.append(headers["X-API-Key"])
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+        # Later URLs finish first, so completion order differs from submission order.
+        time.sleep(0.05 * (4 - int(json["audio_url"][-1])))
+        with lock:
+            state["in_flight"] -= 1
+        return FakeResponse({"text": json["audio_url"], "segments": [], "hash": None})
+
+    monkeypatch.setattr(requests.Session, "post", fake_post)
+    transcriber = LightningTranscriber(
+        LightningConfig(base_url="https://beam.example", api_keys=["a", "b"])
+    )
+    urls = [f"https://cdn.example/chunk{i}" for i in range(4)]
+
+    results = list(transcriber.transcribe_many(urls))
+
+    assert sorted(i for i, _ in results) == [0, 1, 2, 3]
+    assert all(t.text == urls[i] for i, t in results)
+    assert [i for i, _ in results][0] != 0
+    assert state["peak"] == 2  # one request in flight per key by default
+    assert sorted(keys_used) == ["a", "a", "b", "b"]
+    assert len(sessions) == 1
+
+
+def test_key_pool_prefers_fast_keys_and_opens_circuit():
+    now = [0.0]
+    pool = KeyPool(["fast", "slow"], failure_threshold=2, cooldown_s=10.0, clock=lambda: now[0])
+
+    first, second = pool.acquire(), pool.acquire()
+    assert {first.key, second.key} == {"fast", "slow"}
+    pool.release(first if first.key == "fast" else second, 0.1, ok=True)
+    pool.release(second if first.key == "fast" else first, 2.0, ok=True)
+    assert [pool.acquire().key for _ in range(2)] == ["fast", "fast"]
+
+    fast = next(h for h in pool._health if h.key == "fast")
+    pool.release(fast, 0.1, ok=False)
+    pool.release(fast, 0.1, ok=False)  # second consecutive failure opens the circuit
+    assert pool.acquire().key == "slow"
+    assert pool.wait_time() == 0.0
+
+    # Every key cooling down: the one that recovers first is used.
+    slow = next(h for h in pool._health if h.key == "slow")
+    slow.cooldown_until = 20.0
+    assert pool.wait_time() == 10.0
+    assert pool.acquire().key == "fast"
+    now[0] = 11.0
+    pool.release(fast, 0.1, ok=True)  # one success closes the circuit
+    assert fast.cooldown_until == 0.0 and fast.trips == 0
+
+
+def test_retry_after_cools_down_single_key():
+    now = [0.0]
+    pool = KeyPool(["only"], clock=lambda: now[0])
+    pool.release(pool.acquire(), 0.2, ok=False, retry_after=5.0)
+    assert pool.wait_time() == 5.0
+    assert pool.acquire().key == "only"  # nothing else to use
+
+
+def test_transcribe_url_retries_throttled_key_on_another(monkeypatch):
+    calls = []
+
+    def fake_post(self, url, json=None, headers=None, **kwargs):
+        calls.append(headers["X-API-Key"])
+        if headers["X-API-Key"] == "busy":
+            return FakeResponse({}, status_code=429, headers={"Retry-After": "30"})
+        return FakeResponse({"text": "ok", "segments": []})
+
+    sleeps = []
+    monkeypatch.setattr(requests.Session, "post", fake_post)
+    monkeypatch.setattr(transcriber_module, "_sleep", sleeps.append)
+    transcriber = LightningTranscriber(
+        LightningConfig(base_url="https://beam.example", api_keys=["busy", "idle"])
+    )
+
+    assert transcriber.transcribe_url("https://cdn.example/a.flac").text == "ok"
+    assert transcriber.transcribe_url("https://cdn.example/b.flac").text == "ok"
+    assert calls == ["busy", "idle", "idle"]  # the throttled key cools down for 30 s
+    assert len(sleeps) == 1 and sleeps[0] <= transcriber.config.backoff_s
+
+
+def test_transcribe_url_gives_up_after_retries(monkeypatch):
+    statuses = iter([503, 503, 400])
+
+    def fake_post(self, url, json=None, headers=None, **kwargs):
+        return FakeResponse({}, status_code=next(statuses))
+
+    monkeypatch.setattr(requests.Session, "post", fake_post)
+    monkeypatch.setattr(transcriber_module, "_sleep", lambda s: None)
+    transcriber = LightningTranscriber(
+        LightningConfig(base_url="https://beam.example", api_key="k", max_retries=5)
+    )
+
+    # 5xx are retried; a plain 4xx is the request's fault and raises straight away.
+    with pytest.raises(requests.HTTPError, match="400"):
+        transcriber.transcribe_url("https://cdn.example/a.flac")
+    assert transcriber.keys.snapshot()[0]["in_flight"] == 0
+
+
+def test_transcribe_url_long_polls_job_api(monkeypatch):
+    polls = []
+
+    def fake_post(self, url, json=None, headers=None, **kwargs):
+        assert url.endswith("/jobs")
+        return FakeResponse({"id": "j1", "status": "queued"}, status_code=202)
+
+    def fake_get(self, url, headers=None, params=None, **kwargs):
+        polls.append(params["wait"])
+        if len(polls) < 2:
+            return FakeResponse({"id": "j1", "status": "running"})
+        result = {"text": "done", "segments": [{"start": 0, "end": 1, "text": "done"}]}
+        return FakeResponse({"id": "j1", "status": "done", "result": result})
+
+    monkeypatch.setattr(requests.Session, "post", fake_post)
+    monkeypatch.setattr(requests.Session, "get", fake_get)
+    transcriber = LightningTranscriber(
+        LightningConfig(base_url="https://beam.example", use_jobs=True, job_wait_s=5.0)
+    )
+
+    transcript = transcriber.transcribe_url("https://cdn.example/a.flac")
+    assert transcript.text == "done" and len(transcript.segments) == 1
+    assert polls == [5.0, 5.0]
+    assert transcriber.keys.snapshot()[0]["latency_ewma"] is not None  # from the POST only
+
+
+def test_failed_job_raises(monkeypatch):
+    monkeypatch.setattr(
+        requests.Session,
+        "post",
+        lambda self, url, **kw: FakeResponse({"id": "j1", "status": "failed", "error": "boom"}),
+    )
+    transcriber = LightningTranscriber(
+        LightningConfig(base_url="https://beam.example", use_jobs=True)
+    )
+    with pytest.raises(RuntimeError, match="boom"):
+        transcriber.transcribe_url("https://cdn.example/a.flac")
+
+
+def test_post_read_timeout_is_not_retried(monkeypatch):
+    calls = []
+
+    def fake_post(self, url, json=None, headers=None, **kwargs):
+        calls.append(url)
+        raise requests.ReadTimeout("read timed out")
+
+    monkeypatch.setattr(requests.Session, "post", fake_post)
+    monkeypatch.setattr(transcriber_module, "_sleep", lambda s: None)
+    transcriber = LightningTranscriber(LightningConfig(base_url="https://beam.example"))
+
+    with pytest.raises(requests.ReadTimeout):
+        transcriber.transcribe_url("https://cdn.example/long.flac")
+    assert len(calls) == 1  # a retry would start a second transcription
+    health = transcriber.keys.snapshot()[0]
+    assert health["in_flight"] == 0 and health["error_rate"] == 0.0
+
+
+def test_post_connect_failure_is_retried(monkeypatch):
+    calls = []
+
+    def fake_post(self, url, json=None, headers=None, **kwargs):
+        calls.append(url)
+        if len(calls) == 1:
+            raise requests.ConnectTimeout("connect timed out")
+        return FakeResponse({"text": "ok", "segments": []})
+
+    monkeypatch.setattr(requests.Session, "post", fake_post)
+    monkeypatch.setattr(transcriber_module, "_sleep", lambda s: None)
+    transcriber = LightningTranscriber(LightningConfig(base_url="https://beam.example"))
+
+    assert transcriber.transcribe_url("https://cdn.example/a.flac").text == "ok"
+    assert len(calls) == 2
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+import types
+from pathlib import Path
+
+from autoedit.backends.local.models import ModelRegistry, estimate_model_bytes
+from autoedit.backends.local.transcriber import LocalTranscriber
+
+MB = 1024 * 1024
+
+
+def test_concurrent_gets_load_once():
+    loads = []
+
+    def slow_loader(model, device, compute_type):
+        loads.append(model)
+        time.sleep(0.05)
+        return object()
+
+    registry = ModelRegistry(loader=slow_loader)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(registry.get("small"))) for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert loads == ["small"]
+    assert len({id(r) for r in results}) == 1
+
+
+def test_lru_eviction_under_budget():
+    budget = estimate_model_bytes("small") + estimate_model_bytes("base")
+    registry = ModelRegistry(budget_bytes=budget, loader=lambda *key: key)
+    registry.get("small")
+    registry.get("base")
+    registry.get("small")  # base is now least recently used
+    registry.get("tiny")
+    assert [k[0] for k in registry.loaded()] == ["small", "tiny"]
+
+    # A model larger than the budget is still served, evicting everything else.
+    registry.get("large-v3", "cpu", "int8")
+    assert list(registry.loaded()) == [("large-v3", "cpu", "int8")]
+
+
+def test_local_transcriber_reuses_registry_models(monkeypatch, tmp_path: Path):
+    class FakeModel:
+        def transcribe(self, path, language=None):
+            seg = types.SimpleNamespace(start=0.0, end=1.0, text="hi")
+            return iter([seg]), None
+
+    monkeypatch.setitem(sys.modules, "faster_whisper", types.ModuleType("faster_whisper"))
+    loads = []
+    registry = ModelRegistry(loader=lambda *key: loads.append(key) or FakeModel())
+    for _ in range(3):
+        transcript = LocalTranscriber(model="small", registry=registry).transcribe(tmp_path / "a")
+        assert transcript.text == "hi"
+    assert loads == [("small", "auto", "default")]
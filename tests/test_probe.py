@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import os
+from fractions import Fraction
+from pathlib import Path
+
+from autoedit.core import probe as probe_module
+from autoedit.core.probe import ProbeStore, parse_probe
+
+FFPROBE_OUTPUT = {
+    "packets": [
+        {"stream_index": 0, "pts_time": "0.000000", "flags": "K__"},
+        {"stream_index": 1, "pts_time": "0.000000", "flags": "K__"},
+        {"stream_index": 0, "pts_time": "0.033367", "flags": "___"},
+        {"stream_index": 0, "pts_time": "2.002000", "flags": "K__"},
+    ],
+    "streams": [
+        {
+            "index": 0,
+            "codec_type": "video",
+            "codec_name": "hevc",
+            "width": 3840,
+            "height": 2160,
+            "r_frame_rate": "30000/1001",
+            "avg_frame_rate": "30000/1001",
+        },
+        {
+            "index": 1,
+            "codec_type": "audio",
+            "codec_name": "aac",
+            "sample_rate": "48000",
+            "channels": 2,
+            "channel_layout": "stereo",
+        },
+    ],
+    "format": {"duration": "4.004000", "format_name": "mov,mp4,m4a,3gp,3g2,mj2"},
+}
+
+
+def test_parse_probe(tmp_path: Path):
+    clip = tmp_path / "clip.mp4"
+    clip.write_bytes(b"video")
+    info = parse_probe(clip, FFPROBE_OUTPUT)
+    assert info.duration == 4.004
+    assert info.fps == Fraction(30000, 1001)
+    assert (info.video.width, info.video.height) == (3840, 2160)
+    assert info.audio.channel_layout == "stereo" and info.audio.sample_rate == 48000
+    assert info.keyframes == [0.0, 2.002]
+
+
+def test_probe_store_persists_and_invalidates(tmp_path: Path, monkeypatch):
+    calls = []
+
+    def fake_ffprobe(path, keyframes=True):
+        calls.append(path)
+        return FFPROBE_OUTPUT
+
+    monkeypatch.setattr(probe_module, "_run_ffprobe", fake_ffprobe)
+    (tmp_path / "artifacts").mkdir()
+    clip = tmp_path / "clip.mp4"
+    clip.write_bytes(b"video")
+
+    assert ProbeStore.for_run(tmp_path).duration(clip) == 4.004
+    # A fresh store reads the database written by the first one.
+    assert ProbeStore.for_run(tmp_path).get(clip).fps == Fraction(30000, 1001)
+    assert len(calls) == 1
+
+    st = clip.stat()
+    os.utime(clip, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    ProbeStore.for_run(tmp_path).get(clip)
+    assert len(calls) == 2
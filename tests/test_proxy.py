@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import os
+import shutil
+import sys
+import types
+from pathlib import Path
+
+from autoedit.core import proxy as proxy_module
+from autoedit.core.fsutil import file_stamp, record_source
+from autoedit.core.proxy import find_proxy, generate_proxies, proxy_path
+from autoedit.core.scene_detect import detect_scenes
+
+
+def test_generate_proxies_parallel(tmp_path: Path, monkeypatch):
+    cmds = []
+
+    def fake_run(cmd):
+        cmds.append(cmd)
+        Path(cmd[-1]).write_bytes(b"proxy")
+        return 0
+
+    monkeypatch.setattr(proxy_module, "run_tool", fake_run)
+    sources = []
+    for name in ["a.mp4", "a.mov"]:
+        src = tmp_path / "raw" / name
+        src.parent.mkdir(exist_ok=True)
+        src.write_bytes(b"source")
+        sources.append(src)
+
+    proxies_dir = tmp_path / "proxies"
+    mapping = generate_proxies(sources, proxies_dir, height=240, workers=2)
+    assert mapping == {str(s): str(proxy_path(s, proxies_dir)) for s in sources}
+    assert all("scale=-2:240" in cmd and "1" == cmd[cmd.index("-g") + 1] for cmd in cmds)
+
+    # Up-to-date proxies are reused.
+    generate_proxies(sources, proxies_dir)
+    assert len(cmds) == 2
+
+
+def test_reingested_source_rebuilds_proxy(tmp_path: Path, monkeypatch):
+    def fake_run(cmd):
+        Path(cmd[-1]).write_bytes(b"proxy of " + Path(cmd[cmd.index("-i") + 1]).read_bytes())
+        return 0
+
+    monkeypatch.setattr(proxy_module, "run_tool", fake_run)
+    old, new = tmp_path / "old.mp4", tmp_path / "new.mp4"
+    old.write_bytes(b"OLD CONTENT")
+    new.write_bytes(b"NEW CONTENT")
+    os.utime(new, ns=(1, 1))  # an old file, as copies and cache hardlinks keep mtimes
+    raw = tmp_path / "raw" / "clip.mp4"
+    raw.parent.mkdir()
+    shutil.copy2(old, raw)
+    proxies_dir = tmp_path / "proxies"
+    generate_proxies([raw], proxies_dir)
+
+    raw.unlink()
+    shutil.copy2(new, raw)
+    assert find_proxy(raw, proxies_dir) is None
+    generate_proxies([raw], proxies_dir)
+    assert proxy_path(raw, proxies_dir).read_bytes() == b"proxy of NEW CONTENT"
+
+
+def _install_fake_scenedetect(monkeypatch, opened: list):
+    class FakeTime:
+        def __init__(self, s):
+            self.s = s
+
+        def get_seconds(self):
+            return self.s
+
+    class FakeManager:
+        def add_detector(self, detector):
+            pass
+
+        def detect_scenes(self, video):
+            pass
+
+        def get_scene_list(self):
+            return [(FakeTime(0.0), FakeTime(2.0)), (FakeTime(2.0), FakeTime(4.0))]
+
+    module = types.ModuleType("scenedetect")
+    module.open_video = lambda path: opened.append(path)
+    module.SceneManager = FakeManager
+    detectors = types.ModuleType("scenedetect.detectors")
+    detectors.ContentDetector = lambda: None
+    monkeypatch.setitem(sys.modules, "scenedetect", module)
+    monkeypatch.setitem(sys.modules, "scenedetect.detectors", detectors)
+
+
+def test_detect_scenes_uses_proxy_but_reports_source(tmp_path: Path, monkeypatch):
+    opened: list = []
+    _install_fake_scenedetect(monkeypatch, opened)
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    src = raw / "clip.mp4"
+    src.write_bytes(b"source")
+    proxy = proxy_path(src, tmp_path / "proxies")
+    proxy.parent.mkdir()
+    proxy.write_bytes(b"proxy")
+    record_source(proxy, file_stamp(src))
+    assert find_proxy(src, tmp_path / "proxies") == proxy
+
+    segments = detect_scenes(raw)
+    assert opened == [str(proxy)]
+    assert [s.source for s in segments] == [str(src), str(src)]
+
+    detect_scenes(raw, use_proxies=False)
+    assert opened[-1] == str(src)
@@ -0,0 +1,80 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from autoedit.core.intervals import IntervalIndex
+from autoedit.core.rules import RuleContext, Shot, build_pipeline, parse_rule, run_pipeline
+from autoedit.core.select import select_segments
+
+
+def test_parse_rule_specs():
+    assert parse_rule("speech_only") == {"rule": "speech_only"}
+    assert parse_rule("cap_total:seconds=90.5") == {"rule": "cap_total", "seconds": 90.5}
+    assert parse_rule({"rule": "limit", "count": 3}) == {"rule": "limit", "count": 3}
+    with pytest.raises(ValueError):
+        parse_rule("merge_adjacent:gap")
+    with pytest.raises(ValueError, match="Unknown selection rule"):
+        build_pipeline(["nope"], RuleContext())
+    with pytest.raises(ValueError, match="Bad parameters"):
+        build_pipeline(["min_len:minutes=1"], RuleContext())
+
+
+def test_pipeline_is_lazy_and_stops_early():
+    pulled = []
+
+    def timeline():
+        for i in range(1_000_000):
+            pulled.append(i)
+            yield Shot(float(i), float(i + 1), "/a.mp4")
+
+    ctx = RuleContext(speech=IntervalIndex([(0.5, 1.5), (2.0, 4.0)]))
+    stages = build_pipeline(["speech_only", "cap_speech:seconds=2"], ctx)
+    shots = list(run_pipeline(timeline(), stages))
+    assert [s.start for s in shots] == [0.0, 1.0, 2.0]
+    assert len(pulled) == 4, "the scan stops right after the cap is reached"
+
+
+def test_merge_adjacent_and_cap_total():
+    shots = [
+        Shot(0.0, 1.0, "/a.mp4"),
+        Shot(1.1, 2.0, "/a.mp4"),
+        Shot(2.0, 3.0, "/b.mp4"),
+        Shot(5.0, 9.0, "/b.mp4"),
+    ]
+    stages = build_pipeline(["merge_adjacent:gap=0.2", "cap_total:seconds=4"], RuleContext())
+    assert list(run_pipeline(shots, stages)) == [
+        Shot(0.0, 2.0, "/a.mp4"),
+        Shot(2.0, 3.0, "/b.mp4"),
+        Shot(5.0, 6.0, "/b.mp4"),
+    ]
+
+
+def test_select_segments_with_rules(tmp_path: Path):
+    segments = [{"start": float(i), "end": float(i + 1), "source": "/a.mp4"} for i in range(6)]
+    (tmp_path / "sequences.json").write_text(json.dumps({"segments": segments}))
+    (tmp_path / "transcript.json").write_text(
+        json.dumps({"text": "x", "segments": [{"start": 0.2, "end": 2.5, "text": "x"}]})
+    )
+    sel = select_segments(tmp_path, speech_only=True, rules=["merge_adjacent", "limit:count=1"])
+    assert [(s.start, s.end) for s in sel.shots] == [(0.0, 3.0)]
+
+
+def test_select_cli_rules(tmp_path: Path):
+    from typer.testing import CliRunner
+
+    from autoedit.cli.main import app
+
+    segments = [{"start": 0.0, "end": 10.0, "source": "/a.mp4"}]
+    (tmp_path / "sequences.json").write_text(json.dumps({"segments": segments}))
+    out = tmp_path / "selection.json"
+    runner = CliRunner()
+
+    result = runner.invoke(
+        app, ["select", str(tmp_path), "-o", str(out), "--rule", "cap_total:seconds=2"]
+    )
+    assert result.exit_code == 0, result.output
+    assert json.loads(out.read_text())["shots"][0]["end"] == 2.0
+
+    result = runner.invoke(app, ["select", str(tmp_path), "-o", str(out), "--rule", "bogus"])
+    assert result.exit_code != 0
@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from autoedit.core import frame_diff
+from autoedit.core import scene_detect as scene_module
+from autoedit.core.scene_cache import SceneCache
+from autoedit.core.scene_detect import DetectorConfig, detect_scenes, plan_windows
+
+np = pytest.importorskip("numpy")
+
+
+def _synthetic_frames(n: int, cut_at: int, h: int = 8, w: int = 14) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    frames = np.full((n, h, w), 40, dtype=np.uint8)
+    frames[cut_at:] = 200
+    noise = rng.integers(0, 4, size=frames.shape, dtype=np.uint8)
+    return frames + noise
+
+
+def test_frame_scores_are_vectorised_and_batch_consistent():
+    frames = _synthetic_frames(10, cut_at=6)
+    whole = frame_diff.frame_scores(frames, None)
+    split = np.concatenate(
+        [frame_diff.frame_scores(frames[:4], None), frame_diff.frame_scores(frames[4:], frames[3])]
+    )
+    assert np.allclose(whole, split)
+    assert int(np.argmax(whole)) == 6
+
+
+def test_rgb_to_hsv_primaries():
+    rgb = np.array([[255, 0, 0], [0, 255, 0], [0, 0, 255], [0, 0, 0]], dtype=np.uint8)
+    hsv = frame_diff.rgb_to_hsv(rgb)
+    assert np.allclose(hsv[:3, 0], [0.0, 255 / 3, 2 * 255 / 3], atol=0.5)
+    assert np.allclose(hsv[:3, 1:], 255.0)
+    assert np.allclose(hsv[3], 0.0)
+
+
+def test_iter_frames_reads_pipe_into_preallocated_buffer(tmp_path: Path, monkeypatch):
+    frames = _synthetic_frames(7, cut_at=3)
+
+    def fake_cmd(source, width, height, frame_skip, pix_fmt, *args):
+        code = f"import sys; sys.stdout.buffer.write(open({str(source)!r}, 'rb').read())"
+        return [sys.executable, "-c", code]
+
+    monkeypatch.setattr(frame_diff, "_frame_cmd", fake_cmd)
+    raw = tmp_path / "frames.raw"
+    raw.write_bytes(frames.tobytes())
+    batches = [b.copy() for b in frame_diff.iter_frames(raw, 14, 8, batch=3)]
+    assert [len(b) for b in batches] == [3, 3, 1]
+    assert np.array_equal(np.concatenate(batches), frames)
+
+
+def test_iter_frames_raises_when_decode_fails(tmp_path: Path, monkeypatch):
+    def fake_cmd(source, width, height, frame_skip, pix_fmt, *args):
+        code = "import sys; sys.stderr.write('moov atom not found'); sys.exit(1)"
+        return [sys.executable, "-c", code]
+
+    monkeypatch.setattr(frame_diff, "_frame_cmd", fake_cmd)
+    with pytest.raises(RuntimeError, match="moov atom not found"):
+        list(frame_diff.iter_frames(tmp_path / "broken.mp4", 14, 8))
+
+
+def test_failed_decode_is_not_cached(tmp_path: Path, monkeypatch, fake_ffprobe):
+    frames = _synthetic_frames(50, cut_at=25)
+    calls: list = []
+
+    def fake_iter(source, width, height, frame_skip=0, color="gray", batch=64, **kwargs):
+        calls.append(Path(source).name)
+        if len(calls) == 1:
+            raise RuntimeError("ffmpeg failed to decode clip.mp4")
+        yield frames
+
+    monkeypatch.setattr(frame_diff, "iter_frames", fake_iter)
+    fake_ffprobe(2.0, video=True)
+    raw = tmp_path / "run" / "raw"
+    raw.mkdir(parents=True)
+    (raw / "clip.mp4").write_bytes(b"clip")
+    cache = SceneCache(tmp_path / "cache")
+    config = DetectorConfig(name="numpy")
+
+    failed = detect_scenes(raw, config=config, workers=1, cache=cache)
+    assert [(s.start, s.end) for s in failed] == [(0.0, 2.0)]
+    retried = detect_scenes(raw, config=config, workers=1, cache=cache)
+    assert calls == ["clip.mp4", "clip.mp4"]
+    assert [(s.start, s.end) for s in retried] == [(0.0, 1.0), (1.0, 2.0)]
+
+
+def test_numpy_detector_segments(tmp_path: Path, monkeypatch, fake_ffprobe):
+    frames = _synthetic_frames(100, cut_at=50)
+
+    def fake_iter(source, width, height, frame_skip=0, color="gray", batch=32, **kwargs):
+        step = frame_skip + 1
+        picked = frames[::step]
+        for i in range(0, len(picked), batch):
+            yield picked[i : i + batch]
+
+    monkeypatch.setattr(frame_diff, "iter_frames", fake_iter)
+    fake_ffprobe(4.0, video={"width": 28, "height": 16})
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    (raw / "clip.mp4").write_bytes(b"video")
+
+    segments = detect_scenes(raw, config=DetectorConfig(name="numpy"))
+    assert [(s.start, s.end) for s in segments] == [(0.0, 2.0), (2.0, 4.0)]
+
+    skipped = detect_scenes(raw, config=DetectorConfig(name="numpy", frame_skip=1))
+    assert [(s.start, s.end) for s in skipped] == [(0.0, 2.0), (2.0, 4.0)]
+
+
+def test_plan_windows_snaps_to_keyframes():
+    keyframes = [0.0, 2.0, 4.0, 9.0, 11.0, 16.0]
+    windows = plan_windows(20.0, keyframes, length=5.0, overlap=1.0)
+    assert windows == [(0.0, 0.0, 9.0), (4.0, 9.0, 16.0), (11.0, 16.0, 20.0)]
+    assert plan_windows(4.0, keyframes, length=5.0, overlap=1.0) == [(0.0, 0.0, 4.0)]
+
+
+def test_chunked_detection_matches_serial(tmp_path: Path, monkeypatch, fake_ffprobe):
+    fps = 25
+    frames = np.full((1000, 8, 14), 30, dtype=np.uint8)
+    for i, cut in enumerate([130, 251, 600, 611, 875]):
+        frames[cut:] = 30 + 40 * ((i + 1) % 5)
+
+    def fake_iter(source, width, height, frame_skip=0, color="gray", batch=64, **kwargs):
+        first = int(round(kwargs.get("start", 0.0) * fps))
+        end = kwargs.get("end")
+        last = len(frames) if end is None else int(round(end * fps))
+        window = frames[first:last]
+        for i in range(0, len(window), batch):
+            yield window[i : i + batch]
+
+    monkeypatch.setattr(frame_diff, "iter_frames", fake_iter)
+    monkeypatch.setattr(scene_module, "ProcessPoolExecutor", ThreadPoolExecutor)
+    fake_ffprobe(
+        40.0,
+        video=True,
+        packets=[{"stream_index": 0, "pts_time": str(t), "flags": "K_"} for t in range(0, 40, 2)],
+    )
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    (raw / "long.mp4").write_bytes(b"video")
+    config = DetectorConfig(name="numpy")
+
+    serial = detect_scenes(raw, config=config)
+    chunked = detect_scenes(raw, config=config, chunk_workers=4, chunk_length=7.0)
+    assert len(serial) == len(chunked) == 5  # the cut at frame 611 is within min_scene_len
+    for a, b in zip(serial, chunked):
+        assert abs(a.start - b.start) <= 1 / fps and abs(a.end - b.end) <= 1 / fps
+
+
+def test_chunk_workers_caps_one_files_windows(tmp_path: Path, monkeypatch, fake_ffprobe):
+    lock = threading.Lock()
+    state = {"in_flight": 0, "peak": 0, "pools": []}
+
+    class RecordingPool(ThreadPoolExecutor):
+        def __init__(self, max_workers):
+            state["pools"].append(max_workers)
+            super().__init__(max_workers=max_workers)
+
+    def fake_iter(source, width, height, frame_skip=0, color="gray", batch=64, **kwargs):
+        with lock:
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+        time.sleep(0.02)
+        with lock:
+            state["in_flight"] -= 1
+        yield np.full((10, 8, 14), 30, dtype=np.uint8)
+
+    monkeypatch.setattr(frame_diff, "iter_frames", fake_iter)
+    monkeypatch.setattr(scene_module, "ProcessPoolExecutor", RecordingPool)
+    fake_ffprobe(60.0, video=True)
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    (raw / "long.mp4").write_bytes(b"video")
+
+    config = DetectorConfig(name="numpy")
+    detect_scenes(raw, config=config, chunk_workers=2, chunk_length=5.0, workers=16)
+    assert state["pools"] == [2] and state["peak"] == 2
+
+
+def test_detects_every_file_and_caches_per_file(tmp_path: Path, monkeypatch, fake_ffprobe):
+    analysed: list = []
+    frames = _synthetic_frames(50, cut_at=25)
+
+    def fake_iter(source, width, height, frame_skip=0, color="gray", batch=64, **kwargs):
+        analysed.append(Path(source).name)
+        yield frames
+
+    monkeypatch.setattr(frame_diff, "iter_frames", fake_iter)
+    monkeypatch.setattr(scene_module, "ProcessPoolExecutor", ThreadPoolExecutor)
+    fake_ffprobe(2.0, video=True)
+    run_dir = tmp_path / "run"
+    raw = run_dir / "raw"
+    raw.mkdir(parents=True)
+    (run_dir / "artifacts").mkdir()
+    for name in ["cam_b.mp4", "cam_a.mp4"]:
+        (raw / name).write_bytes(name.encode())
+    config = DetectorConfig(name="numpy")
+
+    segments = detect_scenes(raw, config=config, workers=2)
+    assert sorted(analysed) == ["cam_a.mp4", "cam_b.mp4"]
+    assert [(Path(s.source).name, s.start, s.end) for s in segments] == [
+        ("cam_a.mp4", 0.0, 1.0),
+        ("cam_a.mp4", 1.0, 2.0),
+        ("cam_b.mp4", 0.0, 1.0),
+        ("cam_b.mp4", 1.0, 2.0),
+    ]
+
+    (raw / "cam_c.mp4").write_bytes(b"new clip")
+    segments = detect_scenes(raw, config=config, workers=2)
+    assert analysed[2:] == ["cam_c.mp4"]
+    assert len(segments) == 6
+
+    detect_scenes(raw, config=DetectorConfig(name="numpy", threshold=5.0), workers=1)
+    assert len(analysed) == 6, "changed detector parameters invalidate the cache"
+
+
+def test_scene_cache_is_shared_across_runs(tmp_path: Path, monkeypatch, fake_ffprobe):
+    analysed: list = []
+    frames = _synthetic_frames(50, cut_at=25)
+
+    def fake_iter(source, width, height, frame_skip=0, color="gray", batch=64, **kwargs):
+        analysed.append(Path(source).name)
+        yield frames
+
+    monkeypatch.setattr(frame_diff, "iter_frames", fake_iter)
+    fake_ffprobe(2.0, video=True)
+    cache = SceneCache(tmp_path / "cache")
+    config = DetectorConfig(name="numpy")
+    results = []
+    for run, name in [("run1", "clip.mp4"), ("run2", "renamed.mp4")]:
+        raw = tmp_path / run / "raw"
+        raw.mkdir(parents=True)
+        (raw / name).write_bytes(b"same content")
+        results.append(detect_scenes(raw, config=config, workers=1, cache=cache))
+
+    assert analysed == ["clip.mp4"], "identical content is served from the cache"
+    assert [(s.start, s.end) for s in results[0]] == [(s.start, s.end) for s in results[1]]
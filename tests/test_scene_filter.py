@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from autoedit.core import scene_filter
+from autoedit.core.scene_detect import DetectorConfig, detect_scenes
+from autoedit.core.scene_filter import parse_showinfo
+
+SHOWINFO_LOG = """\
+Input #0, mov,mp4,m4a,3gp,3g2,mj2, from 'clip.mp4':
+[Parsed_showinfo_2 @ 0x5581] config in time_base: 1/12800, frame_rate: 25/1
+[Parsed_showinfo_2 @ 0x5581] n:   0 pts:  38400 pts_time:3       duration:    512 fmt:yuv420p
+[Parsed_showinfo_2 @ 0x5581] n:   1 pts:  40960 pts_time:3.2     duration:    512 fmt:yuv420p
+[Parsed_showinfo_2 @ 0x5581] n:   2 pts:  89600 pts_time:7       duration:    512 fmt:yuv420p
+frame=    3 fps=0.0 q=-0.0 Lsize=N/A time=00:00:07.04 bitrate=N/A speed= 412x
+"""
+
+
+def _raw_dir(tmp_path: Path) -> Path:
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    (raw / "clip.mp4").write_bytes(b"video")
+    return raw
+
+
+def test_parse_showinfo():
+    assert parse_showinfo(SHOWINFO_LOG) == [3.0, 3.2, 7.0]
+
+
+def test_ffmpeg_scene_filter_detector(tmp_path: Path, monkeypatch, fake_ffprobe):
+    cmds = []
+
+    def fake_run(cmd):
+        cmds.append(cmd)
+        return SHOWINFO_LOG
+
+    monkeypatch.setattr(scene_filter, "_run_showinfo", fake_run)
+    fake_ffprobe(10.0, video=True, packets=[])
+    config = DetectorConfig(name="ffmpeg", threshold=0.4, height=90)
+    segments = detect_scenes(_raw_dir(tmp_path), config=config, workers=1)
+
+    vf = cmds[0][cmds[0].index("-vf") + 1]
+    assert "select='gt(scene,0.4)'" in vf and "scale=-2:90" in vf
+    # 3.2 is within min_scene_len of the cut at 3.0 and is dropped.
+    assert [(s.start, s.end) for s in segments] == [(0.0, 3.0), (3.0, 7.0), (7.0, 10.0)]
+
+
+def test_keyframes_detector_does_not_decode(tmp_path: Path, monkeypatch, fake_ffprobe):
+    def no_decode(cmd):
+        raise AssertionError("keyframes mode must not run ffmpeg")
+
+    monkeypatch.setattr(scene_filter, "_run_showinfo", no_decode)
+    packets = [
+        {"stream_index": 0, "pts_time": str(t), "flags": "K__"} for t in [0.0, 2.0, 2.2, 6.0]
+    ]
+    fake_ffprobe(10.0, video=True, packets=packets)
+    segments = detect_scenes(_raw_dir(tmp_path), config=DetectorConfig(name="keyframes"))
+    assert [(s.start, s.end) for s in segments] == [(0.0, 2.0), (2.0, 6.0), (6.0, 10.0)]
@@ -1,6 +1,8 @@
+import json
 from pathlib import Path
 
-from autoedit.core.select import select_segments
+from autoedit.core import select as select_module
+from autoedit.core.select import select_many, select_segments
 
 
 def write(p: Path, s: str):
@@ -39,3 +41,74 @@ def test_select_speech_only(tmp_path: Path):
     sel2 = select_segments(art, speech_only=True, min_len=1.1, max_len=0.5)
     # min_len filters out 1s segment; expect 0 left
     assert len(sel2.shots) == 0
+
+
+def _write_run(art: Path, shots, speech):
+    art.mkdir(parents=True, exist_ok=True)
+    segments = [{"start": a, "end": b, "source": src} for a, b, src in shots]
+    write(art / "sequences.json", json.dumps({"segments": segments}))
+    if speech is not None:
+        tx = [{"start": a, "end": b, "text": "x"} for a, b in speech]
+        write(art / "transcript.json", json.dumps({"text": "x", "segments": tx}))
+
+
+def test_select_many_matches_python_path(tmp_path: Path, monkeypatch):
+    dirs = [tmp_path / "r1" / "artifacts", tmp_path / "r2" / "artifacts", tmp_path / "r3"]
+    _write_run(
+        dirs[0],
+        [(0.0, 1.0, "/a.mp4"), (1.0, 5.0, "/a.mp4"), (0.0, 3.0, "/b.mp4")],
+        [(1.0, 1.5), (4.0, 6.0)],
+    )
+    _write_run(dirs[1], [(0.0, 0.5, "/c.mp4"), (2.0, 9.0, "/c.mp4")], None)
+    # dirs[2] has no sequences.json at all
+
+    batched = select_many(dirs, speech_only=True, min_len=0.75, max_len=2.5)
+    monkeypatch.setattr(select_module, "_numpy", lambda: None)
+    scalar = [select_segments(d, speech_only=True, min_len=0.75, max_len=2.5) for d in dirs]
+
+    assert batched == scalar
+    assert [(s.start, s.end, s.source) for s in batched[0].shots] == [
+        (1.0, 3.5, "/a.mp4"),
+        (0.0, 2.5, "/b.mp4"),
+    ]
+    assert [(s.start, s.end) for s in batched[1].shots] == [(2.0, 4.5)]
+    assert batched[2].shots == []
+
+
+def test_speech_ratio_scores_and_threshold(tmp_path: Path, monkeypatch):
+    _write_run(
+        tmp_path,
+        [(0.0, 4.0, "/a.mp4"), (4.0, 8.0, "/a.mp4"), (8.0, 10.0, "/a.mp4")],
+        [(1.0, 2.0), (1.5, 3.0), (4.0, 7.5)],
+    )
+    sel = select_segments(tmp_path)
+    assert [s.speech_ratio for s in sel.shots] == [0.5, 0.875, 0.0]
+
+    kept = select_segments(tmp_path, min_speech_ratio=0.6)
+    assert [(s.start, s.speech_ratio) for s in kept.shots] == [(4.0, 0.875)]
+
+    # Scores are computed on the trimmed shot; every engine agrees.
+    trimmed = select_segments(tmp_path, max_len=2.0, min_speech_ratio=0.6)
+    assert [(s.start, s.end, s.speech_ratio) for s in trimmed.shots] == [(4.0, 6.0, 1.0)]
+    piped = select_segments(tmp_path, max_len=2.0, min_speech_ratio=0.6, rules=["limit:count=9"])
+    assert piped == trimmed
+    monkeypatch.setattr(select_module, "_numpy", lambda: None)
+    assert select_segments(tmp_path, max_len=2.0, min_speech_ratio=0.6) == trimmed
+
+
+def test_speech_only_applies_to_main_audio_source(tmp_path: Path, monkeypatch):
+    _write_run(
+        tmp_path,
+        [(0.0, 1.0, "/run/raw/a.mp4"), (1.0, 2.0, "/run/raw/a.mp4"), (0.0, 1.0, "/run/raw/b.mp4")],
+        [(0.2, 0.8)],
+    )
+    write(tmp_path / "media.db.json", json.dumps({"main": "/run/raw/a.mp4"}))
+
+    # b.mp4 has no speech data of its own: it is neither filtered nor scored.
+    expected = [(0.0, "/run/raw/a.mp4", 0.6), (0.0, "/run/raw/b.mp4", None)]
+    sel = select_segments(tmp_path, speech_only=True)
+    assert [(s.start, s.source, s.speech_ratio) for s in sel.shots] == expected
+    piped = select_segments(tmp_path, rules=["speech_only"])
+    assert [(s.start, s.source, s.speech_ratio) for s in piped.shots] == expected
+    monkeypatch.setattr(select_module, "_numpy", lambda: None)
+    assert select_segments(tmp_path, speech_only=True) == sel
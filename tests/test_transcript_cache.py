@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from autoedit.backends.local.transcriber import LocalTranscriber
+from autoedit.cli.main import app
+from autoedit.core.transcript_cache import TranscriptCache
+from autoedit.schemas.transcript import Transcript, TranscriptSegment
+
+
+def _transcript(text: str = "hello", **kwargs) -> Transcript:
+    return Transcript(
+        text=text, segments=[TranscriptSegment(start=0.0, end=1.0, text=text)], **kwargs
+    )
+
+
+def test_cache_keys_on_content_model_and_language(tmp_path: Path):
+    audio = tmp_path / "main.flac"
+    audio.write_bytes(b"audio")
+    cache = TranscriptCache(tmp_path / "cache")
+
+    assert cache.lookup(audio, "local", "small", "en") is None
+    assert cache.put(audio, "local", "small", "en", _transcript())
+    assert cache.lookup(audio, "local", "small", "en").text == "hello"
+    assert cache.lookup(audio, "local", "small", "fr") is None
+    assert cache.lookup(audio, "local", "medium", "en") is None
+
+    # Same bytes under another name hit; changed bytes miss.
+    copy = tmp_path / "copy.flac"
+    copy.write_bytes(b"audio")
+    assert cache.lookup(copy, "local", "small", "en") is not None
+    audio.write_bytes(b"other audio")
+    assert cache.lookup(audio, "local", "small", "en") is None
+
+
+def test_cache_skips_stubs_and_mismatched_service_hash(tmp_path: Path):
+    audio = tmp_path / "main.flac"
+    audio.write_bytes(b"audio")
+    cache = TranscriptCache(tmp_path / "cache")
+
+    assert not cache.put(audio, "local", "small", None, _transcript(note="not installed"))
+    assert not cache.put(audio, "lightning", "small", None, _transcript(audio_hash="0" * 64))
+    digest = hashlib.sha256(b"audio").hexdigest()
+    assert cache.put(audio, "lightning", "small", None, _transcript(audio_hash=digest))
+    assert cache.lookup(audio, "local", "small", None) is None
+
+
+def test_stt_reuses_cached_transcript(tmp_path: Path, monkeypatch):
+    audio = tmp_path / "main.flac"
+    audio.write_bytes(b"audio")
+    calls = []
+
+    def fake_transcribe(self, audio_path: Path, language=None):
+        calls.append(audio_path)
+        return _transcript()
+
+    monkeypatch.setattr(LocalTranscriber, "transcribe", fake_transcribe)
+    monkeypatch.delenv("AUTOEDIT_CONFIG", raising=False)
+
+    runner = CliRunner()
+    for name in ("a.json", "b.json"):
+        out = tmp_path / name
+        result = runner.invoke(
+            app,
+            ["stt", str(audio), "-o", str(out), "--model", "small", "--cache-dir", str(tmp_path)],
+        )
+        assert result.exit_code == 0, result.output
+        assert json.loads(out.read_text())["text"] == "hello"
+    assert len(calls) == 1
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from autoedit.core.select import select_segments
+from autoedit.core.transcript_stream import (
+    TRANSCRIPT_JSONL,
+    TranscriptWriter,
+    iter_transcript_jsonl,
+    write_transcript_stream,
+)
+from autoedit.schemas.transcript import TranscriptSegment
+
+
+def _segments(n: int):
+    for i in range(n):
+        yield TranscriptSegment(start=float(i), end=i + 0.5, text=f"s{i}")
+
+
+def test_writer_lines_are_visible_before_close(tmp_path: Path):
+    path = tmp_path / TRANSCRIPT_JSONL
+    with TranscriptWriter(path, fsync_interval=0.0) as writer:
+        for seg in _segments(2):
+            writer.write(seg)
+            # Each segment is readable as soon as it is written.
+            assert [s.text for s in iter_transcript_jsonl(path)][-1] == seg.text
+    assert writer.count == 2
+
+
+def test_reader_skips_truncated_last_line(tmp_path: Path):
+    path = tmp_path / TRANSCRIPT_JSONL
+    assert write_transcript_stream(_segments(3), path) == 3
+    with path.open("a", encoding="utf-8") as fh:
+        fh.write('{"start": 3.0, "end": 3.')  # crash mid-write
+    assert [s.text for s in iter_transcript_jsonl(path)] == ["s0", "s1", "s2"]
+
+
+def test_selection_runs_on_partial_stream(tmp_path: Path):
+    art = tmp_path / "artifacts"
+    art.mkdir()
+    shots = [{"start": float(i), "end": i + 1.0, "source": "/a.mp4"} for i in range(4)]
+    (art / "sequences.json").write_text(json.dumps({"segments": shots}))
+    # Transcription got through the first two seconds before stopping.
+    write_transcript_stream(_segments(2), art / TRANSCRIPT_JSONL)
+
+    sel = select_segments(art, speech_only=True)
+    assert [(s.start, s.speech_ratio) for s in sel.shots] == [(0.0, 0.5), (1.0, 0.5)]
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from autoedit.core import vad as vad_module
+from autoedit.core.select import select_segments
+from autoedit.core.vad import (
+    VAD_SAMPLE_RATE,
+    analyze_audio,
+    decode_pcm,
+    energy_envelope,
+    load_pcm,
+    speech_regions,
+)
+
+np = pytest.importorskip("numpy")
+
+
+def _signal(seconds: float, speech: list) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    samples = rng.normal(0, 1e-4, int(seconds * VAD_SAMPLE_RATE)).astype(np.float32)
+    t = np.arange(len(samples)) / VAD_SAMPLE_RATE
+    for start, end in speech:
+        on = (t >= start) & (t < end)
+        samples[on] += 0.3 * np.sin(2 * np.pi * 220 * t[on]).astype(np.float32)
+    return samples
+
+
+def test_energy_envelope_blocks_match_single_pass():
+    samples = _signal(3.0, [(1.0, 2.0)])
+    whole = energy_envelope(samples, VAD_SAMPLE_RATE, block=1 << 20)
+    blocked = energy_envelope(samples, VAD_SAMPLE_RATE, block=7)
+    assert len(whole) == 150
+    assert np.allclose(whole, blocked)
+    assert whole[75] > -20 > whole[10]
+
+
+def test_speech_regions_bridge_short_pauses():
+    frame_s = 0.1
+    energy = np.full(100, -80.0, dtype=np.float32)
+    energy[10:20] = -10  # 1.0 - 2.0 s
+    energy[22:30] = -10  # 0.2 s pause: bridged
+    energy[60:61] = -10  # 0.1 s blip: dropped
+    regions, threshold = speech_regions(energy, frame_s, min_speech=0.25, min_silence=0.3)
+    assert threshold == pytest.approx(-50.0)
+    assert regions == [(pytest.approx(1.0), pytest.approx(3.0))]
+
+
+def test_analyze_audio_and_select_from_vad(tmp_path: Path, monkeypatch):
+    run_dir = tmp_path / "run"
+    audio = run_dir / "audio" / "main.flac"
+    audio.parent.mkdir(parents=True)
+    audio.write_bytes(b"flac")
+    decodes = []
+
+    def fake_run(cmd):
+        decodes.append(cmd)
+        _signal(6.0, [(1.0, 2.5), (4.0, 5.0)]).tofile(cmd[-1])
+        return 0
+
+    monkeypatch.setattr(vad_module, "run_tool", fake_run)
+    artifacts = run_dir / "artifacts"
+    activity = analyze_audio(audio, artifacts / "vad.json")
+    assert [(round(r.start, 2), round(r.end, 2)) for r in activity.regions] == [
+        (1.0, 2.5),
+        (4.0, 5.0),
+    ]
+    assert np.load(artifacts / "energy.npy").dtype == np.float16
+
+    analyze_audio(audio, artifacts / "vad.json")
+    assert len(decodes) == 1, "the decoded PCM cache is reused"
+
+    segments = [{"start": float(i), "end": float(i + 1), "source": "/a.mp4"} for i in range(6)]
+    (artifacts / "sequences.json").write_text(json.dumps({"segments": segments}))
+    sel = select_segments(artifacts, speech_only=True, speech_source="vad")
+    assert [s.start for s in sel.shots] == [1.0, 2.0, 4.0]
+    assert sel.shots[1].speech_ratio == 0.5
+    # The transcript source finds no transcript and filters nothing.
+    assert len(select_segments(artifacts, speech_only=True).shots) == 6
+
+
+def test_decoded_pcm_follows_relinked_audio(tmp_path: Path, monkeypatch):
+    def fake_run(cmd):
+        np.full(4, len(Path(cmd[cmd.index("-i") + 1]).read_bytes()), np.float32).tofile(cmd[-1])
+        return 0
+
+    monkeypatch.setattr(vad_module, "run_tool", fake_run)
+    clip_a, clip_b = tmp_path / "a.flac", tmp_path / "b.flac"
+    clip_a.write_bytes(b"a" * 3)
+    clip_b.write_bytes(b"b" * 5)
+    os.utime(clip_b, ns=(1, 1))  # cached audio keeps its old mtime
+    main = tmp_path / "audio" / "main.flac"
+    main.parent.mkdir()
+    os.link(clip_a, main)
+    assert load_pcm(decode_pcm(main))[0] == 3
+
+    main.unlink()
+    os.link(clip_b, main)  # re-ingest hardlinks main.flac to another clip's cached audio
+    assert load_pcm(decode_pcm(main))[0] == 5